@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Adaptive batch sizes for the enrichment phases, driven by observed output size.
+
+Every phase used a hard-coded BATCH_SIZE (10 in phase 5, 15 in 6b, 20 in
+10, 5 in 12, 5/10 in the enrich_* scripts). Too small wastes calls and
+repeated prompt context; too large and the reply hits max_tokens, the JSON
+doesn't parse and the whole batch falls back to heuristics. A BatchSizer
+starts at the phase's old BATCH_SIZE and re-sizes after every batch:
+
+  - it keeps a moving average of output tokens per item
+  - the next batch gets as many items as fit in TARGET_FILL of max_tokens
+    (at most doubling per step, within [min_size, max_size])
+  - a truncated or unparseable reply counts as at least max_tokens / items
+    per item, so the size drops at once
+
+ClaudeClient.run_batches() asks the sizer for each new batch and splits a
+failed batch in half and retries both halves instead of discarding it.
+Output tokens are estimated from the reply text (estimate_tokens), not the
+API's usage block, so a --cache-only replay cuts exactly the same batches.
+"""
+
+TARGET_FILL = 0.6   # of max_tokens; estimate_tokens runs ~25% low on JSON, leaving headroom
+SMOOTHING = 0.3     # weight of the newest batch in the moving average
+MAX_GROWTH = 4      # default max_size, as a multiple of the initial size
+
+
+class BatchSizer:
+    """Output tokens per item -> number of items per batch under max_tokens."""
+
+    def __init__(self, max_tokens: int, initial: int, min_size: int = 1,
+                 max_size: int | None = None):
+        self.max_tokens = max_tokens
+        self.initial = initial
+        self.min_size = min_size
+        self.max_size = max_size or initial * MAX_GROWTH
+        self.current = initial
+        self.per_item: float | None = None
+        self.sizes: list[int] = []
+        self.overflows = 0
+
+    def size(self) -> int:
+        return self.current
+
+    def observe(self, items: int, output_tokens: int):
+        """A batch of items came back complete with output_tokens of reply."""
+        per_item = output_tokens / items
+        if self.per_item is None:
+            self.per_item = per_item
+        else:
+            self.per_item += SMOOTHING * (per_item - self.per_item)
+        self.sizes.append(items)
+        self.resize()
+
+    def overflow(self, items: int):
+        """A batch of items was truncated or unparseable (and is being split)."""
+        self.per_item = max(self.per_item or 0, self.max_tokens / items)
+        self.overflows += 1
+        self.resize()
+
+    def resize(self):
+        fit = int(self.max_tokens * TARGET_FILL / max(self.per_item, 1))
+        self.current = max(self.min_size, min(self.max_size, fit, self.current * 2))
+
+    def stats(self) -> str:
+        if not self.sizes:
+            return f"batch sizer: no batches (size {self.current})"
+        avg = sum(self.sizes) / len(self.sizes)
+        return (f"batch sizer: {len(self.sizes)} batches, {self.initial} -> {self.current} items "
+                f"(avg {avg:.1f}, ~{self.per_item:.0f} output tokens/item), "
+                f"{self.overflows} split")
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""Offline bulk enrichment: submit every prompt as one job, poll it, collect later.
+
+Full-catalog passes (enrich_synopses.py over every priority-1/2 edition,
+Phase 12 over every gap character) don't need interactive latency. The
+Message Batches API takes the whole run as one job, processes it within
+24 hours at half the interactive price, and doesn't count against the
+per-minute rate limits. A BulkJob keeps one job per script in
+data/bulk/<name>/:
+
+  job.jsonl      one Batches API request per line: {"custom_id", "params"}
+  manifest.json  backend, batch id, item keys and the [start, end) item
+                 range of every request
+  results.jsonl  one Batches API result per line: {"custom_id", "result"}
+
+The scripts drive it with --bulk submit | poll | collect:
+
+  submit   cut the items into fixed BATCH_SIZE batches, write job.jsonl and
+           send it (or, with --bulk-local, leave it for the stand-in)
+  poll     print the job's status and request counts (no API key needed
+           for a local job, here or on collect)
+  collect  download results.jsonl once the job has ended and hand every
+           result to the script's usual per-batch handler as a CallResult;
+           replies are also saved to the response cache
+
+The local stand-in plays the API's part for testing and dry runs: it reads
+job.jsonl and writes results.jsonl (canned reply, or a reply function):
+
+  python3 data/enrich_synopses.py --limit 20 --bulk submit --bulk-local
+  python3 data/bulk_jobs.py standin data/bulk/enrich_synopses --reply '[]'
+  python3 data/enrich_synopses.py --bulk collect
+  python3 data/bulk_jobs.py check     # submit -> collect against a fake Batches API
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Callable, Iterator
+
+from claude_client import (
+    API_VERSION,
+    REQUEST_TIMEOUT,
+    CallResult,
+    ClaudeAPIError,
+    ClaudeClient,
+    estimate_tokens,
+)
+from json_stream import parse_json_array
+from response_cache import response_key
+
+BULK_DIR = Path(__file__).parent / "bulk"
+
+
+def api_request(client: ClaudeClient, method: str, url: str, body: dict | None = None) -> bytes:
+    """One blocking Batches API call with the client's key and base URL."""
+    if not url.startswith("http"):
+        url = f"{client.base_url}{url}"
+    req = urllib.request.Request(
+        url,
+        data=json.dumps(body).encode("utf-8") if body is not None else None,
+        headers={
+            "x-api-key": client.api_key,
+            "anthropic-version": API_VERSION,
+            "content-type": "application/json",
+        },
+        method=method,
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=REQUEST_TIMEOUT) as resp:
+            return resp.read()
+    except urllib.error.HTTPError as e:
+        detail = e.read().decode("utf-8", "replace")[:300]
+        raise ClaudeAPIError(f"HTTP {e.code}: {detail}", status=e.code) from e
+    except (urllib.error.URLError, TimeoutError, ConnectionError) as e:
+        raise ClaudeAPIError(f"network error: {e}") from e
+
+
+def local_job(name: str, bulk_dir: Path | None = None) -> bool:
+    """Whether name's submitted job is left for the local stand-in (no API key needed)."""
+    path = (bulk_dir or BULK_DIR) / name / "manifest.json"
+    if not path.exists():
+        return False
+    with open(path) as f:
+        return json.load(f).get("backend") == "local"
+
+
+class BulkJob:
+    """One script's bulk job directory."""
+
+    def __init__(self, name: str, client: ClaudeClient, bulk_dir: Path | None = None,
+                 request: Callable[..., bytes] = api_request):
+        self.name = name
+        self.client = client
+        self.request = request  # api_request, or a fake for check()
+        self.dir = (bulk_dir or BULK_DIR) / name
+        self.job_path = self.dir / "job.jsonl"
+        self.manifest_path = self.dir / "manifest.json"
+        self.results_path = self.dir / "results.jsonl"
+
+    def manifest(self) -> dict:
+        if not self.manifest_path.exists():
+            raise FileNotFoundError(f"no bulk job at {self.dir} (run with --bulk submit first)")
+        with open(self.manifest_path) as f:
+            return json.load(f)
+
+    def save_manifest(self, manifest: dict):
+        with open(self.manifest_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+
+    def submit(self, keys: list[str], build_prompt: Callable[[list], str], items: list,
+               batch_size: int, local: bool = False) -> dict:
+        """Write every batch's request to job.jsonl and submit it (unless local)."""
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.results_path.unlink(missing_ok=True)
+        ranges = [(s, min(s + batch_size, len(items))) for s in range(0, len(items), batch_size)]
+        with open(self.job_path, "w") as f:
+            for i, (s, e) in enumerate(ranges):
+                f.write(json.dumps({
+                    "custom_id": f"{self.name}-{i:05d}",
+                    "params": {
+                        "model": self.client.model,
+                        "max_tokens": self.client.max_tokens,
+                        "system": self.client.system,
+                        "messages": [{"role": "user", "content": build_prompt(items[s:e])}],
+                    },
+                }) + "\n")
+
+        manifest = {
+            "name": self.name,
+            "backend": "local" if local else "api",
+            "batch_id": None,
+            "submitted": int(time.time()),
+            "model": self.client.model,
+            "keys": keys,
+            "ranges": ranges,
+        }
+        if not local:
+            with open(self.job_path) as f:
+                requests = [json.loads(line) for line in f]
+            batch = json.loads(self.request(self.client, "POST", "/v1/messages/batches",
+                                            {"requests": requests}))
+            manifest["batch_id"] = batch["id"]
+        self.save_manifest(manifest)
+        return manifest
+
+    def status(self) -> dict:
+        """{"processing_status": "in_progress" | "ended", "request_counts": {...}}"""
+        manifest = self.manifest()
+        if manifest["backend"] == "local":
+            done = self.results_path.exists()
+            return {"processing_status": "ended" if done else "in_progress",
+                    "request_counts": {"processing": 0 if done else len(manifest["ranges"])}}
+        batch = json.loads(self.request(self.client, "GET",
+                                        f"/v1/messages/batches/{manifest['batch_id']}"))
+        if batch["processing_status"] == "ended":
+            manifest["results_url"] = batch.get("results_url")
+            self.save_manifest(manifest)
+        return batch
+
+    def collect(self, keys: list[str]) -> Iterator[CallResult]:
+        """Every request's result in item order, as the interactive run would hand them over.
+
+        keys must match the items submitted (the catalog may have changed
+        since); replies are parsed with parse_json_array, and a cut-off
+        reply is handed over with the elements it finished.
+        """
+        manifest = self.manifest()
+        if keys != manifest["keys"]:
+            raise ValueError(f"items changed since the job was submitted "
+                             f"({len(manifest['keys'])} then, {len(keys)} now); re-submit")
+        if not self.results_path.exists():
+            status = self.status()  # also records results_url in the saved manifest
+            if status["processing_status"] != "ended":
+                raise RuntimeError("bulk job has not ended yet; poll again later")
+            data = self.request(self.client, "GET", status["results_url"])
+            with open(self.results_path, "wb") as f:
+                f.write(data)
+
+        with open(self.job_path) as f:
+            prompts = {r["custom_id"]: r["params"] for r in map(json.loads, f)}
+        with open(self.results_path) as f:
+            results = {r["custom_id"]: r["result"] for r in map(json.loads, f)}
+
+        cache = self.client.cache
+        for i, (start, end) in enumerate(manifest["ranges"]):
+            custom_id = f"{self.name}-{i:05d}"
+            call = CallResult(i, start=start, end=end)
+            result = results.get(custom_id) or {"type": "missing"}
+            if result["type"] != "succeeded":
+                error = result.get("error") or {}
+                call.error = ClaudeAPIError(f"bulk request {result['type']}: {error}")
+                yield call
+                continue
+
+            message = result["message"]
+            text = "".join(b.get("text", "") for b in message.get("content", []) if b.get("type") == "text")
+            call.output_tokens = estimate_tokens(text)
+            stream = parse_json_array(text)
+            if not stream.started:
+                call.error = json.JSONDecodeError("no JSON array in reply", text, 0)
+            else:
+                call.value = stream.elements
+            if cache and stream.started:
+                params = prompts[custom_id]
+                key = response_key(params["model"], params["system"], params["messages"][0]["content"],
+                                   params["max_tokens"])
+                cache.put(key, text, params["model"])
+            yield call
+
+
+def run_standin(job_dir: Path, reply: str | Callable[[dict], str] = "[]"):
+    """Local stand-in for the Batches API: job.jsonl in, results.jsonl out."""
+    job_dir = Path(job_dir)
+    with open(job_dir / "job.jsonl") as f, open(job_dir / "results.jsonl", "w") as out:
+        for line in f:
+            request = json.loads(line)
+            params = request["params"]
+            text = reply(params) if callable(reply) else reply
+            stop_reason = "end_turn"
+            if estimate_tokens(text) > params["max_tokens"]:
+                text = text[:params["max_tokens"] * 4]
+                stop_reason = "max_tokens"
+            prompt = "".join(m["content"] for m in params["messages"])
+            out.write(json.dumps({
+                "custom_id": request["custom_id"],
+                "result": {"type": "succeeded", "message": {
+                    "type": "message",
+                    "role": "assistant",
+                    "model": params["model"],
+                    "content": [{"type": "text", "text": text}],
+                    "stop_reason": stop_reason,
+                    "usage": {"input_tokens": estimate_tokens(params.get("system", "") + prompt),
+                              "output_tokens": estimate_tokens(text)},
+                }},
+            }) + "\n")
+
+
+def print_status(status: dict):
+    counts = ", ".join(f"{k} {v}" for k, v in (status.get("request_counts") or {}).items())
+    print(f"Bulk job: {status['processing_status']} ({counts})")
+
+
+def check() -> bool:
+    """submit -> collect against a fake Batches API whose job has already ended."""
+    calls = []
+
+    def fake_request(client, method, url, body=None):
+        calls.append((method, url))
+        if method == "POST":
+            fake_request.requests = body["requests"]
+            return json.dumps({"id": "msgbatch_check"}).encode()
+        if url.endswith("/msgbatch_check"):
+            return json.dumps({"processing_status": "ended", "results_url": "https://results/check",
+                               "request_counts": {"succeeded": len(fake_request.requests)}}).encode()
+        return "".join(json.dumps({"custom_id": r["custom_id"], "result": {
+            "type": "succeeded",
+            "message": {"content": [{"type": "text", "text": json.dumps([r["custom_id"]])}]},
+        }}) + "\n" for r in fake_request.requests).encode()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        client = ClaudeClient("check", "check-model", use_cache=False)
+        job = BulkJob("check", client, bulk_dir=Path(tmp), request=fake_request)
+        keys = [f"item-{i}" for i in range(5)]
+        job.submit(keys, lambda batch: " ".join(batch), keys, batch_size=2)
+        values = [call.value for call in job.collect(keys)]
+    expected = [[f"check-{i:05d}"] for i in range(3)]
+    ok = values == expected and [m for m, _ in calls] == ["POST", "GET", "GET"]
+    print(f"bulk submit -> collect: {'ok' if ok else f'FAILED: {values} via {calls}'}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for bulk enrichment jobs")
+    sub = parser.add_subparsers(dest="command")
+    standin = sub.add_parser("standin", help="Answer a job directory's job.jsonl into results.jsonl")
+    standin.add_argument("job_dir", type=Path)
+    standin.add_argument("--reply", default="[]", help="Reply text for every request")
+    sub.add_parser("check", help="Submit and collect a job against a fake Batches API")
+    args = parser.parse_args()
+
+    if args.command == "standin":
+        run_standin(args.job_dir, args.reply)
+        print(f"Wrote {args.job_dir / 'results.jsonl'}")
+        return
+    if args.command == "check":
+        sys.exit(0 if check() else 1)
+    parser.print_help()
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Append-only JSONL checkpoints for the batch enrichment phases.
+
+Phases 5, 6b, 10 and 12 used to re-dump everything generated so far (plus
+processed_count) to one JSON file every CHECKPOINT_EVERY batches: O(total)
+per checkpoint, quadratic overall, and up to CHECKPOINT_EVERY batches lost
+on a crash. A CheckpointLog instead appends one line per completed batch:
+
+    {"processed": 150, "records": [...this batch's results...]}
+
+and fsyncs it, so a crash loses at most the batch in flight. A failed batch
+is not logged: fail() pins `processed` at its start, so later batches still
+log their records but --resume retries from the first failure. On --resume
+replay() yields every logged record and sets `processed`; a torn last line
+(crash mid-write) is dropped and truncated away. At the end of a run the
+phase streams records() straight into its output file (dump_json_array), so
+generated results don't have to be held in memory for the whole run.
+
+A checkpoint in the old single-JSON format (legacy path + list key) is
+picked up by replay() when no log exists yet.
+"""
+
+import json
+import os
+import textwrap
+from pathlib import Path
+from typing import Iterable, Iterator
+
+
+class CheckpointLog:
+    """One JSON line per completed batch: processed count + that batch's records."""
+
+    def __init__(self, path: Path, legacy: tuple[Path, str] | None = None):
+        self.path = Path(path)
+        self.legacy = legacy
+        self.processed = 0
+        self.failed_at: int | None = None
+        self.file = None
+
+    def replay(self) -> Iterator:
+        """Yield every logged record in order; leaves the log ready to append to."""
+        if not self.path.exists() and self.legacy and self.legacy[0].exists():
+            with open(self.legacy[0]) as f:
+                old = json.load(f)
+            self.open()
+            self.append(old["processed_count"], old[self.legacy[1]])
+            self.close()
+
+        self.processed = 0
+        if not self.path.exists():
+            return
+        good = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break  # torn write at the tail
+                good += len(line)
+                self.processed = entry["processed"]
+                yield from entry["records"]
+        if good < self.path.stat().st_size:
+            os.truncate(self.path, good)
+
+    def records(self) -> Iterator:
+        """Every record logged so far (re-reads the file)."""
+        self.flush()
+        if not self.path.exists():
+            return
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    yield from json.loads(line)["records"]
+                except ValueError:
+                    return
+
+    def open(self, resume: bool = True):
+        """Start appending; without resume any previous log is discarded."""
+        if not resume and self.path.exists():
+            self.path.unlink()
+        self.file = open(self.path, "a")
+
+    def fail(self, start: int):
+        """Mark the batch starting at start as failed; processed stops short of it."""
+        if self.failed_at is None or start < self.failed_at:
+            self.failed_at = start
+
+    def append(self, processed: int, records: list):
+        if self.failed_at is not None:
+            processed = min(processed, self.failed_at)
+        line = json.dumps({"processed": processed, "records": records}, separators=(",", ":"))
+        self.file.write(line + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.processed = processed
+
+    def flush(self):
+        if self.file:
+            self.file.flush()
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+    def remove(self) -> bool:
+        """Delete the log (and any legacy checkpoint) after a completed run."""
+        self.close()
+        removed = False
+        for path in (self.path, self.legacy[0] if self.legacy else None):
+            if path and path.exists():
+                path.unlink()
+                removed = True
+        return removed
+
+
+def dump_json_array(items: Iterable, path: Path, indent: int = 2) -> int:
+    """Stream items to path, byte-identical to json.dump(list(items), f, indent=indent)."""
+    count = 0
+    pad = " " * indent
+    with open(path, "w") as f:
+        for item in items:
+            f.write(",\n" if count else "[\n")
+            f.write(textwrap.indent(json.dumps(item, indent=indent), pad))
+            count += 1
+        f.write("\n]" if count else "[]")
+    return count
@@ -0,0 +1,654 @@
+#!/usr/bin/env python3
+"""Shared, concurrent, rate-limited Claude client for the enrichment scripts.
+
+Phases 5, 6b, 10 and 12 and enrich_synopses / enrich_connections all send
+batches of prompts to the Messages API. Instead of one blocking call at a
+time with fixed sleeps in between, they hand the whole list of prompts to a
+ClaudeClient:
+
+  - concurrency:  up to N requests in flight (asyncio + a small thread pool
+                  around urllib, so no SDK is required)
+  - rate limits:  token buckets for requests/minute and input tokens/minute;
+                  input tokens are estimated before the call and corrected
+                  from the response's usage block afterwards
+  - retries:      429 / 5xx / 529 / network errors back off exponentially,
+                  or for exactly retry-after seconds when the server says so
+                  (a 429 pauses every worker, not just the one that hit it)
+  - latency:      every call's latency and attempt count is reported back to
+                  the caller and summarized by stats()
+  - caching:      replies are looked up in (and saved to) the shared
+                  response cache first (response_cache.py); with
+                  cache_only=True a miss is an error and the API is never called
+  - streaming:    with parse_json_array (run_batches' default) the reply is
+                  streamed and fed to a JsonArrayStream (json_stream.py) as
+                  it arrives, so a malformed element costs one item and a
+                  reply cut off at max_tokens keeps the elements it finished
+
+Results are delivered to the caller's callback in prompt order, so the
+existing per-batch bookkeeping (dedup sets, checkpoints) stays sequential.
+run_batches() cuts the batches itself, sized by a BatchSizer (batch_sizer.py)
+from the output observed so far, and splits a batch whose reply was
+truncated at max_tokens or didn't parse instead of failing it whole.
+
+Limits default to the values below and can be overridden per run with
+CLAUDE_CONCURRENCY, CLAUDE_REQUESTS_PER_MINUTE and CLAUDE_TOKENS_PER_MINUTE.
+ANTHROPIC_BASE_URL points the client somewhere else, e.g. the stub server:
+
+  python3 data/claude_client.py --stub --port 8765      # serve canned replies
+  ANTHROPIC_BASE_URL=http://127.0.0.1:8765 python3 data/enrich_synopses.py --limit 20
+  python3 data/claude_client.py --bench 40               # in-process stub + load test
+"""
+
+import argparse
+import asyncio
+import http.client
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Sequence
+
+from batch_sizer import BatchSizer
+from json_stream import JsonArrayStream, parse_json_array
+from response_cache import ResponseCache, response_cache, response_key
+
+API_URL = "https://api.anthropic.com"
+API_VERSION = "2023-06-01"
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_REQUESTS_PER_MINUTE = 50
+DEFAULT_TOKENS_PER_MINUTE = 30000  # input tokens
+MAX_RETRIES = 6
+BACKOFF_BASE = 2.0  # seconds, doubled per attempt
+BACKOFF_CAP = 60.0
+REQUEST_TIMEOUT = 600
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+
+
+class ClaudeAPIError(Exception):
+    """Non-2xx response (or network failure) from the Messages API."""
+
+    def __init__(self, message: str, status: int | None = None, retry_after: float | None = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self) -> bool:
+        return self.status is None or self.status in RETRYABLE_STATUS
+
+
+class CacheMissError(Exception):
+    """cache_only run asked for a prompt that has no cached reply."""
+
+
+class TruncatedReplyError(Exception):
+    """The reply stopped at max_tokens, so its JSON is incomplete.
+
+    With parse_json_array the CallResult's value still holds the elements
+    that arrived complete.
+    """
+
+
+# Failures that a smaller batch can fix. A cache miss is included so that a
+# --cache-only replay follows the splits the original run made.
+SPLITTABLE = (TruncatedReplyError, ValueError, CacheMissError)  # json.JSONDecodeError is a ValueError
+
+
+def env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough input-token estimate (~4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+def parse_json_response(text: str):
+    """JSON payload of a reply, tolerating a ```json fenced block."""
+    content = text.strip()
+    if content.startswith("```"):
+        content = content.split("```")[1]
+        if content.startswith("json"):
+            content = content[4:]
+    return json.loads(content.strip())
+
+
+class TokenBucket:
+    """Refills rate_per_minute units per minute, holding at most one minute's worth."""
+
+    def __init__(self, rate_per_minute: float):
+        self.capacity = float(rate_per_minute)
+        self.rate = rate_per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = asyncio.Lock()
+
+    def refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1):
+        """Wait until amount units are available, then take them (FIFO)."""
+        amount = min(amount, self.capacity)
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                self.refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+    def debit(self, amount: float):
+        """Correct an earlier estimate; the balance may go negative (i.e. into debt)."""
+        self.refill()
+        self.tokens -= amount
+
+    def pause(self, seconds: float):
+        """Hold every acquire() for seconds (server-side 429 with retry-after)."""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+@dataclass
+class CallResult:
+    """One prompt's outcome, handed to the caller's on_result callback."""
+
+    index: int
+    value: object = None
+    error: Exception | None = None
+    latency: float = 0.0  # seconds, last attempt
+    attempts: int = 0
+    cached: bool = False
+    output_tokens: int = 0  # estimated from the reply text
+    start: int = 0  # run_batches(): the items this result covers, [start, end)
+    end: int = 0
+
+    def timing(self) -> str:
+        return "cached" if self.cached else f"{self.latency:.1f}s"
+
+
+class ClaudeClient:
+    """Messages API client that runs many prompts concurrently within rate limits."""
+
+    def __init__(self, api_key: str, model: str, system: str = "", max_tokens: int = 4096,
+                 concurrency: int | None = None, requests_per_minute: int | None = None,
+                 tokens_per_minute: int | None = None, max_retries: int = MAX_RETRIES,
+                 base_url: str | None = None, cache: ResponseCache | None = None,
+                 use_cache: bool = True, cache_only: bool = False, stream: bool = True):
+        self.api_key = api_key
+        self.model = model
+        self.system = system
+        self.max_tokens = max_tokens
+        self.concurrency = concurrency or env_int("CLAUDE_CONCURRENCY", DEFAULT_CONCURRENCY)
+        self.requests_per_minute = requests_per_minute or env_int(
+            "CLAUDE_REQUESTS_PER_MINUTE", DEFAULT_REQUESTS_PER_MINUTE)
+        self.tokens_per_minute = tokens_per_minute or env_int(
+            "CLAUDE_TOKENS_PER_MINUTE", DEFAULT_TOKENS_PER_MINUTE)
+        self.max_retries = max_retries
+        self.base_url = (base_url or os.environ.get("ANTHROPIC_BASE_URL") or API_URL).rstrip("/")
+        self.cache = cache or (response_cache() if use_cache or cache_only else None)
+        self.cache_only = cache_only
+        self.stream = stream
+
+        self.latencies: list[float] = []
+        self.retries = 0
+        self.failures = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+
+    # -- transport --------------------------------------------------------
+
+    def post(self, body: dict) -> dict:
+        """One blocking POST /v1/messages; raises ClaudeAPIError on failure."""
+        req = urllib.request.Request(
+            f"{self.base_url}/v1/messages",
+            data=json.dumps(body).encode("utf-8"),
+            headers={
+                "x-api-key": self.api_key,
+                "anthropic-version": API_VERSION,
+                "content-type": "application/json",
+            },
+            method="POST",
+        )
+        try:
+            with urllib.request.urlopen(req, timeout=REQUEST_TIMEOUT) as resp:
+                return json.loads(resp.read().decode("utf-8"))
+        except urllib.error.HTTPError as e:
+            retry_after = e.headers.get("retry-after") if e.headers else None
+            detail = e.read().decode("utf-8", "replace")[:300]
+            raise ClaudeAPIError(f"HTTP {e.code}: {detail}", status=e.code,
+                                 retry_after=float(retry_after) if retry_after else None) from e
+        except (urllib.error.URLError, TimeoutError, ConnectionError, http.client.HTTPException) as e:
+            raise ClaudeAPIError(f"network error: {e}") from e
+
+    def post_stream(self, body: dict, on_text: Callable[[str], object]) -> dict:
+        """POST /v1/messages with stream=true, passing each text delta to on_text.
+
+        Returns the same shape as post(): content, stop_reason and usage.
+        """
+        req = urllib.request.Request(
+            f"{self.base_url}/v1/messages",
+            data=json.dumps(dict(body, stream=True)).encode("utf-8"),
+            headers={
+                "x-api-key": self.api_key,
+                "anthropic-version": API_VERSION,
+                "content-type": "application/json",
+            },
+            method="POST",
+        )
+        parts = []
+        message = {"stop_reason": None, "usage": {}}
+        try:
+            with urllib.request.urlopen(req, timeout=REQUEST_TIMEOUT) as resp:
+                for line in resp:
+                    if not line.startswith(b"data:"):
+                        continue
+                    try:
+                        event = json.loads(line[5:])
+                    except ValueError as e:  # garbled event: retried like a dropped connection
+                        raise ClaudeAPIError(f"bad stream event: {e}") from e
+                    kind = event.get("type")
+                    if kind == "content_block_delta" and event["delta"].get("type") == "text_delta":
+                        parts.append(event["delta"]["text"])
+                        on_text(event["delta"]["text"])
+                    elif kind == "message_start":
+                        message["usage"].update(event["message"].get("usage") or {})
+                    elif kind == "message_delta":
+                        message["stop_reason"] = event["delta"].get("stop_reason")
+                        message["usage"].update(event.get("usage") or {})
+                    elif kind == "error":
+                        error = event.get("error") or {}
+                        status = 529 if error.get("type") == "overloaded_error" else 500
+                        raise ClaudeAPIError(f"stream error: {error}", status=status)
+        except urllib.error.HTTPError as e:
+            retry_after = e.headers.get("retry-after") if e.headers else None
+            detail = e.read().decode("utf-8", "replace")[:300]
+            raise ClaudeAPIError(f"HTTP {e.code}: {detail}", status=e.code,
+                                 retry_after=float(retry_after) if retry_after else None) from e
+        except (urllib.error.URLError, TimeoutError, ConnectionError, http.client.HTTPException) as e:
+            raise ClaudeAPIError(f"network error: {e}") from e
+        message["content"] = [{"type": "text", "text": "".join(parts)}]
+        return message
+
+    # -- async API --------------------------------------------------------
+
+    async def send(self, prompt: str, system: str | None = None, max_tokens: int | None = None,
+                   sink: JsonArrayStream | None = None) -> tuple[str, float, int, bool]:
+        """Reply text for one prompt, its latency and attempt count, and whether it hit max_tokens.
+
+        With a sink (and streaming on) the reply is streamed into it; the
+        sink is reset before every attempt.
+        """
+        system = self.system if system is None else system
+        body = {
+            "model": self.model,
+            "max_tokens": max_tokens or self.max_tokens,
+            "system": system,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+        estimate = estimate_tokens(system) + estimate_tokens(prompt)
+        loop = asyncio.get_running_loop()
+
+        attempt = 0
+        async with self.semaphore:
+            while True:
+                attempt += 1
+                await self.request_bucket.acquire(1)
+                await self.token_bucket.acquire(estimate)
+                start = time.monotonic()
+                try:
+                    if sink is not None and self.stream:
+                        sink.reset()
+                        data = await loop.run_in_executor(self.executor, self.post_stream, body, sink.feed)
+                    else:
+                        data = await loop.run_in_executor(self.executor, self.post, body)
+                except ClaudeAPIError as e:
+                    if not e.retryable or attempt > self.max_retries:
+                        self.failures += 1
+                        raise
+                    self.retries += 1
+                    delay = e.retry_after
+                    if delay is None:
+                        delay = min(BACKOFF_CAP, BACKOFF_BASE * 2 ** (attempt - 1))
+                        delay *= 0.5 + random.random() / 2
+                    if e.status == 429:
+                        self.request_bucket.pause(delay)
+                        self.token_bucket.pause(delay)
+                    await asyncio.sleep(delay)
+                    continue
+                latency = time.monotonic() - start
+                break
+
+        usage = data.get("usage") or {}
+        actual = usage.get("input_tokens", estimate)
+        self.token_bucket.debit(actual - estimate)
+        self.input_tokens += actual
+        self.output_tokens += usage.get("output_tokens", 0)
+        self.latencies.append(latency)
+
+        text = "".join(block.get("text", "") for block in data.get("content", [])
+                       if block.get("type") == "text")
+        if sink is not None and not self.stream:
+            sink.reset()
+            sink.feed(text)
+        return text, latency, attempt, data.get("stop_reason") == "max_tokens"
+
+    def open_session(self):
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        self.request_bucket = TokenBucket(self.requests_per_minute)
+        self.token_bucket = TokenBucket(self.tokens_per_minute)
+        self.executor = ThreadPoolExecutor(max_workers=self.concurrency)
+
+    async def close_session(self, tasks):
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def call(self, i: int, prompt: str, parse: Callable[[str], object] | None) -> CallResult:
+        """One prompt through the cache or the API; errors are captured, not raised.
+
+        With parse_json_array the value is the list of array elements (None
+        for a malformed one). A reply without the closing "]" is cached like
+        any other (replays must see the same cut) but reported as a
+        TruncatedReplyError, with the finished elements left in value.
+        """
+        result = CallResult(i)
+        key = response_key(self.model, self.system, prompt, self.max_tokens) if self.cache else None
+        sink = JsonArrayStream() if parse is parse_json_array else None
+        try:
+            text = self.cache.get(key) if self.cache else None
+            if text is not None:
+                result.cached = True
+                if sink is not None:
+                    sink.feed(text)
+            elif self.cache_only:
+                raise CacheMissError(f"no cached reply for prompt {key[:12]} (--cache-only)")
+            else:
+                text, result.latency, result.attempts, truncated = await self.send(prompt, sink=sink)
+                if truncated and sink is None:
+                    raise TruncatedReplyError(f"reply truncated at max_tokens={self.max_tokens}")
+            result.output_tokens = estimate_tokens(text)
+            if sink is not None:
+                if not sink.started:
+                    raise json.JSONDecodeError("no JSON array in reply", text, 0)
+                result.value = sink.elements
+            else:
+                result.value = parse(text) if parse else text
+            if self.cache and not result.cached:
+                self.cache.put(key, text, self.model)
+            if sink is not None and not sink.complete:
+                raise TruncatedReplyError(f"reply cut off after {len(sink.elements)} complete elements")
+        except Exception as e:  # handed to the caller, like the old per-batch except blocks
+            result.error = e
+        return result
+
+    async def map_ordered(self, prompts: list[str], on_result: Callable[[CallResult], object],
+                          parse: Callable[[str], object] | None = parse_json_response):
+        """Send every prompt concurrently; call on_result for each in prompt order.
+
+        on_result may return True to stop: pending calls are cancelled and
+        map_ordered() returns True.
+        """
+        self.open_session()
+        tasks = [asyncio.create_task(self.call(i, p, parse)) for i, p in enumerate(prompts)]
+        try:
+            for task in tasks:
+                if on_result(await task):
+                    return True
+            return False
+        finally:
+            await self.close_session(tasks)
+
+    async def map_batches(self, items: Sequence, build_prompt: Callable[[Sequence], str],
+                          on_result: Callable[[CallResult], object], sizer: BatchSizer,
+                          parse: Callable[[str], object] | None = parse_json_array,
+                          start: int = 0, one_per_item: bool = False):
+        """Cut items into sizer-sized batches, send them concurrently, handle them in item order.
+
+        Each result's start/end give the slice of items (offset by start, so
+        a resumed run can pass absolute positions) it covers. A batch whose
+        reply is truncated or unparseable is split in half and both halves
+        retried, down to single items; only a single item's failure reaches
+        on_result as an error. Batch k is sized from the results handled
+        before batch k - concurrency, so the cut is the same on every replay.
+
+        With one_per_item (the reply holds one array element per item, in
+        item order) a truncated reply's k finished elements are handed on as
+        a result for the first k items and only the rest is retried. A
+        single item's truncated reply is handed on with whatever finished.
+        """
+        self.open_session()
+        end = start + len(items)
+
+        async def attempt(lo: int, hi: int) -> tuple[list[CallResult], list[tuple[int, int | None]]]:
+            """Results covering [lo, hi) in order, plus the sizer observations they imply."""
+            result = await self.call(0, build_prompt(items[lo - start:hi - start]), parse)
+            result.start, result.end = lo, hi
+            if result.error is None:
+                return [result], [(hi - lo, result.output_tokens)]
+            if isinstance(result.error, TruncatedReplyError) and result.value:
+                if hi - lo == 1:
+                    done = 1
+                elif one_per_item:
+                    done = min(len(result.value), hi - lo)
+                else:
+                    done = 0
+                if done:
+                    result.error = None
+                    result.end = lo + done
+                    result.value = result.value[:done] if one_per_item else result.value
+                    if lo + done == hi:
+                        return [result], [(done, result.output_tokens)]
+                    rest, rest_obs = await attempt(lo + done, hi)
+                    return [result] + rest, [(done, result.output_tokens)] + rest_obs
+            if hi - lo == 1 or not isinstance(result.error, SPLITTABLE):
+                return [result], []
+            mid = (lo + hi) // 2
+            (left, left_obs), (right, right_obs) = await asyncio.gather(attempt(lo, mid), attempt(mid, hi))
+            return left + right, [(hi - lo, None)] + left_obs + right_obs
+
+        pending = deque()
+        pos = start
+        index = 0
+        try:
+            while pos < end or pending:
+                while pos < end and len(pending) < self.concurrency:
+                    n = min(sizer.size(), end - pos)
+                    pending.append(asyncio.create_task(attempt(pos, pos + n)))
+                    pos += n
+                results, observations = await pending.popleft()
+                for items_seen, output_tokens in observations:
+                    if output_tokens is None:
+                        sizer.overflow(items_seen)
+                    else:
+                        sizer.observe(items_seen, output_tokens)
+                for result in results:
+                    result.index = index
+                    index += 1
+                    if on_result(result):
+                        return True
+            return False
+        finally:
+            await self.close_session(list(pending))
+
+    # -- sync entry points --------------------------------------------------
+
+    def run(self, prompts: list[str], on_result: Callable[[CallResult], object],
+            parse: Callable[[str], object] | None = parse_json_response):
+        """Blocking wrapper around map_ordered() for the (synchronous) scripts."""
+        return asyncio.run(self.map_ordered(prompts, on_result, parse))
+
+    def run_batches(self, items: Sequence, build_prompt: Callable[[Sequence], str],
+                    on_result: Callable[[CallResult], object], sizer: BatchSizer,
+                    parse: Callable[[str], object] | None = parse_json_array, start: int = 0,
+                    one_per_item: bool = False):
+        """Blocking wrapper around map_batches()."""
+        return asyncio.run(self.map_batches(items, build_prompt, on_result, sizer, parse, start,
+                                            one_per_item))
+
+    def complete(self, prompt: str, parse: Callable[[str], object] | None = parse_json_response):
+        """Single blocking call; raises on failure."""
+        box = []
+        self.run([prompt], box.append, parse)
+        if box[0].error:
+            raise box[0].error
+        return box[0].value
+
+    def stats(self) -> str:
+        cache = f"\n{self.cache.stats()}" if self.cache else ""
+        if not self.latencies:
+            return f"claude client: no API calls ({self.failures} failed){cache}"
+        lat = sorted(self.latencies)
+        p95 = lat[min(len(lat) - 1, int(len(lat) * 0.95))]
+        return (f"claude client: {len(lat)} calls, {self.retries} retries, {self.failures} failed; "
+                f"latency p50 {statistics.median(lat):.2f}s p95 {p95:.2f}s max {lat[-1]:.2f}s; "
+                f"tokens in {self.input_tokens} out {self.output_tokens}{cache}")
+
+
+# ============================================================
+# LOCAL STUB SERVER
+# ============================================================
+class StubHandler(BaseHTTPRequestHandler):
+    """Minimal /v1/messages stand-in: canned reply, optional latency and 429s, cut at max_tokens."""
+
+    reply = "[]"
+    latency = 0.0
+    rate_limit_every = 0  # every Nth request gets a 429 with retry-after: 1
+    STREAM_CHUNK = 64
+    count = 0
+    count_lock = threading.Lock()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("content-length", 0))) or b"{}")
+        with self.count_lock:
+            type(self).count += 1
+            n = type(self).count
+        if self.rate_limit_every and n % self.rate_limit_every == 0:
+            self.send_json(429, {"type": "error", "error": {"type": "rate_limit_error"}},
+                           {"retry-after": "1"})
+            return
+        time.sleep(self.latency)
+        prompt = "".join(m.get("content", "") for m in body.get("messages", []))
+        reply = self.reply(body) if callable(self.reply) else self.reply
+        stop_reason = "end_turn"
+        if estimate_tokens(reply) > body.get("max_tokens", 4096):
+            reply = reply[:body["max_tokens"] * 4]
+            stop_reason = "max_tokens"
+        usage = {"input_tokens": estimate_tokens(body.get("system", "") + prompt),
+                 "output_tokens": estimate_tokens(reply)}
+        if body.get("stream"):
+            self.send_stream(body, reply, stop_reason, usage)
+            return
+        self.send_json(200, {
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model"),
+            "content": [{"type": "text", "text": reply}],
+            "stop_reason": stop_reason,
+            "usage": usage,
+        })
+
+    def send_stream(self, body: dict, reply: str, stop_reason: str, usage: dict):
+        """The reply as server-sent events, in STREAM_CHUNK-character text deltas."""
+        self.send_response(200)
+        self.send_header("content-type", "text/event-stream")
+        self.end_headers()
+        events = [{"type": "message_start", "message": {
+            "type": "message", "role": "assistant", "model": body.get("model"),
+            "usage": {"input_tokens": usage["input_tokens"]}}}]
+        events += [{"type": "content_block_delta", "index": 0,
+                    "delta": {"type": "text_delta", "text": reply[i:i + self.STREAM_CHUNK]}}
+                   for i in range(0, len(reply), self.STREAM_CHUNK)]
+        events.append({"type": "message_delta", "delta": {"stop_reason": stop_reason},
+                       "usage": {"output_tokens": usage["output_tokens"]}})
+        events.append({"type": "message_stop"})
+        for event in events:
+            self.wfile.write(f"event: {event['type']}\ndata: {json.dumps(event)}\n\n".encode("utf-8"))
+
+    def send_json(self, status: int, payload: dict, headers: dict | None = None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(port: int = 0, reply="[]", latency: float = 0.0,
+                      rate_limit_every: int = 0) -> tuple[ThreadingHTTPServer, str]:
+    """Serve the stub on a daemon thread; returns (server, base_url)."""
+    handler = type("Stub", (StubHandler,), {
+        "reply": staticmethod(reply) if callable(reply) else reply,
+        "latency": latency,
+        "rate_limit_every": rate_limit_every,
+        "count": 0,
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Claude client stub server and load test")
+    parser.add_argument("--stub", action="store_true", help="Run the stub server in the foreground")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.5, help="Stub reply latency (seconds)")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="Stub: 429 every Nth request")
+    parser.add_argument("--bench", type=int, default=0, help="Send N prompts to an in-process stub")
+    parser.add_argument("--concurrency", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.stub:
+        server, url = start_stub_server(args.port, latency=args.latency,
+                                        rate_limit_every=args.rate_limit_every)
+        print(f"Stub Messages API on {url} (Ctrl-C to stop)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
+        return
+
+    if args.bench:
+        server, url = start_stub_server(latency=args.latency, rate_limit_every=args.rate_limit_every)
+        client = ClaudeClient("stub-key", "stub-model", system="You are a stub.",
+                              concurrency=args.concurrency or None,
+                              requests_per_minute=6000, tokens_per_minute=10_000_000, base_url=url,
+                              use_cache=False)
+        start = time.monotonic()
+        client.run([f"prompt {i}" for i in range(args.bench)], lambda r: None)
+        elapsed = time.monotonic() - start
+        print(f"{args.bench} calls in {elapsed:.2f}s at concurrency {client.concurrency} "
+              f"(sequential would take ~{args.bench * args.latency:.1f}s)")
+        print(client.stats())
+        server.shutdown()
+        return
+
+    parser.print_help()
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""Single-pass parser for `issues_collected` strings.
+
+Shared by import Phase 3 (data/import/import_phase3_issues.py) and
+web/scripts/generate-edition-issues.py so every edition gets one answer.
+
+One compiled tokenizer splits the string into tokens; a left-to-right pass
+with one token of lookahead assembles them into items:
+
+    collects  := item (SEP item)*
+    item      := ["material from"] [name] range
+    name      := (WORD | NUMBER | YEAR | PAREN | "and")+   e.g. "Thor Annual (1966)"
+    range     := "#N" | "#N-M" | "N-M"   (bare numbers only when a separator or the end follows)
+    SEP       := ";" anywhere; "," | "and" directly after a range
+
+A comma after a bare name (no range yet) is a separator only when the name
+already reads as a complete title ("World War Hulk Prologue: World Breaker,
+World War Hulk #1-5"); a short plain name keeps it ("Doctor Strange,
+Sorcerer Supreme #60-90"), and so does "X: Black, White & Blood".
+
+Handled forms:
+  "Fantastic Four #1-30, Annual #1"               annual of the current series
+  "Amazing Spider-Man (1999) #30-58, #500-514"    continuation of the current series
+  "Uncanny X-Men #64, 69-70, 81-82"               bare-number continuations
+  "Daredevil (1964) #283-300 and ANNUAL #7"       "and" after a range separates items
+  "Captain America and Bucky #620-628"            "and" inside a name stays in the name
+  "Peter Parker, the Spectacular Spider-Man #1"   comma inside a name stays in the name
+  "X-Men (1991) 1-5"                              year but no hash
+  "Thor #337 and material from Marvel Fanfare #13" partial issues are skipped
+Point issues (#5.1, #1/2) truncate to the whole number.
+
+parse_collects_ranges() returns one range record per item (see
+issue_ranges.py); parse_collects() expands them into per-issue records with
+duplicates dropped. With use_cache=True both go through a shared ParseCache
+(parse_cache.py), so each distinct string is parsed once per parser version.
+
+    python3 data/collects_parser.py --check   # run the EXAMPLES below
+"""
+
+import argparse
+import re
+import sys
+
+from parse_cache import ParseCache
+
+TOKEN_PATTERN = re.compile(r"""
+    (?P<sep>[;,])
+  | (?P<material>material\s+from\b)
+  | (?P<issue>\#\s*(?P<issue_start>\d+(?:\.\d+|/\d+)?)(?:\s*-\s*\#?\s*(?P<issue_end>\d+(?:\.\d+)?))?)
+  | (?P<number>(?<![\w.\-])(?P<number_start>\d+(?:\.\d+)?)(?:\s*-\s*(?P<number_end>\d+(?:\.\d+)?))?(?![\w\-]))
+  | (?P<year>\(\d{4}\))
+  | (?P<paren>\([^()]*\))
+  | (?P<and>(?<!\w)(?:and|&)(?!\w))
+  | (?P<word>[^\s,;#()]+|[()#])
+  | (?P<space>\s+)
+""", re.VERBOSE | re.IGNORECASE)
+
+ANNUAL_NAME = re.compile(r"^(?P<base>.*?)\s*\bAnnuals?\b\s*(?P<year>\(\d{4}\))?$", re.IGNORECASE)
+HAS_YEAR = re.compile(r"\(\d{4}\)")
+ANNUAL_WORD = re.compile(r"annuals?$", re.IGNORECASE)
+LEADING_COLLECTS = re.compile(r"^\s*collects?\s*:?\s*", re.IGNORECASE)
+# "Elektra: Black, White & Blood": the comma is followed by "Word &"
+AMPERSAND_TITLE = re.compile(r"\s*[A-Za-z][\w'.-]*\s*&")
+# Words that end a title of their own ("X-Men Alpha, Amazing X-Men #1-4")
+TITLE_END_WORDS = {
+    "alpha", "omega", "prime", "annual", "annuals", "special", "one-shot", "edition", "cut",
+    "finale", "prologue", "epilogue", "preview", "ashcan", "mini-comic", "handbook", "crossover",
+    "strikefile", "tpb",
+}
+
+MAX_RANGE = 500  # ranges wider than this are data errors; keep only the start
+
+
+def tokenize(text: str) -> list[tuple[str, re.Match]]:
+    """Significant (kind, match) tokens of text, whitespace dropped."""
+    return [(m.lastgroup, m) for m in TOKEN_PATTERN.finditer(text) if m.lastgroup != "space"]
+
+
+def issue_number(value: str) -> int:
+    """Issue number as an int; point issues (#5.1) truncate to 5, #1/2 to 0."""
+    if "/" in value:
+        numerator, denominator = value.split("/")
+        return int(numerator) // int(denominator)
+    return int(float(value))
+
+
+def issue_range(start: str, end: str | None) -> range:
+    first = issue_number(start)
+    last = issue_number(end) if end else first
+    if last < first or last - first > MAX_RANGE:
+        last = first
+    return range(first, last + 1)
+
+
+def clean_series_name(name: str) -> str:
+    return re.sub(r"\s+", " ", name).strip(" ,:;-")
+
+
+def comma_in_name(name: str, rest: str) -> bool:
+    """Whether a comma after the pending name (and before rest) belongs to the name."""
+    if rest.lstrip().lower().startswith(("and ", "& ")):
+        return False
+    if ":" in name and len(name.rsplit(":", 1)[1].split()) == 1 and AMPERSAND_TITLE.match(rest):
+        return True
+    words = name.split()
+    return (
+        len(words) <= 2
+        and not any(c in name for c in ":()/,")
+        and all(len(w) > 1 and w[0].isalpha() for w in words)
+        and not any(w.lower() in TITLE_END_WORDS for w in words)
+    )
+
+
+def parse_collects_ranges(collects_str: str, edition_slug: str, use_cache: bool = False) -> list[dict]:
+    """Parse an `issues_collected` string into issue range records.
+
+    Returns dicts with edition_slug, series_name, start, end and is_annual, in
+    the order the items appear in the string (ranges may repeat or overlap).
+    """
+    if use_cache:
+        return [
+            {"edition_slug": edition_slug, "series_name": series, "start": start, "end": end, "is_annual": annual}
+            for series, start, end, annual in collects_cache().get(collects_str or "")
+        ]
+    if not collects_str or not collects_str.strip():
+        return []
+    text = LEADING_COLLECTS.sub("", collects_str)
+    tokens = tokenize(text)
+
+    ranges = []
+
+    name_start = name_end = None  # span of the pending series name in text
+    partial = False               # pending item follows "material from"
+    current_series = None         # series of the last item, for "#N" / "Annual #N" continuations
+    current_base = None           # current_series with any annual flag removed
+    current_annual = False
+    current_partial = False
+
+    def emit(numbers: range):
+        nonlocal name_start, name_end, partial
+        nonlocal current_series, current_base, current_annual, current_partial
+        if name_start is not None:
+            name = clean_series_name(text[name_start:name_end])
+            annual = ANNUAL_NAME.match(name)
+            if annual:
+                base = clean_series_name(annual.group("base"))
+                if base:
+                    year = annual.group("year")
+                    series = f"{base} {year}" if year and not HAS_YEAR.search(base) else base
+                else:
+                    series = current_base
+                is_annual = True
+            else:
+                series = name
+                is_annual = False
+            if series and not is_annual:
+                current_base = series
+            current_series, current_annual, current_partial = series, is_annual, partial
+        name_start = name_end = None
+        partial = False
+        if not current_series or current_partial:
+            return
+        ranges.append({
+            "edition_slug": edition_slug,
+            "series_name": current_series,
+            "start": numbers.start,
+            "end": numbers.stop - 1,
+            "is_annual": current_annual,
+        })
+
+    def extend_name(m: re.Match):
+        nonlocal name_start, name_end
+        if name_start is None:
+            name_start = m.start()
+        name_end = m.end()
+
+    for i, (kind, m) in enumerate(tokens):
+        if kind == "sep":
+            if (m.group() == "," and name_start is not None
+                    and comma_in_name(text[name_start:m.start()], text[m.end():])):
+                extend_name(m)
+                continue
+            name_start = name_end = None
+            partial = False
+        elif kind == "material":
+            name_start = name_end = None
+            partial = True
+        elif kind == "issue":
+            emit(issue_range(m.group("issue_start"), m.group("issue_end")))
+        elif kind == "number":
+            following = tokens[i + 1][0] if i + 1 < len(tokens) else "sep"
+            # "Free Comic Book Day 2014": a lone year after a name is part of the
+            # name, except for year-numbered annuals ("Annual 1998")
+            title_year = (
+                name_start is not None and m.group("number_end") is None
+                and len(m.group("number_start")) == 4
+                and not ANNUAL_WORD.match(tokens[i - 1][1].group())
+            )
+            if following in ("sep", "and") and not title_year:
+                emit(issue_range(m.group("number_start"), m.group("number_end")))
+            else:
+                extend_name(m)
+        elif kind == "and":
+            if name_start is not None:
+                extend_name(m)
+        elif kind in ("year", "paren"):
+            if name_start is not None:
+                extend_name(m)
+        else:
+            extend_name(m)
+
+    return ranges
+
+
+def parse_items(collects_str: str) -> list[list]:
+    """Slug-independent [series_name, start, end, is_annual] items (the cached form)."""
+    return [[r["series_name"], r["start"], r["end"], r["is_annual"]]
+            for r in parse_collects_ranges(collects_str, "")]
+
+
+_collects_cache: ParseCache | None = None
+
+
+def collects_cache() -> ParseCache:
+    global _collects_cache
+    if _collects_cache is None:
+        _collects_cache = ParseCache("collects", parse_items)
+    return _collects_cache
+
+
+def parse_collects(collects_str: str, edition_slug: str, use_cache: bool = False) -> list[dict]:
+    """Parse an `issues_collected` string into per-issue edition_issues entries.
+
+    Returns dicts with edition_slug, series_name, issue_number and is_annual,
+    in the order they appear in the string.
+    """
+    issues = []
+    seen = set()
+    for r in parse_collects_ranges(collects_str, edition_slug, use_cache):
+        for num in range(r["start"], r["end"] + 1):
+            key = (r["series_name"], num, r["is_annual"])
+            if key in seen:
+                continue
+            seen.add(key)
+            issues.append({
+                "edition_slug": edition_slug,
+                "series_name": r["series_name"],
+                "issue_number": num,
+                "is_annual": r["is_annual"],
+            })
+    return issues
+
+
+# (issues_collected, expected [series_name, start, end, is_annual] items)
+EXAMPLES = [
+    ("Fantastic Four #1-30, Annual #1",
+     [["Fantastic Four", 1, 30, False], ["Fantastic Four", 1, 1, True]]),
+    ("Amazing Spider-Man (1999) #30-58, #500-514",
+     [["Amazing Spider-Man (1999)", 30, 58, False], ["Amazing Spider-Man (1999)", 500, 514, False]]),
+    ("Uncanny X-Men #64, 69-70, 81-82",
+     [["Uncanny X-Men", 64, 64, False], ["Uncanny X-Men", 69, 70, False], ["Uncanny X-Men", 81, 82, False]]),
+    ("Daredevil (1964) #283-300 and ANNUAL #7",
+     [["Daredevil (1964)", 283, 300, False], ["Daredevil (1964)", 7, 7, True]]),
+    ("Captain America and Bucky #620-628", [["Captain America and Bucky", 620, 628, False]]),
+    ("X-Men (1991) 1-5", [["X-Men (1991)", 1, 5, False]]),
+    ("Thor #337 and material from Marvel Fanfare #13", [["Thor", 337, 337, False]]),
+    ("DOCTOR STRANGE, SORCERER SUPREME #60-90", [["DOCTOR STRANGE, SORCERER SUPREME", 60, 90, False]]),
+    ("PETER PARKER, THE SPECTACULAR SPIDER-MAN (1976) #1-10",
+     [["PETER PARKER, THE SPECTACULAR SPIDER-MAN (1976)", 1, 10, False]]),
+    ("Avengers (1963) #1, Doctor Strange, Sorcerer Supreme #2",
+     [["Avengers (1963)", 1, 1, False], ["Doctor Strange, Sorcerer Supreme", 2, 2, False]]),
+    ("Elektra: Black, White & Blood #1-4", [["Elektra: Black, White & Blood", 1, 4, False]]),
+    ("X-MEN 2099: OASIS and X-NATION 2099 #1-6", [["X-MEN 2099: OASIS and X-NATION 2099", 1, 6, False]]),
+    ("WORLD WAR HULK PROLOGUE: WORLD BREAKER, WORLD WAR HULK #1-5", [["WORLD WAR HULK", 1, 5, False]]),
+    ("X-Men Alpha, Amazing X-Men #1-4", [["Amazing X-Men", 1, 4, False]]),
+    ("Siege: Loki, and Journey Into Mystery (2011) #622-636",
+     [["Journey Into Mystery (2011)", 622, 636, False]]),
+]
+
+
+def check() -> int:
+    """Parse every EXAMPLES string; returns the number of mismatches."""
+    failures = 0
+    for text, expected in EXAMPLES:
+        got = parse_items(text)
+        if got != expected:
+            failures += 1
+            print(f"FAIL {text!r}\n  expected {expected}\n  got      {got}")
+    print(f"{len(EXAMPLES) - failures}/{len(EXAMPLES)} examples parsed as expected")
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="issues_collected parser")
+    parser.add_argument("--check", action="store_true", help="Parse the built-in examples")
+    args = parser.parse_args()
+    if not args.check:
+        parser.print_help()
+        sys.exit(1)
+    sys.exit(1 if check() else 0)
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""Rank candidate editions for a connection-generation batch and fit them to a token budget.
+
+Phase 6b used to send every slug in the catalog (~14K tokens) or every edition
+of the adjacent eras with every batch. A ContextSelector instead scores each
+catalog edition against the batch and keeps the best ones until the prompt's
+context section reaches an explicit token budget. The signals, per batch
+edition, summed over the batch:
+
+  - issues:      issues shared with the batch edition (IssueIntervalIndex over
+                 parsed issues_collected ranges)
+  - graph:       1 or 2 hops away in connections.json
+  - creators:    shared creator names, weighted by rarity (idf)
+  - characters:  shared characters mentioned in title/synopsis (characters.json
+                 names and aliases, matched as whole words), weighted by rarity
+  - era:         same or adjacent era, a weak tie-breaker so every budget fills
+
+Each batch edition first gets its own top PER_EDITION matches (round-robin),
+then the ranking summed over the batch fills the rest of the budget.
+select() returns the context lines plus a record of what was chosen and why,
+which Phase 6b writes to logs/phase6b_context.jsonl for auditing.
+"""
+
+import math
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from claude_client import estimate_tokens
+from collects_parser import parse_collects_ranges
+from issue_ranges import IssueIntervalIndex, merge_intervals
+from keyword_automaton import KeywordAutomaton
+
+ISSUE_WEIGHT = 3.0     # any shared issue ...
+ISSUE_BONUS = 3.0      # ... plus up to this much more at ISSUE_CAP shared issues
+ISSUE_CAP = 12
+GRAPH_WEIGHTS = {1: 4.0, 2: 1.5}
+CREATOR_WEIGHT = 0.6   # per shared creator, times idf ...
+CREATOR_CAP = 4.0      # ... capped per edition pair
+CHARACTER_WEIGHT = 0.6  # per shared character, times idf ...
+CHARACTER_CAP = 3.0    # ... capped per edition pair (crossovers mention everyone)
+ERA_WEIGHTS = {0: 0.5, 1: 0.25}
+PER_EDITION = 5        # round-robin picks per batch edition before the summed ranking
+TITLE_CHARS = 50
+
+NON_WORD = re.compile(r"[^a-z0-9]+")
+PARENTHETICAL = re.compile(r"\s*\([^)]*\)")
+
+
+def words(text: str) -> str:
+    """Lowercase text as space-padded words, so padded keywords match whole words."""
+    return " " + NON_WORD.sub(" ", text.lower()).strip() + " "
+
+
+def context_line(edition: dict) -> str:
+    return f"{edition['slug']}|{edition.get('title', '')[:TITLE_CHARS]}"
+
+
+@dataclass
+class Selection:
+    """Context chosen for one batch."""
+
+    lines: list[str]
+    tokens: int
+    considered: int
+    chosen: list[tuple[str, float, dict]] = field(default_factory=list)  # (slug, score, reasons)
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+    def record(self, batch: list[dict], budget: int) -> dict:
+        return {
+            "batch": [ed["slug"] for ed in batch],
+            "budget": budget,
+            "tokens": self.tokens,
+            "considered": self.considered,
+            "selected": [[slug, round(score, 2), reasons] for slug, score, reasons in self.chosen],
+        }
+
+
+class ContextSelector:
+    """Scores catalog editions against a batch using issue, graph, creator and character overlap."""
+
+    def __init__(self, editions: list[dict], connections: list[dict] = (),
+                 characters: list[dict] = (), era_order: list[str] = ()):
+        self.editions = {ed["slug"]: ed for ed in editions}
+        self.era_rank = {slug: i for i, slug in enumerate(era_order)}
+
+        # Character names/aliases -> character slugs, matched as padded whole words
+        self.character_keys: dict[str, set[str]] = defaultdict(set)
+        for char in characters:
+            for name in [char.get("name", "")] + list(char.get("aliases") or []):
+                name = words(PARENTHETICAL.sub("", name))
+                if len(name.strip()) > 3:
+                    self.character_keys[name].add(char["slug"])
+        self.character_automaton = KeywordAutomaton(self.character_keys)
+
+        self.by_creator: dict[str, set[str]] = defaultdict(set)
+        self.by_character: dict[str, set[str]] = defaultdict(set)
+        self.by_era: dict[str, list[str]] = defaultdict(list)
+        self.profiles = {}
+        records = []
+        for slug, ed in self.editions.items():
+            creators, chars = self.profile(ed)
+            self.profiles[slug] = (creators, chars)
+            for c in creators:
+                self.by_creator[c].add(slug)
+            for c in chars:
+                self.by_character[c].add(slug)
+            self.by_era[ed.get("era_slug", "")].append(slug)
+            records.extend(parse_collects_ranges(ed.get("issues_collected") or "", slug, use_cache=True))
+        self.issues = IssueIntervalIndex(records)
+
+        self.neighbors: dict[str, set[str]] = defaultdict(set)
+        for c in connections:
+            src, tgt = c.get("source_slug"), c.get("target_slug")
+            if src and tgt and src != tgt:
+                self.neighbors[src].add(tgt)
+                self.neighbors[tgt].add(src)
+
+        n = max(len(self.editions), 1)
+        self.creator_idf = {c: math.log(n / len(s)) for c, s in self.by_creator.items()}
+        self.character_idf = {c: math.log(n / len(s)) for c, s in self.by_character.items()}
+
+    def profile(self, edition: dict) -> tuple[frozenset[str], frozenset[str]]:
+        """(creator names, character slugs) of an edition."""
+        creators = frozenset(c["name"] for c in edition.get("creators") or [] if c.get("name"))
+        text = words(f"{edition.get('title', '')} {edition.get('synopsis', '')}")
+        chars = frozenset(slug for key in self.character_automaton.find(text)
+                          for slug in self.character_keys[key])
+        return creators, chars
+
+    def shared_issues(self, edition: dict) -> dict[str, int]:
+        """Issues the edition shares with every catalog edition."""
+        if edition["slug"] in self.issues.edition_ranges:
+            return self.issues.shared_counts(edition["slug"])
+        by_key = defaultdict(list)
+        for r in parse_collects_ranges(edition.get("issues_collected") or "", edition["slug"], use_cache=True):
+            by_key[(r["series_name"], r["is_annual"])].append((r["start"], r["end"]))
+        shared = defaultdict(int)
+        for (series, annual), ivs in by_key.items():
+            for lo, hi in merge_intervals(ivs):
+                for other, s, e in self.issues.overlapping(series, lo, hi, annual):
+                    shared[other] += min(hi, e) - max(lo, s) + 1
+        return shared
+
+    def graph_distances(self, slug: str) -> dict[str, int]:
+        """Editions 1 or 2 hops from slug."""
+        dist = {}
+        for n1 in self.neighbors.get(slug, ()):
+            dist[n1] = 1
+        for n1 in list(dist):
+            for n2 in self.neighbors.get(n1, ()):
+                dist.setdefault(n2, 2)
+        dist.pop(slug, None)
+        return dist
+
+    def score_edition(self, ed: dict) -> dict[str, tuple[float, dict]]:
+        """slug -> (score, reasons) for every catalog edition related to one edition."""
+        scores: dict[str, float] = defaultdict(float)
+        reasons: dict[str, dict] = defaultdict(dict)
+
+        def add(slug: str, points: float, signal: str, amount):
+            scores[slug] += points
+            reasons[slug][signal] = amount
+
+        slug = ed["slug"]
+        creators, chars = self.profiles.get(slug) or self.profile(ed)
+
+        for other, n in self.shared_issues(ed).items():
+            add(other, ISSUE_WEIGHT + ISSUE_BONUS * min(n, ISSUE_CAP) / ISSUE_CAP, "issues", n)
+
+        for other, hops in self.graph_distances(slug).items():
+            add(other, GRAPH_WEIGHTS[hops], "graph", hops)
+
+        for signal, keys, index, idf, weight, cap in (
+            ("creators", creators, self.by_creator, self.creator_idf, CREATOR_WEIGHT, CREATOR_CAP),
+            ("characters", chars, self.by_character, self.character_idf, CHARACTER_WEIGHT, CHARACTER_CAP),
+        ):
+            pair_points: dict[str, float] = defaultdict(float)
+            pair_count: dict[str, int] = defaultdict(int)
+            for k in keys:
+                for other in index.get(k, ()):
+                    pair_points[other] += weight * idf[k]
+                    pair_count[other] += 1
+            for other, points in pair_points.items():
+                add(other, min(points, cap), signal, pair_count[other])
+
+        rank = self.era_rank.get(ed.get("era_slug", ""))
+        if rank is not None:
+            for era, r in self.era_rank.items():
+                distance = abs(r - rank)
+                if distance in ERA_WEIGHTS:
+                    for other in self.by_era.get(era, ()):
+                        add(other, ERA_WEIGHTS[distance], "era", distance)
+
+        scores.pop(slug, None)
+        return {other: (scores[other], reasons[other]) for other in scores}
+
+    def select(self, batch: list[dict], budget: int, per_edition: int = PER_EDITION) -> Selection:
+        """Batch editions, then each one's best matches, then the best batch-wide matches.
+
+        Candidates are added until the context reaches budget tokens. The first
+        per_edition rounds go round-robin over the batch so every edition gets
+        its own strongest neighbours before the summed ranking fills the rest.
+        """
+        batch_slugs = {ed["slug"] for ed in batch}
+        lines = [context_line(ed) for ed in batch]
+        selection = Selection(lines, sum(estimate_tokens(line + "\n") for line in lines), 0)
+
+        per_ed = [self.score_edition(ed) for ed in batch]
+        totals: dict[str, float] = defaultdict(float)
+        why: dict[str, dict] = {}
+        for i, scored in enumerate(per_ed):
+            for slug, (points, reasons) in scored.items():
+                if slug not in batch_slugs:
+                    totals[slug] += points
+                    why.setdefault(slug, {})[batch[i]["slug"]] = reasons
+        selection.considered = len(totals)
+
+        def ranked(points: dict[str, float]) -> list[str]:
+            return sorted((slug for slug in points if slug not in batch_slugs),
+                          key=lambda slug: (-points[slug], slug))
+
+        ranked_each = [iter(ranked({k: v[0] for k, v in scored.items()})) for scored in per_ed]
+        order = [next(it, None) for _ in range(per_edition) for it in ranked_each]
+        order += ranked(totals)
+
+        taken = set()
+        for slug in order:
+            if slug is None or slug in taken:
+                continue
+            line = context_line(self.editions[slug])
+            cost = estimate_tokens(line + "\n")
+            if selection.tokens + cost > budget:
+                break
+            taken.add(slug)
+            selection.lines.append(line)
+            selection.tokens += cost
+            selection.chosen.append((slug, totals[slug], why[slug]))
+        return selection
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""In-memory edition graph over connections.json, in compressed sparse row form.
+
+get_whats_next() in supabase/migrations/004_create_functions.sql is a
+recursive CTE: every request re-joins connections and collected_editions at
+each depth and carries a path UUID[] per row. EditionGraph loads the graph
+once, gives every edition a dense integer id and stores the edges as CSR
+arrays (array module, one slot per edge):
+
+  offsets[v] .. offsets[v + 1]   edges leaving edition v, in connections.json order
+  targets, kinds, strengths, confidences
+
+whats_next() answers the same query as the SQL function:
+
+  - depth 1:  edges from the edition of type leads_to, recommended_after or
+              spin_off (NEXT_TYPES)
+  - deeper:   leads_to / recommended_after edges (FOLLOW_TYPES) from every
+              edition reached so far, up to max_depth, never revisiting an
+              edition already on the path
+  - per edition reached, the row with the strongest incoming edge wins, then
+              the shallowest (DISTINCT ON edition_id ... strength DESC, depth ASC);
+              remaining ties keep the first path found
+
+Edges whose source or target is not in collected_editions.json are dropped,
+as the CTE's join with collected_editions does. Results are ordered by the
+Go service's score (strength * 10 + confidence - depth * 20, see
+docs/api.md) instead of by UUID.
+
+  python3 data/edition_graph.py ff-omnibus-v1 --depth 3
+  python3 data/edition_graph.py --bench      # against the CTE in SQLite, every edition
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+
+WEB_DATA_DIR = Path(__file__).parent.parent / "web" / "data"
+EDITIONS_PATH = WEB_DATA_DIR / "collected_editions.json"
+CONNECTIONS_PATH = WEB_DATA_DIR / "connections.json"
+
+NEXT_TYPES = ("leads_to", "recommended_after", "spin_off")
+FOLLOW_TYPES = ("leads_to", "recommended_after")
+DEFAULT_DEPTH = 3
+
+
+@dataclass
+class NextRead:
+    """One get_whats_next row."""
+
+    slug: str
+    title: str
+    connection_type: str
+    strength: int
+    confidence: int
+    depth: int
+    path: tuple[str, ...]
+
+    @property
+    def score(self) -> int:
+        return self.strength * 10 + self.confidence - self.depth * 20
+
+
+class EditionGraph:
+    """Edition -> edition connections as CSR arrays over dense edition ids."""
+
+    def __init__(self, editions: list[dict], connections: list[dict]):
+        self.slugs: list[str] = []
+        self.titles: list[str] = []
+        self.ids: dict[str, int] = {}
+        for ed in editions:
+            if ed["slug"] not in self.ids:
+                self.ids[ed["slug"]] = len(self.slugs)
+                self.slugs.append(ed["slug"])
+                self.titles.append(ed.get("title", ""))
+
+        self.kind_names = sorted({c["connection_type"] for c in connections})
+        kind_ids = {name: i for i, name in enumerate(self.kind_names)}
+        self.next_kinds = {kind_ids[t] for t in NEXT_TYPES if t in kind_ids}
+        self.follow_kinds = {kind_ids[t] for t in FOLLOW_TYPES if t in kind_ids}
+
+        edges = []
+        for c in connections:
+            if c.get("source_type", "edition") != "edition" or c.get("target_type", "edition") != "edition":
+                continue
+            src, tgt = self.ids.get(c["source_slug"]), self.ids.get(c["target_slug"])
+            if src is None or tgt is None:
+                continue
+            edges.append((src, tgt, kind_ids[c["connection_type"]],
+                          c.get("strength") or 0, c.get("confidence") or 0))
+        edges.sort(key=lambda e: e[0])  # stable: connections.json order within a source
+
+        n = len(self.slugs)
+        self.offsets = array("i", [0] * (n + 1))
+        for src, *_ in edges:
+            self.offsets[src + 1] += 1
+        for v in range(n):
+            self.offsets[v + 1] += self.offsets[v]
+        self.targets = array("i", (e[1] for e in edges))
+        self.kinds = array("b", (e[2] for e in edges))
+        self.strengths = array("h", (e[3] for e in edges))
+        self.confidences = array("h", (e[4] for e in edges))
+
+    @classmethod
+    def load(cls, editions_path: Path = EDITIONS_PATH,
+             connections_path: Path = CONNECTIONS_PATH) -> "EditionGraph":
+        with open(editions_path) as f:
+            editions = json.load(f)
+        with open(connections_path) as f:
+            connections = json.load(f)
+        return cls(editions, connections)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    def out_edges(self, slug: str) -> list[tuple[str, str, int, int]]:
+        """(target slug, connection type, strength, confidence) of every edge leaving slug."""
+        v = self.ids[slug]
+        return [(self.slugs[self.targets[e]], self.kind_names[self.kinds[e]],
+                 self.strengths[e], self.confidences[e])
+                for e in range(self.offsets[v], self.offsets[v + 1])]
+
+    def whats_next(self, slug: str, max_depth: int = DEFAULT_DEPTH) -> list[NextRead]:
+        """get_whats_next(slug, max_depth), best row per edition, highest score first."""
+        offsets, targets, kinds, strengths = self.offsets, self.targets, self.kinds, self.strengths
+        best: dict[int, tuple[int, int, int, tuple[int, ...]]] = {}  # target -> (strength, depth, edge, path)
+        path = [self.ids[slug]]
+
+        def walk(v: int, depth: int, allowed: set[int]):
+            for e in range(offsets[v], offsets[v + 1]):
+                if kinds[e] not in allowed:
+                    continue
+                t = targets[e]
+                if depth > 1 and t in path:
+                    continue
+                held = best.get(t)
+                if held is None or strengths[e] > held[0] or (strengths[e] == held[0] and depth < held[1]):
+                    best[t] = (strengths[e], depth, e, (*path, t))
+                if depth < max_depth:
+                    path.append(t)
+                    walk(t, depth + 1, self.follow_kinds)
+                    path.pop()
+
+        walk(path[0], 1, self.next_kinds)
+
+        rows = [
+            NextRead(self.slugs[t], self.titles[t], self.kind_names[kinds[e]], strength,
+                     self.confidences[e], depth, tuple(self.slugs[p] for p in ids))
+            for t, (strength, depth, e, ids) in best.items()
+        ]
+        rows.sort(key=lambda r: (-r.score, r.slug))
+        return rows
+
+
+# ---------------------------------------------------------------------------
+# Benchmark: the SQL function's recursive CTE on an in-memory SQLite copy
+# ---------------------------------------------------------------------------
+# Postgres arrays become a ",id,id," path string and DISTINCT ON becomes
+# ROW_NUMBER(); everything else is 004_create_functions.sql as written.
+WHATS_NEXT_CTE = """
+WITH RECURSIVE next_reads(edition_id, title, connection_type, strength, confidence, depth, path) AS (
+    SELECT c.target_id, ce.title, c.connection_type, c.strength, c.confidence, 1,
+           ',' || c.source_id || ',' || c.target_id || ','
+    FROM connections c
+    JOIN collected_editions ce ON c.target_id = ce.id
+    WHERE c.source_type = 'edition'
+      AND c.source_id = :edition
+      AND c.target_type = 'edition'
+      AND c.connection_type IN ('leads_to', 'recommended_after', 'spin_off')
+
+    UNION ALL
+
+    SELECT c.target_id, ce.title, c.connection_type, c.strength, c.confidence, nr.depth + 1,
+           nr.path || c.target_id || ','
+    FROM next_reads nr
+    JOIN connections c ON c.source_type = 'edition'
+                       AND c.source_id = nr.edition_id
+                       AND c.target_type = 'edition'
+                       AND c.connection_type IN ('leads_to', 'recommended_after')
+    JOIN collected_editions ce ON c.target_id = ce.id
+    WHERE nr.depth < :max_depth
+      AND instr(nr.path, ',' || c.target_id || ',') = 0
+)
+SELECT edition_id, strength, depth FROM (
+    SELECT *, ROW_NUMBER() OVER (PARTITION BY edition_id ORDER BY strength DESC, depth ASC) AS rn
+    FROM next_reads
+) WHERE rn = 1
+ORDER BY edition_id
+"""
+
+
+def sqlite_copy(editions: list[dict], connections: list[dict]) -> tuple[sqlite3.Connection, dict[str, int]]:
+    """collected_editions and connections tables (integer ids, 002's source index)."""
+    db = sqlite3.connect(":memory:")
+    db.executescript("""
+        CREATE TABLE collected_editions (id INTEGER PRIMARY KEY, slug TEXT UNIQUE, title TEXT);
+        CREATE TABLE connections (source_type TEXT, source_id INTEGER, target_type TEXT,
+                                  target_id INTEGER, connection_type TEXT, strength INTEGER,
+                                  confidence INTEGER);
+        CREATE INDEX idx_connections_source ON connections(source_type, source_id);
+    """)
+    ids: dict[str, int] = {}
+    for ed in editions:
+        ids.setdefault(ed["slug"], len(ids))
+    db.executemany("INSERT INTO collected_editions VALUES (?, ?, ?)",
+                   [(i, slug, "") for slug, i in ids.items()])
+    db.executemany("INSERT INTO connections VALUES (?, ?, ?, ?, ?, ?, ?)", [
+        (c.get("source_type", "edition"), ids.get(c["source_slug"], -1), c.get("target_type", "edition"),
+         ids.get(c["target_slug"], -1), c["connection_type"], c.get("strength") or 0,
+         c.get("confidence") or 0)
+        for c in connections
+    ])
+    db.execute("ANALYZE")  # statistics let the planner drive the recursive step from next_reads
+    return db, ids
+
+
+def bench(max_depth: int):
+    with open(EDITIONS_PATH) as f:
+        editions = json.load(f)
+    with open(CONNECTIONS_PATH) as f:
+        connections = json.load(f)
+
+    started = time.perf_counter()
+    graph = EditionGraph(editions, connections)
+    load_ms = (time.perf_counter() - started) * 1000
+    db, ids = sqlite_copy(editions, connections)
+    slugs = list(graph.ids)
+    print(f"Graph: {len(slugs)} editions, {graph.edge_count} edges (of {len(connections)}), "
+          f"built in {load_ms:.1f}ms; depth {max_depth}")
+
+    started = time.perf_counter()
+    ours = [graph.whats_next(slug, max_depth) for slug in slugs]
+    csr = time.perf_counter() - started
+
+    started = time.perf_counter()
+    theirs = [db.execute(WHATS_NEXT_CTE, {"edition": ids[slug], "max_depth": max_depth}).fetchall()
+              for slug in slugs]
+    cte = time.perf_counter() - started
+
+    mismatches = 0
+    for rows, sql_rows in zip(ours, theirs):
+        got = {(graph.ids[r.slug], r.strength, r.depth) for r in rows}
+        if got != set(sql_rows):
+            mismatches += 1
+    results = sum(len(rows) for rows in ours)
+    print(f"CSR:        {csr * 1e6 / len(slugs):8.1f} us/query ({csr:.3f}s total)")
+    print(f"CTE/SQLite: {cte * 1e6 / len(slugs):8.1f} us/query ({cte:.3f}s total)")
+    print(f"{len(slugs)} queries, {results} rows, {mismatches} mismatches; "
+          f"{cte / csr:.0f}x faster")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="What's Next queries over the in-memory edition graph")
+    parser.add_argument("slug", nargs="?", help="Edition slug to start from")
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH, help="max_depth (default 3)")
+    parser.add_argument("--bench", action="store_true",
+                        help="Query every edition and compare with the recursive CTE in SQLite")
+    args = parser.parse_args()
+
+    if args.bench:
+        bench(args.depth)
+        return
+    if args.slug:
+        graph = EditionGraph.load()
+        if args.slug not in graph.ids:
+            print(f"Unknown edition: {args.slug}")
+            sys.exit(1)
+        for r in graph.whats_next(args.slug, args.depth):
+            print(f"{r.score:4d}  d{r.depth}  {r.connection_type:<17} {r.strength:>2}/{r.confidence:<3}  "
+                  f"{r.slug}  ({' > '.join(r.path)})")
+        return
+    parser.print_help()
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
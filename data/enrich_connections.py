@@ -8,22 +8,23 @@ and issue overlap. Validates all suggested target slugs exist in the dataset.
 Writes output to a SEPARATE file for review — never mutates the original.
 
 Requires ANTHROPIC_API_KEY environment variable.
-Requires: pip install anthropic
 
 Usage:
   python3 data/enrich_connections.py                    # Full run
   python3 data/enrich_connections.py --dry-run           # List orphans, no API calls
   python3 data/enrich_connections.py --limit 10          # Process first 10 orphans
   python3 data/enrich_connections.py --resume             # Resume from checkpoint
+  python3 data/enrich_connections.py --cache-only         # Replay cached replies, no API calls
 """
 
 import argparse
 import json
-import sys
 import time
 from collections import defaultdict
 from pathlib import Path
 
+from batch_sizer import BatchSizer
+from claude_client import ClaudeClient
 from enrichment_config import (
     EDITIONS_PATH,
     CONNECTIONS_PATH,
@@ -31,15 +32,17 @@ from enrichment_config import (
     ENRICHED_CONNECTIONS_PATH,
     CONNECTIONS_REPORT_PATH,
     CONNECTIONS_CHECKPOINT_PATH,
-    API_DELAY_SECONDS,
     CONNECTIONS_SYSTEM_PROMPT,
     build_connections_prompt,
     get_api_key,
 )
 
-BATCH_SIZE = 10          # orphans per API call
+BATCH_SIZE = 10          # orphans per API call to start; adapted to output size
 CHECKPOINT_EVERY = 5     # batches between saves
 
+MODEL = "claude-sonnet-4-6"
+MAX_TOKENS = 8192
+
 # Valid connection types (for validation)
 VALID_CONNECTION_TYPES = {
     "leads_to", "ties_into", "spin_off", "retcons", "references",
@@ -91,38 +94,6 @@ def load_data() -> dict:
     }
 
 
-# ============================================================
-# API CALLS
-# ============================================================
-def call_claude_api(prompt: str, api_key: str) -> list[dict]:
-    """Call Claude API and parse JSON response."""
-    try:
-        import anthropic
-    except ImportError:
-        print("ERROR: anthropic package not installed. Run: pip install anthropic")
-        sys.exit(1)
-
-    client = anthropic.Anthropic(api_key=api_key)
-
-    response = client.messages.create(
-        model="claude-sonnet-4-6",
-        max_tokens=8192,
-        system=CONNECTIONS_SYSTEM_PROMPT,
-        messages=[{"role": "user", "content": prompt}],
-    )
-
-    content = response.content[0].text.strip()
-
-    # Extract JSON from response (handle markdown code blocks)
-    if content.startswith("```"):
-        content = content.split("```")[1]
-        if content.startswith("json"):
-            content = content[4:]
-    content = content.strip()
-
-    return json.loads(content)
-
-
 # ============================================================
 # VALIDATION
 # ============================================================
@@ -139,6 +110,9 @@ def validate_connections(
     rejected = 0
 
     for entry in raw_results:
+        if not isinstance(entry, dict):  # malformed element in the reply
+            rejected += 1
+            continue
         source_slug = entry.get("source_slug", "")
         if source_slug not in all_slugs:
             rejected += 1
@@ -263,6 +237,10 @@ def main():
         "--resume", action="store_true",
         help="Resume from checkpoint"
     )
+    parser.add_argument(
+        "--cache-only", action="store_true",
+        help="Replay cached Claude replies only; never call the API"
+    )
     args = parser.parse_args()
 
     print("=" * 60)
@@ -281,15 +259,14 @@ def main():
             print(f"  {o['slug']:<60} {o['format']:<20} {era_name}")
         return
 
-    api_key = get_api_key()
+    api_key = "" if args.cache_only else get_api_key()
 
     if args.limit:
         orphans = orphans[:args.limit]
 
     print(f"\nOrphans to process: {len(orphans)}")
-    total_batches = (len(orphans) + BATCH_SIZE - 1) // BATCH_SIZE
-    print(f"Batch size: {BATCH_SIZE}")
-    print(f"Estimated API calls: {total_batches}")
+    print(f"Batch size: {BATCH_SIZE} to start, adapted to output size")
+    print(f"Estimated API calls: {(len(orphans) + BATCH_SIZE - 1) // BATCH_SIZE}")
     print()
 
     if not orphans:
@@ -315,35 +292,36 @@ def main():
         print(f"Resuming from checkpoint: {start_index} already processed, {len(all_new_connections)} connections")
 
     batches_since_checkpoint = 0
+    sizer = BatchSizer(MAX_TOKENS, BATCH_SIZE)
 
-    for batch_start in range(start_index, len(orphans), BATCH_SIZE):
-        batch_end = min(batch_start + BATCH_SIZE, len(orphans))
+    client = ClaudeClient(api_key, MODEL, system=CONNECTIONS_SYSTEM_PROMPT, max_tokens=MAX_TOKENS,
+                          cache_only=args.cache_only)
+
+    def batch_prompt(batch):
+        return build_connections_prompt(batch, data["all_slugs"], data["connections"], data["eras_by_slug"])
+
+    def handle(call):
+        nonlocal batches_since_checkpoint
+        batch_start, batch_end = call.start, call.end
         batch = orphans[batch_start:batch_end]
-        batch_num = batch_start // BATCH_SIZE + 1
 
         slugs_str = ", ".join(e["slug"][:25] for e in batch)
         print(
-            f"Batch {batch_num}/{total_batches} "
-            f"(orphans {batch_start + 1}-{batch_end}): {slugs_str}...",
+            f"Batch {call.index + 1} "
+            f"(orphans {batch_start + 1}-{batch_end} of {len(orphans)}): {slugs_str}...",
             end=" ",
-            flush=True,
         )
 
-        try:
-            prompt = build_connections_prompt(
-                batch, data["all_slugs"], data["connections"], data["eras_by_slug"]
-            )
-            raw_results = call_claude_api(prompt, api_key)
-
-            validated = validate_connections(raw_results, data["all_slugs"], existing_pairs)
+        if call.error is None:
+            validated = validate_connections(call.value, data["all_slugs"], existing_pairs)
             all_new_connections.extend(validated)
-            print(f"OK ({len(validated)} valid connections)")
+            print(f"OK ({len(validated)} valid connections, {call.timing()})")
 
-        except json.JSONDecodeError as e:
-            print(f"JSON parse error: {e} — skipping batch")
+        elif isinstance(call.error, json.JSONDecodeError):
+            print(f"JSON parse error: {call.error} — skipping batch")
 
-        except Exception as e:
-            print(f"API error: {e} — skipping batch")
+        else:
+            print(f"API error: {call.error} — skipping batch")
 
         batches_since_checkpoint += 1
 
@@ -358,7 +336,12 @@ def main():
             print(f"  [Checkpoint saved: {batch_end}/{len(orphans)}]")
             batches_since_checkpoint = 0
 
-        time.sleep(API_DELAY_SECONDS)
+    # Concurrent, rate-limited calls; results are handled in orphan order, and a
+    # truncated or unparseable batch is split and retried
+    client.run_batches(orphans[start_index:], batch_prompt, handle, sizer, start=start_index,
+                       one_per_item=True)
+    print(client.stats())
+    print(sizer.stats())
 
     # Merge new connections with existing
     merged = data["connections"] + all_new_connections
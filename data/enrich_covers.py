@@ -14,6 +14,8 @@ import urllib.error
 import sys
 import os
 
+from isbn_index import clean_isbn
+
 # Rate limiting for Google Books
 GOOGLE_DELAY = 1.2  # seconds between requests
 OPEN_LIBRARY_DELAY = 0.3  # be polite even without hard limits
@@ -36,11 +38,11 @@ def open_library_by_isbn(isbn):
     """Search Open Library by ISBN. Returns cover URL or None."""
     if not isbn:
         return None
-    clean_isbn = isbn.replace("-", "")
-    url = f"https://openlibrary.org/api/books?bibkeys=ISBN:{clean_isbn}&format=json&jscmd=data"
+    isbn = clean_isbn(isbn)
+    url = f"https://openlibrary.org/api/books?bibkeys=ISBN:{isbn}&format=json&jscmd=data"
     data = fetch_json(url)
     if data:
-        key = f"ISBN:{clean_isbn}"
+        key = f"ISBN:{isbn}"
         if key in data and "cover" in data[key]:
             cover = data[key]["cover"]
             return cover.get("large") or cover.get("medium") or cover.get("small")
@@ -89,8 +91,8 @@ def google_books_by_isbn(isbn):
     """Search Google Books by ISBN. Returns cover URL or None."""
     if not isbn:
         return None
-    clean_isbn = isbn.replace("-", "")
-    url = f"https://www.googleapis.com/books/v1/volumes?q=isbn:{clean_isbn}&maxResults=1"
+    isbn = clean_isbn(isbn)
+    url = f"https://www.googleapis.com/books/v1/volumes?q=isbn:{isbn}&maxResults=1"
     data = fetch_json(url)
     if data and data.get("items"):
         info = data["items"][0].get("volumeInfo", {})
@@ -7,7 +7,6 @@ and editorial context. Writes enriched output to a SEPARATE file for
 review — never mutates the original.
 
 Requires ANTHROPIC_API_KEY environment variable.
-Requires: pip install anthropic
 
 Usage:
   python3 data/enrich_synopses.py                      # Full run
@@ -15,16 +14,22 @@ Usage:
   python3 data/enrich_synopses.py --dry-run --limit 10  # Score first 10
   python3 data/enrich_synopses.py --limit 5             # Enrich first 5 (test)
   python3 data/enrich_synopses.py --resume              # Resume from checkpoint
+  python3 data/enrich_synopses.py --cache-only          # Replay cached replies, no API calls
   python3 data/enrich_synopses.py --priority 1          # Only priority 1 (full rewrites)
+  python3 data/enrich_synopses.py --bulk submit         # Offline: submit everything as one job
+  python3 data/enrich_synopses.py --bulk poll           # ... check on it
+  python3 data/enrich_synopses.py --bulk collect        # ... merge its results (see bulk_jobs.py)
 """
 
 import argparse
 import json
-import sys
 import time
 from collections import defaultdict
 from pathlib import Path
 
+from batch_sizer import BatchSizer
+from bulk_jobs import BulkJob, local_job, print_status
+from claude_client import ClaudeClient
 from enrichment_config import (
     EDITIONS_PATH,
     CONNECTIONS_PATH,
@@ -36,13 +41,15 @@ from enrichment_config import (
     SYNOPSIS_CHECKPOINT_PATH,
     BATCH_SIZE,
     CHECKPOINT_EVERY,
-    API_DELAY_SECONDS,
     SYNOPSIS_SYSTEM_PROMPT,
     build_synopsis_prompt,
     get_api_key,
     score_synopsis_quality,
 )
 
+MODEL = "claude-sonnet-4-6"
+MAX_TOKENS = 8192
+
 
 # ============================================================
 # DATA LOADING
@@ -151,50 +158,9 @@ def print_quality_summary(analysis: dict):
         print(f"  [{r['score']:3d}] {r['title'][:60]:<60} ({r['length']} chars, {r['citation_count']} citations)")
 
 
-# ============================================================
-# API CALLS
-# ============================================================
-def call_claude_api(prompt: str, api_key: str) -> list[dict]:
-    """Call Claude API and parse JSON response."""
-    try:
-        import anthropic
-    except ImportError:
-        print("ERROR: anthropic package not installed. Run: pip install anthropic")
-        sys.exit(1)
-
-    client = anthropic.Anthropic(api_key=api_key)
-
-    response = client.messages.create(
-        model="claude-sonnet-4-6",
-        max_tokens=8192,
-        system=SYNOPSIS_SYSTEM_PROMPT,
-        messages=[{"role": "user", "content": prompt}],
-    )
-
-    content = response.content[0].text.strip()
-
-    # Extract JSON from response (handle markdown code blocks)
-    if content.startswith("```"):
-        content = content.split("```")[1]
-        if content.startswith("json"):
-            content = content[4:]
-    content = content.strip()
-
-    return json.loads(content)
-
-
 # ============================================================
 # ENRICHMENT
 # ============================================================
-def enrich_batch(batch: list[dict], context: dict, api_key: str) -> list[dict]:
-    """Enrich a batch of editions via Claude API.
-
-    Returns list of dicts with 'index', 'synopsis', 'connection_notes'.
-    """
-    prompt = build_synopsis_prompt(batch, context)
-    return call_claude_api(prompt, api_key)
-
-
 def apply_enrichment(edition: dict, result: dict) -> dict:
     """Apply enrichment result to an edition, returning modified copy."""
     enriched = dict(edition)
@@ -304,10 +270,22 @@ def main():
         "--resume", action="store_true",
         help="Resume from checkpoint"
     )
+    parser.add_argument(
+        "--cache-only", action="store_true",
+        help="Replay cached Claude replies only; never call the API"
+    )
     parser.add_argument(
         "--priority", type=int, default=0,
         help="Only process editions with this priority level (1, 2, or 3)"
     )
+    parser.add_argument(
+        "--bulk", choices=("submit", "poll", "collect"),
+        help="Offline mode: submit every batch as one bulk job, poll it, collect its results"
+    )
+    parser.add_argument(
+        "--bulk-local", action="store_true",
+        help="With --bulk submit: leave the job for the local stand-in (bulk_jobs.py standin)"
+    )
     args = parser.parse_args()
 
     print("=" * 60)
@@ -327,8 +305,9 @@ def main():
         print("\n[DRY RUN] No API calls made.")
         return
 
-    # Get API key
-    api_key = get_api_key()
+    # Get API key (not needed for cache replays or the local bulk stand-in)
+    local = args.bulk_local if args.bulk == "submit" else bool(args.bulk) and local_job("enrich_synopses")
+    api_key = "" if args.cache_only or local else get_api_key()
 
     # Filter to editions needing enrichment
     needs_work = []
@@ -342,9 +321,8 @@ def main():
         needs_work = needs_work[:args.limit]
 
     print(f"\nEditions to enrich: {len(needs_work)}")
-    print(f"Batch size: {BATCH_SIZE}")
-    total_batches = (len(needs_work) + BATCH_SIZE - 1) // BATCH_SIZE
-    print(f"Estimated API calls: {total_batches}")
+    print(f"Batch size: {BATCH_SIZE} to start, adapted to output size")
+    print(f"Estimated API calls: {(len(needs_work) + BATCH_SIZE - 1) // BATCH_SIZE}")
     print()
 
     if not needs_work:
@@ -354,7 +332,7 @@ def main():
     # Handle resume
     start_index = 0
     enriched_map = {}  # slug -> enriched edition
-    if args.resume and SYNOPSIS_CHECKPOINT_PATH.exists():
+    if args.resume and not args.bulk and SYNOPSIS_CHECKPOINT_PATH.exists():
         with open(SYNOPSIS_CHECKPOINT_PATH) as f:
             checkpoint = json.load(f)
         start_index = checkpoint["processed_count"]
@@ -362,37 +340,52 @@ def main():
         print(f"Resuming from checkpoint: {start_index} already processed")
 
     batches_since_checkpoint = 0
+    sizer = BatchSizer(MAX_TOKENS, BATCH_SIZE)
+
+    client = ClaudeClient(api_key, MODEL, system=SYNOPSIS_SYSTEM_PROMPT, max_tokens=MAX_TOKENS,
+                          cache_only=args.cache_only)
+
+    # Offline bulk mode: one job with every batch, merged by a later --bulk collect
+    bulk = BulkJob("enrich_synopses", client) if args.bulk else None
+    keys = [e["slug"] for e in needs_work]
+    if args.bulk == "submit":
+        manifest = bulk.submit(keys, lambda batch: build_synopsis_prompt(batch, context),
+                               needs_work, BATCH_SIZE, local=args.bulk_local)
+        print(f"Submitted {len(manifest['ranges'])} requests as one {manifest['backend']} bulk job: {bulk.dir}")
+        return
+    if args.bulk == "poll":
+        print_status(bulk.status())
+        return
 
-    for batch_start in range(start_index, len(needs_work), BATCH_SIZE):
-        batch_end = min(batch_start + BATCH_SIZE, len(needs_work))
+    def handle(call):
+        nonlocal batches_since_checkpoint
+        batch_start, batch_end = call.start, call.end
         batch = needs_work[batch_start:batch_end]
-        batch_num = batch_start // BATCH_SIZE + 1
 
         slugs_str = ", ".join(e["slug"][:30] for e in batch)
         print(
-            f"Batch {batch_num}/{total_batches} "
-            f"(entries {batch_start + 1}-{batch_end}): {slugs_str}...",
+            f"Batch {call.index + 1} "
+            f"(entries {batch_start + 1}-{batch_end} of {len(needs_work)}): {slugs_str}...",
             end=" ",
-            flush=True,
         )
 
-        try:
-            results = enrich_batch(batch, context, api_key)
+        if call.error is None:
+            results = call.value
 
             applied = 0
             for i, edition in enumerate(batch):
-                if i < len(results):
+                if i < len(results) and isinstance(results[i], dict):  # None = malformed element
                     enriched = apply_enrichment(edition, results[i])
                     enriched_map[edition["slug"]] = enriched
                     applied += 1
 
-            print(f"OK ({applied} enriched)")
+            print(f"OK ({applied} enriched, {call.timing()})")
 
-        except json.JSONDecodeError as e:
-            print(f"JSON parse error: {e} — skipping batch")
+        elif isinstance(call.error, json.JSONDecodeError):
+            print(f"JSON parse error: {call.error} — skipping batch")
 
-        except Exception as e:
-            print(f"API error: {e} — skipping batch")
+        else:
+            print(f"API error: {call.error} — skipping batch")
 
         batches_since_checkpoint += 1
 
@@ -407,8 +400,17 @@ def main():
             print(f"  [Checkpoint saved: {batch_end}/{len(needs_work)}]")
             batches_since_checkpoint = 0
 
-        # Rate limiting
-        time.sleep(API_DELAY_SECONDS)
+    if bulk:
+        # The bulk job's results, handed over in entry order like a live run
+        for call in bulk.collect(keys):
+            handle(call)
+    else:
+        # Concurrent, rate-limited calls; results are handled in entry order, and a
+        # truncated or unparseable batch is split and retried
+        client.run_batches(needs_work[start_index:], lambda batch: build_synopsis_prompt(batch, context),
+                           handle, sizer, start=start_index, one_per_item=True)
+        print(client.stats())
+        print(sizer.stats())
 
     # Build enriched output — full edition list with enrichments applied
     enriched_editions = []
@@ -36,9 +36,10 @@ CONNECTIONS_CHECKPOINT_PATH = SCRIPT_DIR / "enrich_connections_checkpoint.json"
 # ============================================================
 # BATCH SETTINGS
 # ============================================================
-BATCH_SIZE = 5           # editions per API call (smaller = richer context per call)
+BATCH_SIZE = 5           # editions per API call to start (smaller = richer context per call);
+                         # batch_sizer.py adapts it to the observed output size
 CHECKPOINT_EVERY = 10    # batches between checkpoint saves (= 50 editions)
-API_DELAY_SECONDS = 1.0  # delay between API calls
+# Concurrency and rate limits live in claude_client.py (CLAUDE_* env overrides)
 
 # ============================================================
 # QUALITY SCORING
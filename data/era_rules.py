@@ -0,0 +1,1634 @@
+#!/usr/bin/env python3
+"""Declarative era-rule table and the compiled matcher that evaluates it.
+
+The era heuristics that were spread over scripts/audit_eras.py (KNOWN_RUNS and
+overlap keywords), audit_eras_v2.py (EXPLICIT_ERA_MAP, TITLE_ERA_PATTERNS,
+SERIES_YEARS), audit_eras_v3.py (title -> series era map),
+cleanup_data_quality.py (SERIES_YEAR_ERA) and Phase 4b (year -> era) live
+here as one table. EraRuleEngine compiles it once:
+
+  - exact slug rules        -> dict lookup
+  - substring rules         -> one Aho-Corasick automaton per text field
+                               (keyword_automaton.py), so an edition's title,
+                               slug, synopsis and issues are each scanned once;
+                               overlap keywords become cached class tags
+                               (keyword_classifier.py)
+  - regex rules             -> prefiltered by a literal each regex requires,
+                               found by the same automaton scan
+  - year -> era resolution  -> an interval index over era year ranges and
+                               the overlap windows that need keyword checks
+
+evaluate() runs the passes in PASSES order and reports which rule fired,
+so `python3 scripts/audit_eras.py` is one reproducible audit of the catalog.
+"""
+
+import re
+from dataclasses import dataclass, field
+
+from issue_ranges import IntervalTree
+from keyword_automaton import KeywordAutomaton
+from keyword_classifier import KeywordClassifier
+from series_calendar import collects_years, series_calendar
+
+# ============================================================
+# EXPLICIT SLUG -> ERA MAPPING (highest priority, manually verified)
+# For editions where automatic detection fails or is ambiguous.
+# ============================================================
+
+EXPLICIT_ERA_MAP = {
+    # Infinity trilogy — all event-age (1991-1993)
+    "infinity-gauntlet-omnibus": "event-age",
+    "infinity-war-omnibus": "event-age",
+    "infinity-crusade-omnibus": "event-age",
+    "infinity-war-crusade": "event-age",
+    "infinity-war-crusade-omnibus": "event-age",
+
+    # Infinity by Hickman (2013) — hickman-saga
+    "infinity": "hickman-saga",
+    "infinity-by-hickman": "hickman-saga",
+
+    # Infinity Wars by Duggan (2018) — all-new-all-different
+    "infinity-wars-by-gerry-duggan": "all-new-all-different",
+    "infinity-wars-duggan": "all-new-all-different",
+
+    # Infamous Iron Man (2016-2018) — all-new-all-different
+    "infamous-iron-man": "all-new-all-different",
+
+    # Ms. Marvel by Wilson started 2014 but bulk is ANAD era
+    "ms-marvel-by-g-willow-wilson": "all-new-all-different",
+    "ms-marvel-omnibus-v1-kamala-khan": "all-new-all-different",
+
+    # Secret Wars (1984) — rise-of-x-men
+    "secret-wars-1984-omnibus": "rise-of-x-men",
+    "secret-wars-1984": "rise-of-x-men",
+
+    # Secret Wars II (1985) — event-age
+    "secret-wars-ii": "event-age",
+
+    # Secret Wars (2015) — hickman-saga
+    "secret-wars-2015-omnibus": "hickman-saga",
+    "secret-wars-battleworld-v1": "hickman-saga",
+
+    # Captain America: White (published 2015, set in WWII, Loeb/Sale)
+    "captain-america-white": "hickman-saga",
+
+    # Original Sin (2014) — hickman-saga
+    "original-sin": "hickman-saga",
+    "original-sin-companion": "hickman-saga",
+
+    # Death of Wolverine (2014) — hickman-saga
+    "death-of-wolverine-complete": "hickman-saga",
+    "death-of-wolverine": "hickman-saga",
+
+    # Spider-Verse (2014) — hickman-saga
+    "spider-verse": "hickman-saga",
+    "spider-verse-spider-geddon": "all-new-all-different",
+
+    # Marvels (1994) — speculation-crash
+    "marvels": "speculation-crash",
+    "marvels-eye-of-the-camera": "bendis-avengers",
+
+    # ASM Omnibus Vol 2 — expansion era (issues 39-67ish, 1966-1969)
+    "asm-omnibus-v2": "the-expansion",
+
+    # Phoenix by Stephanie Phillips (2024) — blood-hunt-doom (From the Ashes)
+    "phoenix-2024": "blood-hunt-doom",
+
+    # Forge (2024) — blood-hunt-doom
+    "forge-2024": "blood-hunt-doom",
+
+    # NYX (2024) — blood-hunt-doom
+    "nyx-2024": "blood-hunt-doom",
+
+    # Timeless by Jed MacKay — dawn-of-krakoa
+    "timeless-jed-mackay": "dawn-of-krakoa",
+
+    # Ultimate Invasion (2023) — dawn-of-krakoa era launch
+    "ultimate-invasion": "dawn-of-krakoa",
+
+    # Ultimate Universe by Hickman Omnibus — current-ongoings
+    "ultimate-universe-hickman-omnibus": "current-ongoings",
+    "ultimate-universe-hickman-omnibus-v2": "current-ongoings",
+
+    # Amazing Spider-Man by Zeb Wells (started 2022) — dawn-of-krakoa
+    "amazing-spider-man-by-zeb-wells": "dawn-of-krakoa",
+    "amazing-spider-man-by-zeb-wells-v2": "dawn-of-krakoa",
+    "amazing-spider-man-by-zeb-wells-v3": "dawn-of-krakoa",
+    "amazing-spider-man-by-zeb-wells-v4": "dawn-of-krakoa",
+    "asm-gang-war": "dawn-of-krakoa",
+    "gold-goblin": "dawn-of-krakoa",
+    "dark-web": "dawn-of-krakoa",
+    "spider-boy-dan-slott": "dawn-of-krakoa",
+    "spine-tingling-spider-man": "dawn-of-krakoa",
+    "spider-man-shadow-green-goblin": "dawn-of-krakoa",
+
+    # Carnage by Ram V (2023) — dawn-of-krakoa
+    "carnage-by-ram-v-2023": "dawn-of-krakoa",
+    "carnage-ram-v": "dawn-of-krakoa",
+
+    # Doctor Strange by Jed MacKay (2023) — dawn-of-krakoa
+    "doctor-strange-jed-mackay-2023": "dawn-of-krakoa",
+
+    # Ghost Rider by Benjamin Percy (2022) — dawn-of-krakoa
+    "ghost-rider-benjamin-percy": "dawn-of-krakoa",
+    "ghost-rider-percy-2022": "dawn-of-krakoa",
+
+    # Punisher by Jason Aaron (2022) — dawn-of-krakoa
+    "punisher-by-jason-aaron-2022": "dawn-of-krakoa",
+    "punisher-jason-aaron": "dawn-of-krakoa",
+
+    # Scarlet Witch by Orlando Vol. 2 (2023) — dawn-of-krakoa
+    "scarlet-witch-orlando-v2": "dawn-of-krakoa",
+
+    # Miles Morales by Ziglar (started 2022) — dawn-of-krakoa
+    "miles-morales-spider-man-by-cody-ziglar": "dawn-of-krakoa",
+
+    # Predator titles (2023-2024)
+    "predator-vs-wolverine": "dawn-of-krakoa",
+    "predator-the-last-hunt": "dawn-of-krakoa",
+
+    # Wolverine: Blood Hunt — blood-hunt-doom
+    "wolverine-blood-hunt": "blood-hunt-doom",
+
+    # Thor by Gronbekk — dawn-of-krakoa
+    "thor-gronbekk": "dawn-of-krakoa",
+
+    # Luke Cage by David Walker (2016-2017) — all-new-all-different
+    "luke-cage-by-david-walker": "all-new-all-different",
+    "luke-cage-david-walker": "all-new-all-different",
+
+    # Bucky Barnes: Winter Soldier (2014-2015) — hickman-saga
+    "bucky-barnes-the-winter-soldier": "hickman-saga",
+
+    # Avengers: Rage of Ultron (2015) — hickman-saga
+    "avengers-rage-of-ultron": "hickman-saga",
+
+    # Doctor Strange: Infinity War EC — event-age
+    "doctor-strange-ec-infinity-war": "event-age",
+
+    # Daredevil: Born Again — rise-of-x-men (1986)
+    "daredevil-born-again": "rise-of-x-men",
+
+    # Gambit Classic Omnibus — speculation-crash (1990s)
+    "gambit-omnibus": "speculation-crash",
+    "gambit-classic-omnibus": "speculation-crash",
+
+    # X-Factor Original Vol. 1 — event-age (1986-1989)
+    "x-factor-original-omnibus": "event-age",
+
+    # Daredevil by Ann Nocenti — event-age (1986-1991)
+    "daredevil-nocenti-omnibus": "event-age",
+
+    # Captain America by Gruenwald — event-age (started 1985)
+    "captain-america-gruenwald-omnibus-v1": "event-age",
+
+    # West Coast Avengers Vol. 2 — event-age (1987-1989)
+    "west-coast-avengers-omnibus-v2": "event-age",
+
+    # Silver Surfer Omnibus Vol. 3 — event-age (1987-1989)
+    "silver-surfer-omnibus-v3": "event-age",
+
+    # New Warriors Classic — event-age (1989-1993)
+    "new-warriors-classic-omnibus-v1": "event-age",
+
+    # Moon Knight Compendium — spans multiple eras, best in rise-of-x-men
+    "moon-knight-compendium": "rise-of-x-men",
+
+    # Cloak and Dagger — rise-of-x-men
+    "cloak-and-dagger-omnibus": "rise-of-x-men",
+
+    # ROM Spaceknight — rise-of-x-men
+    "rom-spaceknight-omnibus-v1": "rise-of-x-men",
+
+    # Uncanny X-Men Omnibus Vol 5 (Claremont) — event-age (1986-1988)
+    "uxm-claremont-omnibus-v5": "event-age",
+
+    # X-Men: Schism (2011) — hickman-saga
+    "x-men-schism": "hickman-saga",
+
+    # Scarlet Witch by Orlando (started 2023) vol 1 — dawn-of-krakoa
+    "scarlet-witch-by-steve-orlando": "dawn-of-krakoa",
+
+    # Immortal Thor by Ewing (started 2023) — dawn-of-krakoa
+    "immortal-thor-ewing-v1": "dawn-of-krakoa",
+    "immortal-thor-ewing-v2": "dawn-of-krakoa",
+
+    # Avengers Inc by MacKay (2023) — dawn-of-krakoa
+    "avengers-inc-jed-mackay": "dawn-of-krakoa",
+
+    # Captain America: Symbol of Truth (2022) — dawn-of-krakoa
+    "cap-symbol-of-truth": "dawn-of-krakoa",
+
+    # Captain Marvel by Alyssa Wong (2023-2024) — dawn-of-krakoa
+    "captain-marvel-alyssa-wong": "dawn-of-krakoa",
+
+    # Daredevil: Gang War (2024) — dawn-of-krakoa
+    "daredevil-gang-war": "dawn-of-krakoa",
+
+    # Deadpool by Cody Ziglar (2024) — blood-hunt-doom
+    "deadpool-cody-ziglar": "blood-hunt-doom",
+
+    # Luke Cage: City of Fire (2023) — dawn-of-krakoa
+    "luke-cage-city-of-fire": "dawn-of-krakoa",
+
+    # Nova by Loveness (2024) — blood-hunt-doom
+    "nova-loveness-2024": "blood-hunt-doom",
+
+    # Wolverine: Revenge (2024) — blood-hunt-doom
+    "wolverine-revenge": "blood-hunt-doom",
+
+    # Venom War (2024) — blood-hunt-doom
+    "venom-war": "blood-hunt-doom",
+
+    # FF by Ryan North Vol 2-3 (2023-2024) — dawn-of-krakoa
+    "ff-ryan-north-v2": "dawn-of-krakoa",
+    "ff-ryan-north-v3": "dawn-of-krakoa",
+    "fantastic-four-ryan-north-v2": "dawn-of-krakoa",
+    "fantastic-four-ryan-north-v3": "dawn-of-krakoa",
+    "fantastic-four-full-circle-ii": "dawn-of-krakoa",
+}
+
+# Partial slug matches only count for map keys longer than this
+EXPLICIT_PARTIAL_MIN_LEN = 10
+
+
+# ============================================================
+# TITLE/CREATOR -> ERA MAPPING (pattern-based)
+# ============================================================
+
+TITLE_ERA_PATTERNS = [
+    # Format: (pattern, era_slug, priority)
+    # Higher priority = more specific match
+
+    # Specific modern runs with year in title
+    (r"by.*zeb wells", "dawn-of-krakoa", 10),
+    (r"by.*chip zdarsky", "dawn-of-krakoa", 8),
+    (r"by.*donny cates.*(?:venom|thor|hulk)", "dawn-of-krakoa", 8),
+    (r"by.*al ewing.*(?:venom|immortal|defenders|ultimates)", "dawn-of-krakoa", 7),
+    (r"by.*jed mackay.*(?:moon knight|black cat|avengers|doctor strange)", "dawn-of-krakoa", 8),
+    (r"war of the realms", "dawn-of-krakoa", 10),
+    (r"king in black", "dawn-of-krakoa", 10),
+    (r"empyre", "dawn-of-krakoa", 10),
+    (r"absolute carnage", "dawn-of-krakoa", 10),
+    (r"devil.*s reign", "dawn-of-krakoa", 10),
+    (r"blood hunt", "blood-hunt-doom", 10),
+    (r"one world under doom", "blood-hunt-doom", 10),
+    (r"from the ashes", "blood-hunt-doom", 10),
+    (r"armageddon", "current-ongoings", 10),
+
+    # Classic runs
+    (r"by.*stan lee.*jack kirby", "birth-of-marvel", 10),
+    (r"by.*stan lee.*steve ditko", "birth-of-marvel", 10),
+    (r"by.*jim starlin.*warlock", "bronze-age", 10),
+    (r"by.*chris claremont.*byrne", "rise-of-x-men", 10),
+    (r"by.*john byrne.*fantastic", "rise-of-x-men", 10),
+    (r"by.*walt simonson.*thor", "rise-of-x-men", 10),
+    (r"by.*frank miller.*daredevil", "rise-of-x-men", 10),
+
+    # Specific events/crossovers
+    (r"civil war ii", "all-new-all-different", 10),
+    (r"civil war(?!\s*ii)", "bendis-avengers", 9),
+    (r"house of m(?!\s*/)", "bendis-avengers", 10),
+    (r"secret invasion", "bendis-avengers", 10),
+    (r"dark reign", "bendis-avengers", 9),
+    (r"siege\b", "bendis-avengers", 8),
+    (r"avengers disassembled", "bendis-avengers", 10),
+    (r"secret empire(?!\s*companion)", "all-new-all-different", 10),
+    (r"secret empire companion", "all-new-all-different", 10),
+    (r"fear itself", "hickman-saga", 10),
+    (r"age of ultron(?!\s*complete)", "hickman-saga", 10),
+    (r"original sin", "hickman-saga", 10),
+    (r"axis\b", "hickman-saga", 9),
+    (r"a\.x\.e\.", "dawn-of-krakoa", 10),
+    (r"judgment day", "dawn-of-krakoa", 10),
+    (r"sins of sinister", "dawn-of-krakoa", 10),
+    (r"x of swords", "dawn-of-krakoa", 10),
+    (r"fall of the house of x", "dawn-of-krakoa", 10),
+    (r"rise of the powers of x", "dawn-of-krakoa", 10),
+    (r"house of x.*powers of x", "dawn-of-krakoa", 10),
+    (r"dawn of x", "dawn-of-krakoa", 10),
+    (r"onslaught", "speculation-crash", 10),
+    (r"age of apocalypse", "speculation-crash", 10),
+    (r"clone saga", "speculation-crash", 10),
+    (r"fatal attractions", "speculation-crash", 10),
+    (r"heroes reborn", "heroes-reborn-return", 10),
+    (r"heroes return", "heroes-reborn-return", 10),
+    (r"kree.skrull war", "bronze-age", 10),
+    (r"korvac saga", "bronze-age", 10),
+    (r"galactus trilogy", "birth-of-marvel", 10),
+    (r"dark phoenix", "rise-of-x-men", 10),
+    (r"mutant massacre", "event-age", 10),
+    (r"inferno omnibus", "event-age", 10),
+    (r"x-tinction agenda", "event-age", 10),
+    (r"muir island saga", "event-age", 10),
+    (r"phalanx covenant", "speculation-crash", 10),
+]
+
+# Series tied to one era: (substring of the lowercased title, era_slug)
+TITLE_SERIES_ERAS = [
+    # Dawn of Krakoa X-titles (2019-2024)
+    ("house of x", "dawn-of-krakoa"),
+    ("powers of x", "dawn-of-krakoa"),
+    ("x of swords", "dawn-of-krakoa"),
+    ("reign of x", "dawn-of-krakoa"),
+    ("trial of magneto", "dawn-of-krakoa"),
+    ("inferno (2021)", "dawn-of-krakoa"),
+    ("immortal x-men", "dawn-of-krakoa"),
+    ("sins of sinister", "dawn-of-krakoa"),
+    ("fall of x", "dawn-of-krakoa"),
+    ("fall of the house of x", "dawn-of-krakoa"),
+    ("rise of the powers of x", "dawn-of-krakoa"),
+    ("hellfire gala", "dawn-of-krakoa"),
+    ("x-men (2019)", "dawn-of-krakoa"),
+    ("x-men (2021)", "dawn-of-krakoa"),
+    ("marauders (2019)", "dawn-of-krakoa"),
+    ("excalibur (2019)", "dawn-of-krakoa"),
+    ("new mutants (2019)", "dawn-of-krakoa"),
+    ("x-force (2019)", "dawn-of-krakoa"),
+    ("wolverine (2020)", "dawn-of-krakoa"),
+    ("cable (2020)", "dawn-of-krakoa"),
+    ("hellions", "dawn-of-krakoa"),
+    ("way of x", "dawn-of-krakoa"),
+    ("s.w.o.r.d.", "dawn-of-krakoa"),
+    ("sword (2020)", "dawn-of-krakoa"),
+    ("x-men: destiny of x", "dawn-of-krakoa"),
+
+    # Blood Hunt / Doom era (2024-2025)
+    ("blood hunt", "blood-hunt-doom"),
+    ("one world under doom", "blood-hunt-doom"),
+    ("doctor doom (2024)", "blood-hunt-doom"),
+
+    # ANAD era (2015-2018)
+    ("secret wars (2015)", "hickman-saga"),  # technically caps hickman
+    ("all-new all-different", "all-new-all-different"),
+    ("civil war ii", "all-new-all-different"),
+    ("secret empire (2017)", "all-new-all-different"),
+    ("inhumans vs. x-men", "all-new-all-different"),
+    ("champions (2016)", "all-new-all-different"),
+    ("immortal hulk", "all-new-all-different"),
+    ("venom by donny cates", "all-new-all-different"),
+
+    # Bendis Avengers era
+    ("civil war", "bendis-avengers"),
+    ("house of m", "bendis-avengers"),
+    ("secret invasion", "bendis-avengers"),
+    ("dark reign", "bendis-avengers"),
+    ("siege", "bendis-avengers"),
+    ("avengers disassembled", "bendis-avengers"),
+    ("annihilation", "bendis-avengers"),
+    ("annihilation: conquest", "bendis-avengers"),
+
+    # Hickman saga
+    ("avengers by jonathan hickman", "hickman-saga"),
+    ("new avengers by jonathan hickman", "hickman-saga"),
+    ("ff by jonathan hickman", "hickman-saga"),
+    ("fantastic four by jonathan hickman", "hickman-saga"),
+]
+
+# Title-based patterns ONLY for clearly-labeled reprint collections
+REPRINT_TITLE_PATTERNS = [
+    # "Original Marvel Years" omnibuses of classic content
+    (r"timely.s", "birth-of-marvel"),
+    (r"golden age captain america", "birth-of-marvel"),
+    (r"golden age marvel comics", "birth-of-marvel"),
+    (r"golden age human torch", "birth-of-marvel"),
+    (r"golden age sub-mariner", "birth-of-marvel"),
+    (r"atlas era", "birth-of-marvel"),
+]
+
+# ============================================================
+# PUBLICATION YEAR SIGNALS
+# ============================================================
+
+# Known run dates for major creators/series combinations
+# Format: (pattern_in_slug_or_title, start_year, end_year)
+KNOWN_RUNS = [
+    # Silver/Golden Age (1961-1966)
+    ("lee kirby", 1961, 1970),
+    ("lee ditko", 1962, 1966),
+
+    # Specific collected editions with known dates
+    # Birth of Marvel era titles
+    ("fantastic four omnibus vol. 1", 1961, 1963),
+    ("fantastic four omnibus vol. 2", 1964, 1966),
+    ("fantastic four omnibus vol. 3", 1966, 1968),
+    ("amazing spider-man omnibus vol. 1", 1962, 1966),
+    ("amazing spider-man omnibus vol. 2", 1966, 1969),
+    ("avengers omnibus vol. 1", 1963, 1966),
+    ("avengers omnibus vol. 2", 1966, 1968),
+    ("mighty thor omnibus vol. 1", 1962, 1966),
+    ("mighty thor omnibus vol. 2", 1966, 1968),
+    ("uncanny x-men omnibus vol. 1 (original)", 1963, 1966),
+    ("x-men omnibus vol. 1 (original)", 1963, 1966),
+    ("x-men omnibus vol. 2 (original)", 1966, 1970),
+    ("iron man omnibus vol. 1", 1963, 1968),
+    ("iron man omnibus vol. 2", 1968, 1972),
+    ("incredible hulk omnibus vol. 1", 1962, 1967),
+    ("doctor strange by lee", 1963, 1966),
+    ("nick fury, agent of s.h.i.e.l.d. omnibus", 1965, 1968),
+    ("ant-man/giant-man", 1962, 1966),
+
+    # Expansion era (1966-1970)
+    ("fantastic four omnibus vol. 4", 1968, 1970),
+    ("fantastic four omnibus vol. 5", 1970, 1972),
+    ("avengers omnibus vol. 3", 1968, 1972),
+    ("amazing spider-man omnibus vol. 3", 1969, 1973),
+    ("mighty thor omnibus vol. 3", 1968, 1970),
+    ("mighty thor omnibus vol. 4", 1970, 1974),
+    ("silver surfer omnibus vol. 1", 1968, 1970),
+    ("sub-mariner", 1966, 1970),
+    ("namor, the sub-mariner epic collection: enter", 1966, 1968),
+    ("captain america epic collection: captain america lives again", 1964, 1966),
+    ("daredevil epic collection: the man without fear", 1964, 1966),
+    ("daredevil epic collection: mike murdock", 1966, 1968),
+
+    # Bronze Age (1970-1980)
+    ("fantastic four omnibus vol. 6", 1972, 1975),
+    ("avengers omnibus vol. 4 (englehart)", 1972, 1976),
+    ("avengers omnibus vol. 5 (shooter", 1977, 1979),
+    ("avengers omnibus vol. 6 (michelinie", 1979, 1981),
+    ("amazing spider-man omnibus vol. 4", 1973, 1976),
+    ("amazing spider-man omnibus vol. 5", 1976, 1979),
+    ("mighty thor omnibus vol. 5", 1974, 1977),
+    ("incredible hulk omnibus vol. 3", 1970, 1974),
+    ("incredible hulk omnibus vol. 4", 1974, 1977),
+    ("incredible hulk omnibus vol. 5", 1977, 1980),
+    ("warlock by jim starlin", 1975, 1977),
+    ("tomb of dracula", 1972, 1979),
+    ("luke cage", 1972, 1978),
+    ("iron fist", 1974, 1977),
+    ("master of kung fu", 1973, 1979),
+    ("howard the duck", 1976, 1979),
+    ("defenders omnibus vol. 1", 1971, 1975),
+    ("defenders omnibus vol. 2", 1975, 1978),
+    ("defenders omnibus vol. 3", 1978, 1981),
+    ("conan the barbarian", 1970, 1978),
+    ("man-thing", 1972, 1975),
+    ("ghost rider epic collection: hell on wheels", 1972, 1976),
+    ("captain marvel by jim starlin", 1973, 1974),
+    ("eternals by jack kirby", 1976, 1978),
+    ("captain america by jack kirby omnibus", 1976, 1977),
+    ("captain america by steve englehart", 1972, 1975),
+    ("shang-chi, master of kung fu omnibus", 1973, 1979),
+    ("spider-woman omnibus", 1978, 1983),
+    ("power man and iron fist omnibus", 1978, 1982),
+    ("iron man omnibus vol. 2", 1968, 1972),
+    ("iron man: demon in a bottle", 1978, 1979),
+    ("doctor strange omnibus vol. 2", 1972, 1976),
+    ("daredevil omnibus vol. 2", 1970, 1975),
+    ("marvel two-in-one omnibus vol. 1", 1974, 1978),
+    ("marvel team-up omnibus", 1972, 1976),
+    ("invaders omnibus", 1975, 1979),
+    ("nova classic", 1976, 1979),
+    ("werewolf by night", 1972, 1977),
+    ("morbius", 1971, 1975),
+    ("ms. marvel: the original years", 1977, 1979),
+    ("deathlok", 1974, 1977),
+    ("killraven", 1973, 1976),
+    ("red sonja", 1975, 1979),
+    ("machine man by jack kirby", 1977, 1978),
+    ("marvel spotlight omnibus", 1971, 1977),
+    ("giant-size marvel omnibus", 1974, 1975),
+    ("marvel horror", 1970, 1975),
+    ("what if? classic", 1977, 1984),
+    ("omega the unknown", 1976, 1977),
+    ("marvel two-in-one omnibus vol. 2", 1978, 1983),
+    ("shogun warriors", 1979, 1980),
+
+    # Rise of X-Men (1975-1985) — X-Men specific titles
+    ("uncanny x-men omnibus vol. 1 (claremont)", 1975, 1978),
+    ("uncanny x-men omnibus vol. 2 (claremont)", 1978, 1981),
+    ("uncanny x-men omnibus vol. 3 (claremont)", 1981, 1984),
+    ("uncanny x-men omnibus vol. 4 (claremont)", 1984, 1986),
+    ("uncanny x-men omnibus vol. 5 (claremont)", 1986, 1988),
+    ("new mutants omnibus vol. 1", 1982, 1985),
+    ("new mutants omnibus vol. 2", 1985, 1987),
+    ("daredevil by frank miller", 1979, 1983),
+    ("fantastic four by john byrne omnibus vol. 1", 1981, 1984),
+    ("fantastic four by john byrne omnibus vol. 2", 1984, 1986),
+    ("thor by walt simonson", 1983, 1987),
+    ("secret wars (1984)", 1984, 1985),
+    ("alpha flight by john byrne", 1983, 1985),
+    ("daredevil: born again", 1986, 1986),
+    ("x-men: dark phoenix", 1980, 1980),
+    ("x-men: god loves", 1982, 1982),
+    ("wolverine by claremont & miller", 1982, 1982),
+    ("spectacular spider-man omnibus vol. 1", 1976, 1980),
+    ("spider-man by roger stern", 1981, 1984),
+    ("avengers by roger stern", 1983, 1988),
+    ("mighty thor omnibus vol. 6", 1977, 1980),
+    ("captain america by mark gruenwald omnibus vol. 1", 1985, 1989),
+    ("iron man by michelinie", 1978, 1982),
+    ("power pack classic", 1984, 1986),
+    ("rom: spaceknight", 1979, 1986),
+    ("micronauts", 1979, 1984),
+    ("cloak and dagger", 1982, 1987),
+    ("captain britain omnibus", 1981, 1985),
+    ("moon knight epic collection: bad moon rising", 1980, 1982),
+    ("moon knight epic collection: final rest", 1982, 1984),
+    ("moon knight epic collection: shadows of the moon", 1984, 1985),
+    ("dazzler omnibus", 1981, 1986),
+    ("vision and the scarlet witch", 1982, 1986),
+    ("west coast avengers omnibus vol. 1", 1984, 1987),
+    ("west coast avengers omnibus vol. 2", 1987, 1989),
+    ("hawkeye by mark gruenwald", 1983, 1983),
+    ("x-factor omnibus vol. 1 (original)", 1986, 1989),
+    ("death of captain marvel", 1982, 1982),
+    ("heroes for hire omnibus (power man and iron fist)", 1978, 1986),
+    ("ka-zar the savage", 1981, 1984),
+    ("punisher omnibus vol. 1", 1986, 1988),
+    ("captain marvel: monica rambeau", 1982, 1989),
+    ("silver surfer omnibus vol. 3", 1987, 1989),
+    ("doctor strange omnibus vol. 3", 1980, 1987),
+    ("new warriors classic omnibus", 1989, 1993),
+    ("marvel super hero contest of champions", 1982, 1982),
+    ("daredevil by ann nocenti", 1986, 1991),
+    ("moon knight compendium", 1980, 1994),
+
+    # Event Age (1985-1992)
+    ("infinity gauntlet omnibus", 1990, 1991),
+    ("infinity war omnibus", 1992, 1992),
+    ("infinity crusade", 1993, 1993),
+    ("x-men: inferno", 1988, 1989),
+    ("x-men: mutant massacre", 1986, 1987),
+    ("x-men: x-tinction agenda", 1990, 1991),
+    ("x-men: x-cutioner's song", 1992, 1993),
+    ("spider-man by michelinie & mcfarlane", 1987, 1990),
+    ("spider-man by todd mcfarlane", 1988, 1991),
+    ("spider-man: kraven's last hunt", 1987, 1987),
+    ("acts of vengeance", 1989, 1990),
+    ("avengers: under siege", 1986, 1987),
+    ("avengers: galactic storm", 1992, 1992),
+    ("excalibur by claremont", 1987, 1991),
+    ("incredible hulk by peter david omnibus", 1987, 1998),
+    ("iron man: armor wars", 1987, 1988),
+    ("wolverine epic collection: madripoor", 1988, 1989),
+    ("punisher war journal", 1988, 1992),
+    ("secret wars ii", 1985, 1986),
+    ("midnight sons", 1992, 1994),
+    ("elektra by frank miller", 1981, 1986),
+    ("elektra: assassin", 1986, 1987),
+    ("squadron supreme", 1985, 1986),
+    ("spider-man 2099 omnibus", 1992, 1996),
+    ("new warriors classic vol. 2", 1991, 1993),
+    ("sensational she-hulk by john byrne", 1989, 1993),
+    ("quasar classic", 1989, 1994),
+    ("darkhawk", 1991, 1995),
+    ("sleepwalker", 1991, 1994),
+    ("ghost rider: danny ketch", 1990, 1994),
+    ("marc spector: moon knight", 1989, 1994),
+    ("wolverine compendium", 1988, 1997),
+    ("daredevil: the man without fear", 1993, 1994),
+    ("silver surfer epic collection: return of thanos", 1988, 1989),
+    ("silver surfer epic collection: thanos quest", 1990, 1990),
+    ("silver surfer: parable", 1988, 1989),
+    ("silver surfer: rebirth of thanos", 1990, 1990),
+    ("namor the sub-mariner by john byrne", 1990, 1993),
+    ("deadpool beginnings", 1991, 1993),
+    ("miracleman omnibus", 1985, 1993),
+    ("damage control", 1989, 1991),
+    ("hulk: future imperfect", 1992, 1993),
+    ("web of spider-man omnibus", 1985, 1991),
+    ("wolverine: weapon x", 1991, 1991),
+    ("x-factor by peter david omnibus vol. 1", 1991, 1993),
+    ("x-factor by peter david omnibus vol. 2", 1993, 1995),
+    ("x-force omnibus vol. 1", 1991, 1993),
+    ("silver sable", 1992, 1995),
+    ("speedball", 1988, 1989),
+    ("wonder man classic", 1986, 1992),
+    ("knights of pendragon", 1990, 1993),
+    ("doctor strange epic collection: triumph and torment", 1988, 1989),
+
+    # Speculation Crash (1992-1996)
+    ("age of apocalypse", 1995, 1996),
+    ("clone saga", 1994, 1996),
+    ("onslaught", 1996, 1996),
+    ("x-men epic collection: fatal attractions", 1993, 1994),
+    ("x-men epic collection: phalanx covenant", 1994, 1995),
+    ("x-men epic collection: legion quest", 1994, 1995),
+    ("generation x", 1994, 1996),
+    ("cable (1993)", 1993, 1996),
+    ("force works", 1994, 1996),
+    ("war machine (1994)", 1994, 1996),
+    ("thunderstrike", 1993, 1995),
+    ("marvel 2099", 1992, 1996),
+    ("venom: lethal protector", 1993, 1994),
+    ("maximum carnage", 1993, 1993),
+    ("marvels", 1994, 1994),
+    ("x-force by nicieza", 1993, 1996),
+
+    # Heroes Reborn (1996-1998)
+    ("heroes reborn", 1996, 1997),
+    ("heroes return", 1997, 1998),
+    ("thunderbolts by busiek", 1997, 2000),
+    ("avengers by busiek", 1998, 2002),
+    ("deadpool by joe kelly", 1997, 1999),
+    ("peter parker: spider-man by mackie", 1997, 1999),
+    ("ka-zar by mark waid", 1997, 1998),
+    ("captain america by waid", 1998, 1999),
+    ("thor by dan jurgens", 1998, 2004),
+    ("iron man by busiek", 1998, 2000),
+
+    # Marvel Knights (1998-2004)
+    ("new x-men by morrison", 1998, 2004),
+    ("daredevil by bendis", 2001, 2006),
+    ("alias", 2001, 2004),
+    ("avengers by busiek & pérez", 1998, 2002),
+    ("punisher max by ennis", 2000, 2008),
+    ("marvel knights", 1998, 2001),
+    ("ultimate spider-man", 2000, 2009),
+    ("ultimates by millar", 2002, 2007),
+    ("runaways", 2003, 2007),
+    ("black panther by christopher priest", 1998, 2003),
+    ("inhumans by paul jenkins", 1998, 1999),
+    ("fantastic four by waid", 2002, 2005),
+    ("captain america by john ney rieber", 2002, 2003),
+    ("exiles by judd winick", 2001, 2006),
+    ("truth: red, white & black", 2003, 2003),
+    ("the sentry", 2000, 2001),
+    ("supreme power", 2003, 2005),
+    ("x-statix", 2001, 2004),
+    ("wolverine by rucka", 2003, 2004),
+    ("wolverine by millar", 2004, 2005),
+    ("wolverine epic collection: enemy of the state", 2004, 2005),
+    ("hulk: the end", 2002, 2002),
+    ("spider-man's tangled web", 2001, 2003),
+    ("1602", 2003, 2004),
+    ("jms", 2001, 2007),  # J. Michael Straczynski ASM run
+    ("marvel premier collection: marvels", 1994, 1994),
+
+    # Bendis Avengers (2004-2012)
+    ("new avengers", 2004, 2010),
+    ("civil war", 2006, 2007),
+    ("secret invasion", 2008, 2009),
+    ("dark avengers", 2009, 2010),
+    ("siege", 2010, 2010),
+    ("house of m", 2005, 2005),
+    ("captain america by ed brubaker", 2005, 2012),
+    ("annihilation", 2006, 2007),
+    ("annihilation: conquest", 2007, 2008),
+    ("guardians of the galaxy by dna", 2008, 2010),
+    ("nova by abnett", 2007, 2010),
+    ("planet hulk", 2006, 2007),
+    ("world war hulk", 2007, 2008),
+    ("invincible iron man by fraction", 2008, 2012),
+    ("immortal iron fist", 2006, 2009),
+    ("uncanny x-force by remender", 2010, 2012),
+    ("astonishing x-men by whedon", 2004, 2008),
+    ("x-men: messiah complex", 2007, 2008),
+    ("x-men: messiah war", 2009, 2009),
+    ("x-men: second coming", 2010, 2010),
+    ("war of kings", 2009, 2009),
+    ("realm of kings", 2010, 2010),
+    ("the thanos imperative", 2010, 2010),
+    ("thunderbolts by warren ellis", 2006, 2008),
+    ("secret warriors omnibus", 2009, 2011),
+    ("spider-man: one more day", 2007, 2008),
+    ("spider-man: brand new day", 2008, 2010),
+    ("fear itself", 2011, 2011),
+    ("miles morales: spider-man omnibus vol. 1", 2011, 2013),
+    ("ultimate comics", 2009, 2013),
+    ("ultimatum", 2008, 2009),
+    ("iron man: extremis", 2005, 2006),
+    ("avengers vs. x-men", 2012, 2012),
+    ("secret war", 2004, 2005),
+    ("avengers disassembled", 2004, 2004),
+    ("doctor strange: the oath", 2006, 2007),
+    ("she-hulk by dan slott", 2004, 2009),
+    ("young avengers by allan heinberg", 2005, 2006),
+    ("nextwave", 2006, 2007),
+    ("moon knight by charlie huston", 2006, 2009),
+    ("ghost rider by jason aaron", 2006, 2009),
+    ("captain britain and mi:13", 2008, 2009),
+    ("incredible hercules", 2008, 2010),
+    ("black panther by reginald hudlin", 2005, 2010),
+    ("marvel zombies", 2005, 2009),
+    ("chaos war", 2010, 2011),
+    ("heroic age", 2010, 2011),
+    ("kang: the saga", 2010, 2011),
+    ("agents of atlas", 2006, 2009),
+    ("punisher max by ennis omnibus vol. 2", 2004, 2008),
+
+    # Hickman Saga (2009-2016) — overlaps with Bendis
+    ("fantastic four by jonathan hickman", 2009, 2012),
+    ("avengers by jonathan hickman", 2012, 2015),
+    ("secret wars (2015)", 2015, 2016),
+    ("s.h.i.e.l.d. by hickman", 2010, 2011),
+    ("daredevil by mark waid", 2011, 2015),
+    ("hawkeye by matt fraction", 2012, 2015),
+    ("superior spider-man", 2013, 2014),
+    ("all-new x-men by bendis", 2012, 2015),
+    ("thor by jason aaron omnibus vol. 1", 2012, 2014),
+    ("thor: god of thunder", 2012, 2014),
+    ("infinity", 2013, 2013),
+    ("original sin", 2014, 2014),
+    ("age of ultron", 2013, 2013),
+    ("avengers & x-men: axis", 2014, 2015),
+    ("deadpool by posehn & duggan", 2012, 2015),
+    ("moon knight by warren ellis", 2014, 2014),
+    ("ms. marvel by g. willow wilson", 2014, 2019),
+    ("guardians of the galaxy by bendis", 2013, 2015),
+    ("spider-island", 2011, 2011),
+    ("avengers: the children's crusade", 2010, 2012),
+    ("fear itself", 2011, 2011),
+    ("uncanny x-men by kieron gillen", 2011, 2012),
+    ("avengers academy", 2010, 2013),
+    ("avengers arena", 2012, 2014),
+    ("loki: agent of asgard", 2014, 2015),
+    ("she-hulk by charles soule", 2014, 2015),
+    ("secret avengers", 2010, 2014),
+    ("captain america: white", 2015, 2015),
+    ("spider-verse", 2014, 2015),
+    ("superior foes of spider-man", 2013, 2014),
+    ("spider-man: family business", 2014, 2014),
+    ("mighty avengers by al ewing", 2013, 2014),
+    ("nova by loeb", 2013, 2015),
+    ("daredevil: shadowland", 2010, 2011),
+
+    # All-New All-Different (2015-2018)
+    ("vision by tom king", 2015, 2016),
+    ("civil war ii", 2016, 2017),
+    ("secret empire", 2017, 2017),
+    ("immortal hulk", 2018, 2021),
+    ("venom by donny cates", 2018, 2021),
+    ("ms. marvel omnibus vol. 1 (kamala khan)", 2014, 2019),
+    ("infamous iron man", 2016, 2018),
+    ("mighty thor by jason aaron", 2015, 2018),
+    ("thor by jason aaron omnibus vol. 2", 2014, 2018),
+    ("doctor strange by jason aaron", 2015, 2017),
+    ("black panther by ta-nehisi coates", 2016, 2021),
+    ("all-new wolverine", 2015, 2018),
+    ("gwenpool", 2016, 2018),
+    ("unbeatable squirrel girl", 2015, 2019),
+    ("old man logan by jeff lemire", 2016, 2018),
+    ("uncanny avengers by gerry duggan", 2015, 2017),
+    ("power man and iron fist by david walker", 2016, 2017),
+    ("silver surfer by dan slott", 2014, 2017),
+    ("death of wolverine", 2014, 2014),
+    ("spider-gwen", 2015, 2018),
+    ("ultimates by al ewing", 2015, 2017),
+    ("runaways by rainbow rowell", 2017, 2020),
+    ("daredevil by charles soule", 2015, 2018),
+    ("fantastic four by dan slott omnibus vol. 1", 2018, 2020),
+    ("spider-man/deadpool", 2016, 2019),
+    ("scarlet witch by james robinson", 2016, 2017),
+    ("jessica jones by bendis", 2016, 2018),
+    ("champions by mark waid", 2016, 2018),
+    ("america by gabby rivera", 2017, 2018),
+    ("moon knight by jeff lemire", 2016, 2017),
+    ("black widow by waid & samnee", 2016, 2017),
+    ("thanos wins by donny cates", 2017, 2018),
+    ("avengers: no surrender", 2018, 2018),
+    ("avengers by jason aaron omnibus vol. 1", 2018, 2020),
+    ("inhumans vs. x-men", 2017, 2017),
+    ("cosmic ghost rider", 2018, 2019),
+    ("spider-verse/spider-geddon", 2018, 2019),
+    ("west coast avengers by kelly thompson", 2018, 2019),
+    ("a-force", 2015, 2016),
+    ("captain america by mark waid (2017)", 2017, 2018),
+    ("she-hulk by mariko tamaki", 2017, 2018),
+    ("silk by robbie thompson", 2015, 2017),
+    ("star-lord by chip zdarsky", 2016, 2017),
+    ("ant-man by nick spencer", 2015, 2016),
+    ("mockingbird by chelsea cain", 2016, 2016),
+    ("new avengers by al ewing", 2015, 2016),
+    ("all-new all-different avengers by mark waid", 2015, 2016),
+    ("bucky barnes: the winter soldier", 2014, 2015),
+    ("venom modern era compendium", 2018, 2021),
+    ("nick spencer", 2018, 2021),  # ASM by Nick Spencer
+    ("iron man by christopher cantwell", 2020, 2022),
+    ("shang-chi by gene luen yang (2021)", 2021, 2022),
+    ("strange by jed mackay (2022)", 2022, 2023),
+    ("darkhold: pages from the book of sins (2021)", 2021, 2022),
+    ("death of doctor strange", 2021, 2022),
+    ("alien by phillip kennedy johnson", 2021, 2023),
+
+    # Dawn of Krakoa (2019-2024)
+    ("house of x / powers of x", 2019, 2019),
+    ("dawn of x", 2019, 2020),
+    ("x of swords", 2020, 2020),
+    ("inferno by jonathan hickman", 2021, 2021),
+    ("a.x.e.: judgment day", 2022, 2022),
+    ("sins of sinister", 2023, 2023),
+    ("fall of the house of x", 2024, 2024),
+    ("rise of the powers of x", 2024, 2024),
+    ("daredevil by chip zdarsky", 2019, 2024),
+    ("venom by al ewing", 2021, 2023),
+    ("thor by donny cates", 2020, 2022),
+    ("moon knight by jed mackay", 2021, 2023),
+    ("immortal x-men by kieron gillen", 2022, 2023),
+    ("wolverine by benjamin percy", 2020, 2024),
+    ("x-force by benjamin percy", 2019, 2024),
+    ("marauders by gerry duggan", 2019, 2022),
+    ("x-men by gerry duggan", 2021, 2023),
+    ("x-men red by al ewing", 2022, 2023),
+    ("king in black", 2020, 2021),
+    ("war of the realms", 2019, 2019),
+    ("empyre", 2020, 2020),
+    ("absolute carnage", 2019, 2019),
+    ("devil's reign", 2022, 2022),
+    ("eternals by kieron gillen", 2021, 2022),
+    ("captain america by ta-nehisi coates", 2018, 2021),
+    ("captain america: sentinel of liberty", 2022, 2023),
+    ("black widow by kelly thompson", 2020, 2022),
+    ("captain marvel by kelly thompson", 2019, 2022),
+    ("she-hulk by rainbow rowell", 2022, 2023),
+    ("scarlet witch by steve orlando", 2023, 2024),
+    ("amazing spider-man by zeb wells", 2022, 2024),
+    ("spider-man: life story", 2019, 2019),
+    ("history of the marvel universe", 2019, 2019),
+    ("silver surfer: black", 2019, 2019),
+    ("guardians of the galaxy by al ewing", 2020, 2021),
+    ("guardians of the galaxy by donny cates", 2019, 2020),
+    ("avengers by jed mackay", 2023, 2024),
+    ("fantastic four by ryan north", 2022, 2024),
+    ("fantastic four by dan slott omnibus vol. 2", 2020, 2022),
+
+    # Blood Hunt & Doom (2024-2025) — very specific
+    ("blood hunt", 2024, 2024),
+    ("one world under doom", 2025, 2025),
+    ("doctor doom (2024)", 2024, 2024),
+    ("venom war", 2024, 2024),
+    ("x-men: from the ashes", 2024, 2025),
+    ("ultimate black panther", 2024, 2024),
+    ("ultimate spider-man vol. 3", 2024, 2024),
+    ("ultimate x-men vol. 1", 2024, 2024),
+    ("exceptional x-men", 2024, 2025),
+    ("uncanny x-men by gerry duggan vol. 1", 2024, 2024),
+    ("immortal thor by al ewing", 2023, 2024),
+    ("avengers by jed mackay vol. 2", 2024, 2025),
+    ("daredevil by saladin ahmed", 2024, 2025),
+    ("phoenix by stephanie phillips", 2024, 2025),
+    ("forge (2024)", 2024, 2025),
+    ("nyx", 2024, 2025),
+    ("spider-boy by dan slott", 2023, 2024),
+    ("wolverine: revenge", 2024, 2024),
+    ("predator vs. wolverine", 2023, 2024),
+    ("miles morales: spider-man by cody ziglar", 2022, 2024),
+    ("deadpool by cody ziglar", 2024, 2024),
+    ("nova by loveness", 2024, 2025),
+    ("timeless by jed mackay", 2021, 2024),
+
+    # Current Ongoings (2025-2026)
+    ("armageddon", 2026, 2026),
+    ("ultimate invasion", 2023, 2023),
+    ("ultimate universe by hickman", 2023, 2025),
+    ("ultimate spider-man by jonathan hickman", 2024, 2025),
+    ("ultimates by deniz camp", 2024, 2025),
+    ("storm by murewa ayodele", 2024, 2025),
+    ("wolverine by saladin ahmed vol. 2", 2025, 2025),
+    ("phases of the moon knight", 2025, 2025),
+    ("sentinels by alex paknadel", 2025, 2025),
+    ("x-men by jed mackay (2024)", 2024, 2025),
+    ("uncanny x-men by gail simone", 2024, 2025),
+    ("spectacular spider-man (2024)", 2024, 2025),
+    ("fantastic four (2025)", 2025, 2025),
+    ("captain america (2025)", 2025, 2025),
+    ("iron man (2025)", 2025, 2025),
+    ("thor (2025)", 2025, 2025),
+    ("hulk (2025)", 2025, 2025),
+]
+
+YEAR_PATTERNS = [
+    re.compile(r"\((\d{4})\)"),
+    re.compile(r"\((\d{4})\s*[-–]"),
+    re.compile(r"[-–]\s*(\d{4})\)"),
+]
+
+
+# ============================================================
+# SERIES ERA DATABASE: Map series name + issue ranges to eras
+# This handles Epic Collections, Masterworks, Compendiums
+# ============================================================
+
+# Series publication year ranges (approximate)
+SERIES_YEARS = {
+    "fantastic four": [
+        (1, 30, 1961, 1964, "birth-of-marvel"),
+        (31, 60, 1964, 1966, "birth-of-marvel"),
+        (61, 102, 1967, 1970, "the-expansion"),
+        (103, 150, 1970, 1974, "bronze-age"),
+        (151, 200, 1974, 1978, "bronze-age"),
+        (201, 250, 1979, 1982, "rise-of-x-men"),
+        (232, 293, 1981, 1986, "rise-of-x-men"),  # Byrne
+        (294, 350, 1986, 1990, "event-age"),
+        (351, 416, 1990, 1996, "event-age"),
+    ],
+    "amazing spider-man": [
+        (1, 38, 1963, 1966, "birth-of-marvel"),
+        (39, 67, 1966, 1968, "the-expansion"),
+        (68, 100, 1969, 1971, "bronze-age"),
+        (101, 150, 1971, 1975, "bronze-age"),
+        (151, 200, 1976, 1980, "bronze-age"),
+        (201, 252, 1980, 1984, "rise-of-x-men"),
+        (253, 300, 1984, 1988, "event-age"),
+        (301, 350, 1988, 1991, "event-age"),
+        (351, 406, 1991, 1996, "speculation-crash"),
+        (407, 441, 1996, 1998, "heroes-reborn-return"),
+    ],
+    "uncanny x-men": [
+        (1, 66, 1963, 1970, "birth-of-marvel"),
+        (94, 131, 1975, 1980, "rise-of-x-men"),
+        (132, 175, 1980, 1983, "rise-of-x-men"),
+        (176, 224, 1983, 1987, "rise-of-x-men"),
+        (225, 280, 1987, 1991, "event-age"),
+        (281, 330, 1991, 1996, "speculation-crash"),
+    ],
+    "avengers": [
+        (1, 30, 1963, 1966, "birth-of-marvel"),
+        (31, 62, 1966, 1969, "the-expansion"),
+        (63, 100, 1969, 1972, "bronze-age"),
+        (101, 150, 1972, 1976, "bronze-age"),
+        (151, 200, 1977, 1980, "bronze-age"),
+        (201, 250, 1980, 1984, "rise-of-x-men"),
+        (251, 300, 1985, 1989, "event-age"),
+        (301, 350, 1989, 1992, "event-age"),
+        (351, 402, 1992, 1996, "speculation-crash"),
+    ],
+    "thor": [
+        (126, 179, 1966, 1970, "the-expansion"),
+        (180, 250, 1970, 1976, "bronze-age"),
+        (251, 300, 1976, 1980, "bronze-age"),
+        (301, 350, 1980, 1984, "rise-of-x-men"),
+        (337, 382, 1983, 1987, "rise-of-x-men"),  # Simonson
+        (383, 432, 1987, 1991, "event-age"),
+        (433, 502, 1991, 1996, "speculation-crash"),
+    ],
+    "captain america": [
+        (100, 150, 1968, 1972, "bronze-age"),
+        (151, 200, 1972, 1976, "bronze-age"),
+        (201, 250, 1976, 1980, "bronze-age"),
+        (251, 300, 1980, 1984, "rise-of-x-men"),
+        (301, 350, 1985, 1989, "event-age"),
+        (351, 410, 1989, 1993, "event-age"),
+        (411, 454, 1993, 1996, "speculation-crash"),
+    ],
+    "iron man": [
+        (1, 30, 1968, 1970, "the-expansion"),
+        (31, 80, 1970, 1975, "bronze-age"),
+        (81, 150, 1976, 1981, "bronze-age"),
+        (151, 200, 1981, 1985, "rise-of-x-men"),
+        (201, 250, 1986, 1989, "event-age"),
+        (251, 300, 1990, 1994, "event-age"),
+        (301, 332, 1994, 1996, "speculation-crash"),
+    ],
+    "incredible hulk": [
+        (1, 6, 1962, 1963, "birth-of-marvel"),
+        (102, 150, 1968, 1972, "bronze-age"),
+        (151, 200, 1972, 1976, "bronze-age"),
+        (201, 250, 1976, 1980, "bronze-age"),
+        (251, 300, 1981, 1984, "rise-of-x-men"),
+        (301, 350, 1985, 1988, "event-age"),
+        (351, 400, 1989, 1993, "event-age"),
+        (401, 450, 1993, 1997, "speculation-crash"),
+    ],
+    "daredevil": [
+        (1, 30, 1964, 1967, "birth-of-marvel"),
+        (31, 60, 1967, 1969, "the-expansion"),
+        (61, 100, 1970, 1973, "bronze-age"),
+        (101, 150, 1973, 1978, "bronze-age"),
+        (158, 191, 1979, 1983, "rise-of-x-men"),  # Miller
+        (192, 233, 1983, 1986, "rise-of-x-men"),
+        (226, 282, 1986, 1990, "event-age"),  # Nocenti starts ~226
+        (283, 350, 1990, 1996, "event-age"),
+        (351, 380, 1996, 1998, "heroes-reborn-return"),
+    ],
+    "doctor strange": [
+        (110, 183, 1963, 1969, "birth-of-marvel"),
+        (1, 30, 1974, 1978, "bronze-age"),
+        (31, 81, 1978, 1987, "rise-of-x-men"),
+    ],
+    "silver surfer": [
+        (1, 18, 1968, 1970, "the-expansion"),
+        (1, 30, 1987, 1989, "event-age"),  # Vol 3
+        (31, 60, 1989, 1991, "event-age"),
+        (61, 100, 1991, 1995, "event-age"),
+    ],
+    "wolverine": [
+        (1, 30, 1988, 1990, "event-age"),
+        (31, 60, 1990, 1993, "event-age"),
+        (61, 100, 1993, 1996, "speculation-crash"),
+    ],
+    "punisher": [
+        (1, 30, 1987, 1989, "event-age"),
+        (31, 60, 1990, 1992, "event-age"),
+        (61, 104, 1992, 1995, "speculation-crash"),
+    ],
+    "moon knight": [
+        (1, 30, 1980, 1983, "rise-of-x-men"),
+        (31, 38, 1983, 1984, "rise-of-x-men"),
+    ],
+    "new mutants": [
+        (1, 30, 1983, 1985, "rise-of-x-men"),
+        (31, 60, 1985, 1988, "event-age"),
+        (61, 100, 1988, 1991, "event-age"),
+    ],
+    "x-factor": [
+        (1, 30, 1986, 1988, "event-age"),
+        (31, 60, 1988, 1991, "event-age"),
+        (61, 100, 1991, 1994, "event-age"),
+        (71, 149, 1991, 1998, "speculation-crash"),  # Peter David run
+    ],
+    "x-force": [
+        (1, 30, 1991, 1994, "event-age"),
+        (31, 60, 1994, 1996, "speculation-crash"),
+        (61, 100, 1996, 2000, "heroes-reborn-return"),
+    ],
+    "excalibur": [
+        (1, 30, 1988, 1990, "event-age"),
+        (31, 67, 1990, 1993, "event-age"),
+        (68, 125, 1993, 1998, "speculation-crash"),
+    ],
+    "ghost rider": [
+        (1, 20, 1973, 1976, "bronze-age"),
+        (1, 30, 1990, 1993, "event-age"),  # Danny Ketch
+    ],
+}
+
+# Shorthand and predecessor titles -> SERIES_YEARS key (first substring match wins)
+SERIES_ALIASES = [
+    ("ff", "fantastic four"),
+    ("asm", "amazing spider-man"),
+    ("uxm", "uncanny x-men"),
+    ("astonishing x-men", "uncanny x-men"),
+    ("cap", "captain america"),
+    ("im", "iron man"),
+    ("dd", "daredevil"),
+    ("hulk", "incredible hulk"),
+    ("thor", "thor"),
+    ("mighty thor", "thor"),
+    ("journey into mystery", "thor"),
+    ("tales of suspense", "iron man"),
+    ("tales to astonish", "incredible hulk"),
+    ("strange tales", "doctor strange"),
+]
+
+# "Series #N" / "Series #N-M" references in issues_collected
+ISSUE_REF_PATTERN = re.compile(r"(?:^|,\s*)([A-Za-z\s\-\.\']+?)\s*#(\d+)(?:\s*[-–]\s*(\d+))?")
+
+# Only match on explicit series references in issues_collected with year tags
+# Format: "Series Name (year)" in issues_collected -> correct era
+SERIES_YEAR_ERA = [
+    # Golden/Atlas Age -> birth-of-marvel
+    (r"sub-mariner comics", "birth-of-marvel"),
+    (r"captain america comics", "birth-of-marvel"),
+    (r"all.?winners|all select|young allies|marvel mystery", "birth-of-marvel"),
+    (r"namora \(194", "birth-of-marvel"),
+    (r"human torch \(194", "birth-of-marvel"),
+
+    # Silver Age (1961-1966) - only with explicit (1961)-(1966) year tags
+    (r"fantastic four \(1961\)", "birth-of-marvel"),
+    (r"amazing spider-man \(1963\)", "birth-of-marvel"),
+    (r"avengers \(1963\)", "birth-of-marvel"),
+    (r"x-men \(1963\)", "birth-of-marvel"),
+    (r"journey into mystery \(1952\)", "birth-of-marvel"),
+    (r"tales of suspense \(1959\)", "birth-of-marvel"),
+    (r"tales to astonish \(1959\)", "birth-of-marvel"),
+    (r"strange tales \(1951\)", "birth-of-marvel"),
+    (r"incredible hulk \(1962\)", "birth-of-marvel"),
+
+    # Late Silver Age (1966-1970)
+    (r"silver surfer \(1968\)", "the-expansion"),
+    (r"captain america \(1968\)", "the-expansion"),
+    (r"iron man \(1968\)", "the-expansion"),
+    (r"sub-mariner \(1968\)", "the-expansion"),
+    (r"doctor strange \(1968\)", "the-expansion"),
+    (r"nick fury.+agent.+shield \(196", "the-expansion"),
+    (r"marvel tales \(1964\)", "the-expansion"),
+
+    # Bronze Age (1970-1980)
+    (r"hero for hire", "bronze-age"),
+    (r"power man \(", "bronze-age"),
+    (r"power man #", "bronze-age"),
+    (r"iron fist \(1975\)", "bronze-age"),
+    (r"tomb of dracula \(197", "bronze-age"),
+    (r"werewolf by night \(197", "bronze-age"),
+    (r"ghost rider \(1973\)", "bronze-age"),
+    (r"man-thing \(197", "bronze-age"),
+    (r"jungle action", "bronze-age"),
+    (r"marvel premiere", "bronze-age"),
+    (r"marvel spotlight \(197", "bronze-age"),
+    (r"marvel team-up \(197", "bronze-age"),
+    (r"marvel two-in-one \(197", "bronze-age"),
+    (r"defenders \(1972\)", "bronze-age"),
+    (r"howard the duck \(1976\)", "bronze-age"),
+    (r"master of kung fu", "bronze-age"),
+    (r"omega the unknown \(197", "bronze-age"),
+    (r"warlock \(1972\)", "bronze-age"),
+    (r"captain marvel \(1968\)", "bronze-age"),
+    (r"daredevil \(1964\)", "bronze-age"),
+    (r"thor \(1966\)", "bronze-age"),
+    (r"spider-woman \(1978\)", "bronze-age"),
+    (r"ms\. marvel \(1977\)", "bronze-age"),
+    (r"black panther \(1977\)", "bronze-age"),
+    (r"nova \(1976\)", "bronze-age"),
+    (r"inhumans \(1975\)", "bronze-age"),
+    (r"amazing adventures \(197", "bronze-age"),
+
+    # Rise of X-Men (1975-1985) - only explicit old UXM references
+    (r"uncanny x-men \(1963\) #(9[4-9]|[1-2]\d\d)", "rise-of-x-men"),
+    (r"new mutants \(1983\)", "rise-of-x-men"),
+    (r"alpha flight \(1983\)", "rise-of-x-men"),
+    (r"dazzler \(1981\)", "rise-of-x-men"),
+    (r"micronauts \(197", "rise-of-x-men"),
+    (r"rom \(197|rom \(198", "rise-of-x-men"),
+    (r"marvel super heroes secret wars \(1984\)", "rise-of-x-men"),
+    (r"giant.size x-men \(1975\)", "rise-of-x-men"),
+
+    # Event Age (1985-1992)
+    (r"x-factor \(1986\)", "event-age"),
+    (r"new warriors \(1990\)", "event-age"),
+    (r"excalibur \(1988\)", "event-age"),
+    (r"wolverine \(1988\)", "event-age"),
+    (r"punisher \(1987\)", "event-age"),
+    (r"infinity gauntlet \(1991\)", "event-age"),
+
+    # Heroes Reborn (1996-1998)
+    (r"thunderbolts \(1997\)", "heroes-reborn-return"),
+
+    # Marvel Knights / Ultimate (1998-2004)
+    (r"daredevil \(1998\)", "marvel-knights-ultimate"),
+    (r"fantastic four \(1998\)", "marvel-knights-ultimate"),
+    (r"black panther \(1998\)", "marvel-knights-ultimate"),
+    (r"amazing spider-man \(1999\)", "marvel-knights-ultimate"),
+    (r"ultimate spider-man \(2000\)", "marvel-knights-ultimate"),
+    (r"ultimate x-men \(2001\)", "marvel-knights-ultimate"),
+    (r"ultimates \(2002\)", "marvel-knights-ultimate"),
+    (r"alias \(2001\)", "marvel-knights-ultimate"),
+    (r"new x-men \(2001\)", "marvel-knights-ultimate"),
+
+    # Bendis Avengers (2004-2012)
+    (r"new avengers \(2004\)", "bendis-avengers"),
+    (r"new avengers \(2005\)", "bendis-avengers"),
+    (r"mighty avengers \(2007\)", "bendis-avengers"),
+    (r"dark avengers \(2009\)", "bendis-avengers"),
+    (r"young avengers \(2005\)", "bendis-avengers"),
+    (r"astonishing x-men \(2004\)", "bendis-avengers"),
+
+    # Hickman Saga (2009-2015)
+    (r"fantastic four \(2009\)", "hickman-saga"),
+    (r"ff \(2011\)", "hickman-saga"),
+    (r"avengers \(2012\)", "hickman-saga"),
+    (r"new avengers \(2013\)", "hickman-saga"),
+    (r"secret wars \(2015\)", "hickman-saga"),
+]
+
+# ============================================================
+# YEAR -> ERA RESOLUTION
+# ============================================================
+
+# Keyword classes consulted where eras overlap (see keyword_classifier.py): an
+# entry is a substring, or a tuple of substrings that must all appear, in the
+# lowercased title, slug or synopsis.
+KEYWORD_CLASSES = {
+    "x-men": [
+        "x-men", "x-force", "new mutants", "wolverine", "claremont",
+        "magneto", "phoenix", "dark phoenix", "nightcrawler", "storm",
+        "cyclops", "colossus", "kitty", "shadowcat",
+    ],
+    "rise-of-x-men-runs": [
+        ("byrne", "fantastic four"), ("simonson", "thor"), ("secret wars", "1984"),
+    ],
+    "hickman": [
+        "hickman", "fantastic four by jonathan hickman", "ff by hickman",
+        "s.h.i.e.l.d. by hickman", "secret warriors",
+    ],
+    "hickman-adjacent": [
+        "daredevil by mark waid", "hawkeye by fraction", "hawkeye by matt fraction",
+        "superior spider-man", "all-new x-men", "thor by jason aaron",
+        "god of thunder", "deadpool by posehn", "moon knight by warren ellis",
+        "ms. marvel by g. willow wilson", "spider-island",
+        "avengers academy", "avengers arena", "age of ultron",
+        "fear itself", "schism", "children's crusade",
+    ],
+    "secret-wars-2015": [
+        "secret wars (2015)", "secret wars: battleworld", "battleworld", "hickman",
+    ],
+    "krakoa-launch": [
+        "house of x", "powers of x", "krakoa", "dawn of x",
+    ],
+    "current": [
+        "armageddon", "(2025)",
+    ],
+    "blood-hunt-doom": [
+        "blood hunt", "one world under doom", "doctor doom (2024)",
+        "venom war", "from the ashes", "exceptional x-men",
+        "ultimate black panther", "ultimate x-men", "deadpool by cody",
+    ],
+    "krakoa-late": [
+        "fall of the house of x", "rise of the powers of x",
+        "fall of x", "krakoa", "x-men: before the fall", "dead x-men",
+    ],
+}
+
+
+@dataclass(frozen=True)
+class OverlapWindow:
+    """Years where two eras overlap; the first matching keyword class decides.
+
+    spill is used instead of default when the edition's run ends after the
+    window (e.g. a 1978-1982 run belongs to rise-of-x-men, not bronze-age).
+    """
+    first_year: int
+    last_year: int
+    checks: tuple[tuple[str, str], ...]
+    default: str
+    spill: str | None = None
+
+
+OVERLAP_WINDOWS = [
+    # Bronze Age vs Rise of X-Men
+    OverlapWindow(1975, 1980, (("x-men", "rise-of-x-men"), ("rise-of-x-men-runs", "rise-of-x-men")),
+                  "bronze-age", spill="rise-of-x-men"),
+    # Bendis Avengers vs Hickman Saga
+    OverlapWindow(2009, 2011, (("hickman", "hickman-saga"), ("hickman-adjacent", "hickman-saga")),
+                  "bendis-avengers"),
+    # Hickman Saga vs All-New All-Different
+    OverlapWindow(2015, 2016, (("secret-wars-2015", "hickman-saga"),), "all-new-all-different"),
+    # All-New All-Different vs Dawn of Krakoa
+    OverlapWindow(2018, 2018, (("krakoa-launch", "dawn-of-krakoa"),), "all-new-all-different"),
+    # Dawn of Krakoa vs Blood Hunt (2024 titles that started in Krakoa stay there)
+    OverlapWindow(2024, 2024, (("current", "current-ongoings"), ("blood-hunt-doom", "blood-hunt-doom"),
+                               ("krakoa-late", "dawn-of-krakoa")), "blood-hunt-doom"),
+]
+
+# Outside the overlap windows: (last year, era_slug), ascending
+YEAR_ERAS = [
+    (1966, "birth-of-marvel"),
+    (1970, "the-expansion"),
+    (1974, "bronze-age"),
+    (1985, "rise-of-x-men"),
+    (1992, "event-age"),
+    (1996, "speculation-crash"),
+    (1998, "heroes-reborn-return"),
+    (2004, "marvel-knights-ultimate"),
+    (2008, "bendis-avengers"),
+    (2014, "hickman-saga"),
+    (2018, "all-new-all-different"),
+    (2023, "dawn-of-krakoa"),
+    (2024, "blood-hunt-doom"),
+    (9999, "current-ongoings"),
+]
+
+# Evaluation order (first pass that yields an era wins)
+PASSES = (
+    "explicit",         # EXPLICIT_ERA_MAP, exact slug
+    "explicit_partial", # EXPLICIT_ERA_MAP, slug substring either way
+    "title_pattern",    # TITLE_ERA_PATTERNS, highest priority
+    "title_series",     # TITLE_SERIES_ERAS, longest match
+    "reprint_title",    # REPRINT_TITLE_PATTERNS
+    "known_run",        # KNOWN_RUNS, longest match -> run years
+    "title_year",       # (YYYY) in the title
+    "issue_range",      # SERIES_YEARS by issue number
+    "issue_calendar",   # series calendar cover years of the collected issues
+    "series_year",      # SERIES_YEAR_ERA regexes over issues_collected
+    "issues_year",      # (YYYY) in issues_collected
+    "synopsis_year",    # year in the first 200 characters of the synopsis
+)
+
+# Exact slug entries: the only curated rule Phase 4b trusts over its estimated
+# publication year (the substring and title-regex passes misfire on
+# look-alike slugs such as avengers-omnibus-v2 / west-coast-avengers-omnibus-v2)
+EXACT_PASSES = ("explicit",)
+
+# cleanup_data_quality.py's conservative fix: explicit series references only
+CONSERVATIVE_PASSES = ("series_year", "reprint_title")
+
+MIN_YEAR, MAX_YEAR = 1939, 2026
+
+# Characters that end a literal run when extracting a regex's required literal
+_REGEX_META = set(".^$*+?{}[]()|\\")
+
+
+def required_literal(pattern: str) -> str | None:
+    """Longest literal substring every match of pattern must contain.
+
+    Conservative: patterns with top-level alternation return None (always
+    evaluated). Escaped punctuation counts as literal; a character followed by
+    ?, * or { is optional and a repeated one (+) ends the run.
+    """
+    depth = 0
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\":
+            i += 1
+        elif ch in "([":
+            depth += 1
+        elif ch in ")]":
+            depth -= 1
+        elif ch == "|" and depth == 0:
+            return None
+        i += 1
+
+    runs, run = [], ""
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\" and i + 1 < len(pattern):
+            nxt = pattern[i + 1]
+            literal = None if nxt.isalnum() else nxt
+            i += 2
+        elif ch in "([":
+            # Skip groups and classes entirely
+            close = ")" if ch == "(" else "]"
+            level = 0
+            while i < len(pattern):
+                if pattern[i] == "\\":
+                    i += 2
+                    continue
+                if pattern[i] == ch:
+                    level += 1
+                elif pattern[i] == close:
+                    level -= 1
+                    if level == 0:
+                        break
+                i += 1
+            i += 1
+            literal = None
+        elif ch in _REGEX_META:
+            literal = None
+            i += 1
+        else:
+            literal = ch
+            i += 1
+
+        quantifier = pattern[i] if i < len(pattern) else ""
+        if literal is not None and quantifier not in ("?", "*", "{"):
+            run += literal
+        if literal is None or quantifier in ("?", "*", "{", "+"):
+            runs.append(run)
+            run = ""
+    runs.append(run)
+    best = max(runs, key=len)
+    return best if len(best) >= 3 else None
+
+
+@dataclass
+class EraVerdict:
+    era: str | None
+    rule: str
+    detail: str = ""
+    year: float | None = None
+
+
+@dataclass
+class EditionText:
+    """Lowercased fields of an edition and the keywords found in each."""
+    title: str
+    slug: str
+    issues: str
+    synopsis: str
+    found: dict[str, set[str]] = field(default_factory=dict)
+    classes: frozenset[str] = frozenset()
+
+
+class EraRuleEngine:
+    """The rule table compiled into automata, lookup dicts and an interval index."""
+
+    def __init__(self):
+        self.explicit = EXPLICIT_ERA_MAP
+        self.partial_keys = [k for k in EXPLICIT_ERA_MAP if len(k) > EXPLICIT_PARTIAL_MIN_LEN]
+        self.partial_rank = {k: i for i, k in enumerate(self.partial_keys)}
+        self.partial_blob = "\n".join(self.partial_keys)
+        self.partial_offsets = []
+        offset = 0
+        for k in self.partial_keys:
+            self.partial_offsets.append(offset)
+            offset += len(k) + 1
+
+        self.title_patterns = [(re.compile(p), era, prio, required_literal(p))
+                               for p, era, prio in TITLE_ERA_PATTERNS]
+        self.reprint_patterns = [(re.compile(p, re.IGNORECASE), era, required_literal(p))
+                                 for p, era in REPRINT_TITLE_PATTERNS]
+        self.series_year_patterns = [(re.compile(p, re.IGNORECASE), era, required_literal(p))
+                                     for p, era in SERIES_YEAR_ERA]
+        self.title_series = dict(TITLE_SERIES_ERAS)
+        self.known_runs = {pattern.lower(): (start, end) for pattern, start, end in reversed(KNOWN_RUNS)}
+
+        # One automaton per field, holding every keyword any rule tests on it
+        self.automata = {
+            "title": KeywordAutomaton(
+                list(self.title_series) + list(self.known_runs)
+                + [lit for *_, lit in self.title_patterns if lit]
+                + [lit.lower() for *_, lit in self.reprint_patterns if lit]
+            ),
+            "slug": KeywordAutomaton(self.partial_keys + list(self.known_runs)),
+            "issues": KeywordAutomaton([lit.lower() for *_, lit in self.series_year_patterns if lit]),
+        }
+        self.classifier = KeywordClassifier(KEYWORD_CLASSES, fields=("title", "slug", "synopsis"))
+
+        intervals = []
+        first = 0
+        for last, era in YEAR_ERAS:
+            intervals.append((first, last, era))
+            first = last + 1
+        intervals.extend((w.first_year, w.last_year, w) for w in OVERLAP_WINDOWS)
+        self.year_index = IntervalTree(intervals)
+
+    # ---- scanning ------------------------------------------------------
+
+    def scan(self, edition: dict) -> EditionText:
+        """Lowercase an edition's fields and find every rule keyword in one pass each."""
+        text = EditionText(
+            title=(edition.get("title") or "").lower(),
+            slug=(edition.get("slug") or "").lower(),
+            issues=(edition.get("issues_collected") or "").lower(),
+            synopsis=(edition.get("synopsis") or "").lower(),
+        )
+        text.found = {
+            "title": self.automata["title"].find(text.title),
+            "slug": self.automata["slug"].find(text.slug),
+            "issues": self.automata["issues"].find(text.issues),
+        }
+        text.classes = self.classifier.tags(edition)
+        return text
+
+    def classes(self, edition: dict) -> frozenset[str]:
+        """KEYWORD_CLASSES tags for an edition (cached by the classifier)."""
+        return self.classifier.tags(edition)
+
+    # ---- year resolution -----------------------------------------------
+
+    def era_for_year(self, start_year: float, end_year: float | None = None,
+                     classes: set[str] = frozenset()) -> str:
+        """Era for a publication year range, resolving overlap windows by keyword class."""
+        year = int(start_year)
+        end = int(end_year) if end_year is not None else year
+        base = None
+        for _, _, hit in self.year_index.at(year):
+            if isinstance(hit, OverlapWindow):
+                for class_name, era in hit.checks:
+                    if class_name in classes:
+                        return era
+                return hit.spill if hit.spill and end > hit.last_year else hit.default
+            base = hit
+        return base or YEAR_ERAS[-1][1]
+
+    # ---- passes --------------------------------------------------------
+
+    def _explicit(self, text, edition):
+        era = self.explicit.get(text.slug)
+        return (era, text.slug) if era else None
+
+    def _explicit_partial(self, text, edition):
+        candidates = [k for k in text.found["slug"] if k in self.partial_rank]
+        # Reverse direction: the edition's slug inside a longer map key
+        pos = self.partial_blob.find(text.slug) if text.slug else -1
+        while pos != -1:
+            idx = _bisect_right(self.partial_offsets, pos) - 1
+            key = self.partial_keys[idx]
+            if pos + len(text.slug) <= self.partial_offsets[idx] + len(key):
+                candidates.append(key)
+            pos = self.partial_blob.find(text.slug, pos + 1)
+        if not candidates:
+            return None
+        key = min(candidates, key=self.partial_rank.__getitem__)
+        return self.explicit[key], key
+
+    def _title_pattern(self, text, edition):
+        best = None
+        for regex, era, prio, lit in self.title_patterns:
+            if lit and lit not in text.found["title"]:
+                continue
+            if (best is None or prio > best[2]) and regex.search(text.title):
+                best = (era, regex.pattern, prio)
+        return best[:2] if best else None
+
+    def _title_series(self, text, edition):
+        hits = [k for k in text.found["title"] if k in self.title_series]
+        if not hits:
+            return None
+        key = max(hits, key=len)
+        return self.title_series[key], key
+
+    def _reprint_title(self, text, edition):
+        for regex, era, lit in self.reprint_patterns:
+            if lit and lit.lower() not in text.found["title"]:
+                continue
+            if regex.search(text.title):
+                return era, regex.pattern
+        return None
+
+    def _known_run(self, text, edition):
+        hits = [k for k in text.found["title"] | text.found["slug"] if k in self.known_runs]
+        if not hits:
+            return None
+        key = max(hits, key=len)
+        start, end = self.known_runs[key]
+        return self.era_for_year(start, end, text.classes), key, start
+
+    def _title_year(self, text, edition):
+        year = extract_year(edition.get("title") or "")
+        if year:
+            return self.era_for_year(year, classes=text.classes), str(year), year
+        return None
+
+    def _issue_range(self, text, edition):
+        for match in ISSUE_REF_PATTERN.finditer(text.issues):
+            series = series_years_key(match.group(1))
+            if series is None:
+                continue
+            start = int(match.group(2))
+            end = int(match.group(3)) if match.group(3) else start
+            mid_issue = (start + end) // 2
+            for iss_start, iss_end, _, _, era in SERIES_YEARS[series]:
+                if iss_start <= mid_issue <= iss_end:
+                    return era, f"{series} #{mid_issue}"
+        return None
+
+    def _series_year(self, text, edition):
+        for regex, era, lit in self.series_year_patterns:
+            if lit and lit.lower() not in text.found["issues"]:
+                continue
+            if regex.search(text.issues):
+                return era, regex.pattern
+        return None
+
+    def _issue_calendar(self, text, edition):
+        years = collects_years(edition.get("issues_collected") or "")
+        if not years:
+            # Bare "Series #N" references without a launch year
+            for match in ISSUE_REF_PATTERN.finditer(text.issues):
+                start = int(match.group(2))
+                end = int(match.group(3)) if match.group(3) else start
+                year = series_calendar().year(match.group(1).strip(), (start + end) // 2)
+                if year is not None:
+                    years.append((year, year))
+                    break
+        if not years:
+            return None
+        start = min(s for s, _ in years)
+        end = max(e for _, e in years)
+        return self.era_for_year(start, end, text.classes), f"{int(start)}-{int(end)}", start
+
+    def _issues_year(self, text, edition):
+        year = extract_year(edition.get("issues_collected") or "")
+        if year:
+            return self.era_for_year(year, classes=text.classes), str(year), year
+        return None
+
+    def _synopsis_year(self, text, edition):
+        synopsis = edition.get("synopsis") or ""
+        year = extract_year(f"({synopsis[:200]})") if synopsis else None
+        if year:
+            return self.era_for_year(year, classes=text.classes), str(year), year
+        return None
+
+    # ---- evaluation ----------------------------------------------------
+
+    def evaluate(self, edition: dict, passes: tuple[str, ...] = PASSES) -> EraVerdict:
+        """Era for an edition and the rule that decided it ("no_signal" if none fired)."""
+        text = self.scan(edition)
+        for name in passes:
+            result = getattr(self, f"_{name}")(text, edition)
+            if result and result[0]:
+                era, detail, *year = result
+                return EraVerdict(era, name, detail, year[0] if year else None)
+        return EraVerdict(None, "no_signal")
+
+    def audit(self, editions: list[dict], passes: tuple[str, ...] = PASSES) -> list[tuple[dict, EraVerdict]]:
+        return [(ed, self.evaluate(ed, passes)) for ed in editions]
+
+
+def _bisect_right(values: list[int], x: int) -> int:
+    lo, hi = 0, len(values)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if x < values[mid]:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+def extract_year(text: str) -> int | None:
+    """First plausible publication year in "(YYYY)", "(YYYY -" or "- YYYY)" form."""
+    for pattern in YEAR_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            year = int(match.group(1))
+            if 1960 <= year <= MAX_YEAR:
+                return year
+    return None
+
+
+def series_years_key(series_name: str) -> str | None:
+    """SERIES_YEARS key for a series reference, via SERIES_ALIASES."""
+    sn = series_name.lower().strip()
+    for alias, key in SERIES_ALIASES:
+        if alias in sn:
+            sn = key
+            break
+    return sn if sn in SERIES_YEARS else None
+
+
+_engine: EraRuleEngine | None = None
+
+
+def era_rules() -> EraRuleEngine:
+    """Process-wide compiled engine."""
+    global _engine
+    if _engine is None:
+        _engine = EraRuleEngine()
+    return _engine
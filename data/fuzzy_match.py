@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Shared fuzzy string matching over an n-gram index.
+
+Used by import Phase 1 (title → ISBN backfill), Phase 10 (character name
+dedup) and scripts/sync_my_collection.py (keyword search over edition titles).
+
+FuzzyIndex keeps n-gram postings and length buckets for a fixed list of
+strings and answers:
+  - best(query, threshold)       first string with the highest SequenceMatcher ratio >= threshold
+  - top_k(query, k, threshold)   up to k strings with ratio >= threshold, best first
+  - matches(query, threshold)    every string with ratio >= threshold
+  - containing(substring)        every string containing substring
+
+Ratios are always SequenceMatcher(None, query, candidate).ratio(), exactly as
+the per-script loops computed them. The index only skips strings that
+provably cannot reach the threshold:
+  - length: ratio <= 2 * min(la, lb) / (la + lb)  (real_quick_ratio)
+  - n-grams: matching blocks form a common subsequence, so ratio >= t implies
+    an insert/delete distance D <= (la + lb) * (1 - t); each inserted or
+    deleted character destroys at most N shared n-grams, so the pair shares
+    at least max(la, lb) - N + 1 - N * D of them
+  - quick_ratio(): multiset character overlap, an upper bound on ratio()
+so results are identical to scoring every string.
+"""
+
+import math
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+
+NGRAM = 3
+
+
+def ngrams(text: str, n: int = NGRAM) -> Counter:
+    """Multiset of overlapping character n-grams."""
+    return Counter(text[i:i + n] for i in range(len(text) - n + 1))
+
+
+class FuzzyIndex:
+    """N-gram postings over a list of strings for exact thresholded fuzzy queries."""
+
+    def __init__(self, strings: list[str], n: int = NGRAM):
+        self.strings = list(strings)
+        self.n = n
+        self.by_length: dict[int, list[int]] = defaultdict(list)
+        self.postings: dict[str, list[tuple[int, int]]] = defaultdict(list)
+        for i, s in enumerate(self.strings):
+            self.by_length[len(s)].append(i)
+            for gram, count in ngrams(s, n).items():
+                self.postings[gram].append((i, count))
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+    def required_shared(self, la: int, lb: int, threshold: float) -> int:
+        """Minimum shared n-grams for strings of length la, lb to reach threshold."""
+        max_distance = int((la + lb) * (1 - threshold) + 1e-9)
+        return max(la, lb) - self.n + 1 - self.n * max_distance
+
+    def candidates(self, query: str, threshold: float) -> list[int]:
+        """Indices (ascending) of strings that may score >= threshold against query."""
+        if threshold <= 0:
+            return list(range(len(self.strings)))
+        la = len(query)
+        lo = math.ceil(la * threshold / (2 - threshold) - 1e-9)
+        hi = math.floor(la * (2 - threshold) / threshold + 1e-9)
+
+        shared: dict[int, int] = defaultdict(int)
+        for gram, q_count in ngrams(query, self.n).items():
+            for i, count in self.postings.get(gram, ()):
+                shared[i] += min(q_count, count)
+
+        result = []
+        for lb in range(lo, hi + 1):
+            ids = self.by_length.get(lb)
+            if not ids:
+                continue
+            required = self.required_shared(la, lb, threshold)
+            if required <= 0:
+                result.extend(ids)
+            else:
+                result.extend(i for i in ids if shared.get(i, 0) >= required)
+        result.sort()
+        return result
+
+    def matches(self, query: str, threshold: float, exclude: set[int] | None = None) -> list[tuple[int, float]]:
+        """All (index, ratio) with ratio >= threshold, in index order."""
+        found = []
+        for i in self.candidates(query, threshold):
+            if exclude and i in exclude:
+                continue
+            matcher = SequenceMatcher(None, query, self.strings[i])
+            if matcher.quick_ratio() < threshold:
+                continue
+            ratio = matcher.ratio()
+            if ratio >= threshold:
+                found.append((i, ratio))
+        return found
+
+    def top_k(self, query: str, k: int, threshold: float) -> list[tuple[int, float]]:
+        """Up to k (index, ratio) with ratio >= threshold, highest ratio first (ties by index)."""
+        return sorted(self.matches(query, threshold), key=lambda m: (-m[1], m[0]))[:k]
+
+    def best(self, query: str, threshold: float, exclude: set[int] | None = None) -> tuple[int, float] | None:
+        """The first (index, ratio) with the highest ratio, if that ratio >= threshold.
+
+        Same result as scanning every string in order and keeping the first
+        strictly better ratio; candidates that can't beat the threshold or the
+        current best are pruned on quick_ratio() before ratio() is computed.
+        """
+        best_index, best_ratio = None, 0.0
+        for i in self.candidates(query, threshold):
+            if exclude and i in exclude:
+                continue
+            matcher = SequenceMatcher(None, query, self.strings[i])
+            upper = matcher.quick_ratio()
+            if upper < threshold or upper <= best_ratio:
+                continue
+            ratio = matcher.ratio()
+            if ratio > best_ratio:
+                best_index, best_ratio = i, ratio
+        if best_index is None or best_ratio < threshold:
+            return None
+        return best_index, best_ratio
+
+    def containing(self, substring: str) -> list[int]:
+        """Indices (ascending) of strings that contain substring."""
+        grams = ngrams(substring, self.n)
+        if not grams:
+            return [i for i, s in enumerate(self.strings) if substring in s]
+        rarest = min(grams, key=lambda g: len(self.postings.get(g, ())))
+        return [i for i, _ in self.postings.get(rarest, ()) if substring in self.strings[i]]
@@ -10,6 +10,7 @@ Usage:
   python3 import_phase10_characters.py              # Full run
   python3 import_phase10_characters.py --sample 50   # Sample first 50 missing
   python3 import_phase10_characters.py --resume       # Resume from checkpoint
+  python3 import_phase10_characters.py --cache-only   # Rebuild from cached replies, no API calls
   python3 import_phase10_characters.py --extract-only # Only extract, skip AI generation
 """
 
@@ -18,21 +19,30 @@ import json
 import os
 import re
 import sys
-import time
-from difflib import SequenceMatcher
+from itertools import chain
 from pathlib import Path
 
 SCRIPT_DIR = Path(__file__).parent
-WEB_DATA_DIR = SCRIPT_DIR.parent.parent / "web" / "data"
+DATA_DIR = SCRIPT_DIR.parent
+WEB_DATA_DIR = DATA_DIR.parent / "web" / "data"
+sys.path.insert(0, str(DATA_DIR))
+
+from checkpoint_log import CheckpointLog, dump_json_array  # noqa: E402
+from batch_sizer import BatchSizer  # noqa: E402
+from claude_client import ClaudeClient  # noqa: E402
+from fuzzy_match import FuzzyIndex  # noqa: E402
 
 EDITIONS_PATH = WEB_DATA_DIR / "collected_editions.json"
 CHARACTERS_PATH = WEB_DATA_DIR / "characters.json"
 OUTPUT_PATH = SCRIPT_DIR / "phase10_new_characters.json"
-CHECKPOINT_PATH = SCRIPT_DIR / "phase10_checkpoint.json"
+CHECKPOINT_PATH = SCRIPT_DIR / "phase10_checkpoint.jsonl"
+LEGACY_CHECKPOINT_PATH = SCRIPT_DIR / "phase10_checkpoint.json"
 EXTRACTED_PATH = SCRIPT_DIR / "phase10_extracted_names.json"
 
-BATCH_SIZE = 20
-CHECKPOINT_EVERY = 10  # batches
+BATCH_SIZE = 20  # starting size; adapted to the observed output per character
+
+MODEL = "claude-sonnet-4-5-20250929"
+MAX_TOKENS = 8192
 
 # Characters commonly mentioned in titles/synopses that we can extract
 # Maps normalized name → canonical name for known Marvel/Star Wars/Conan characters
@@ -217,18 +227,21 @@ def build_existing_name_index(characters: list[dict]) -> set[str]:
     return names
 
 
-def fuzzy_match_existing(name: str, existing_names: set[str], threshold: float = 0.85) -> bool:
-    """Check if a character name fuzzy-matches an existing one."""
+def fuzzy_match_existing(name: str, existing_names: set[str], threshold: float = 0.85,
+                         index: FuzzyIndex | None = None) -> bool:
+    """Check if a character name fuzzy-matches an existing one.
+
+    Pass a FuzzyIndex built over existing_names when checking many names.
+    """
     name_lower = name.lower()
     if name_lower in existing_names:
         return True
     slug = slugify(name)
     if slug in existing_names:
         return True
-    for existing in existing_names:
-        if SequenceMatcher(None, name_lower, existing).ratio() >= threshold:
-            return True
-    return False
+    if index is None:
+        index = FuzzyIndex(sorted(existing_names))
+    return index.best(name_lower, threshold) is not None
 
 
 def build_batch_prompt(batch: list[dict], edition_context: dict[str, list[str]]) -> str:
@@ -267,39 +280,12 @@ Respond with a JSON array of objects, one per character, in the same order:
 Only output the JSON array, no other text."""
 
 
-def call_claude_api(prompt: str, api_key: str) -> list[dict]:
-    """Call Claude API and parse response."""
-    try:
-        import anthropic
-    except ImportError:
-        print("ERROR: anthropic package not installed. Run: pip install anthropic")
-        sys.exit(1)
-
-    client = anthropic.Anthropic(api_key=api_key)
-
-    response = client.messages.create(
-        model="claude-sonnet-4-5-20250929",
-        max_tokens=8192,
-        system=SYSTEM_PROMPT,
-        messages=[{"role": "user", "content": prompt}],
-    )
-
-    content = response.content[0].text.strip()
-
-    # Extract JSON from response (handle markdown code blocks)
-    if content.startswith("```"):
-        content = content.split("```")[1]
-        if content.startswith("json"):
-            content = content[4:]
-    content = content.strip()
-
-    return json.loads(content)
-
-
 def run():
     parser = argparse.ArgumentParser(description="Phase 10: Extract & generate new characters")
     parser.add_argument("--sample", type=int, default=0, help="Process only first N missing characters")
     parser.add_argument("--resume", action="store_true", help="Resume from checkpoint")
+    parser.add_argument("--cache-only", action="store_true",
+                        help="Replay cached Claude replies only; never call the API")
     parser.add_argument("--extract-only", action="store_true", help="Only extract names, skip AI generation")
     args = parser.parse_args()
 
@@ -317,6 +303,7 @@ def run():
 
     # Build index of existing names
     existing_names = build_existing_name_index(existing_characters)
+    name_index = FuzzyIndex(sorted(existing_names))
     existing_slugs = {c["slug"] for c in existing_characters}
 
     # Extract character names from editions
@@ -327,7 +314,7 @@ def run():
     # Filter out characters that already exist
     missing = {}
     for name, info in extracted.items():
-        if not fuzzy_match_existing(name, existing_names):
+        if not fuzzy_match_existing(name, existing_names, index=name_index):
             slug = slugify(name)
             if slug not in existing_slugs and len(slug) > 1:
                 missing[name] = info
@@ -357,7 +344,7 @@ def run():
 
     # AI generation
     api_key = os.environ.get("ANTHROPIC_API_KEY")
-    if not api_key:
+    if not api_key and not args.cache_only:
         print("ERROR: ANTHROPIC_API_KEY environment variable not set")
         sys.exit(1)
 
@@ -367,42 +354,47 @@ def run():
 
     # Handle resume
     start_index = 0
-    generated = []
-    if args.resume and CHECKPOINT_PATH.exists():
-        with open(CHECKPOINT_PATH) as f:
-            checkpoint = json.load(f)
-        start_index = checkpoint["processed_count"]
-        generated = checkpoint["generated"]
+    # Generated entries live in the checkpoint log; only their slugs are kept in memory
+    generated_count = 0
+    log = CheckpointLog(CHECKPOINT_PATH, legacy=(LEGACY_CHECKPOINT_PATH, "generated"))
+    if args.resume:
+        for result in log.replay():
+            existing_slugs.add(result["slug"])
+            generated_count += 1
+        start_index = log.processed
         print(f"Resuming from checkpoint: {start_index} already processed")
+    log.open(resume=args.resume)
 
     total = len(missing_sorted)
-    batches_since_checkpoint = 0
+    sizer = BatchSizer(MAX_TOKENS, BATCH_SIZE)
     api_errors = 0
 
     print(f"\nTotal characters to generate: {total - start_index}")
-    print(f"Batch size: {BATCH_SIZE}")
+    print(f"Batch size: {BATCH_SIZE} to start, adapted to output size")
     print(f"Estimated API calls: {(total - start_index + BATCH_SIZE - 1) // BATCH_SIZE}")
     print()
 
-    for batch_start in range(start_index, total, BATCH_SIZE):
-        batch_end = min(batch_start + BATCH_SIZE, total)
-        batch = missing_sorted[batch_start:batch_end]
-        batch_num = batch_start // BATCH_SIZE + 1
-        total_batches = (total + BATCH_SIZE - 1) // BATCH_SIZE
-
-        print(f"Batch {batch_num}/{total_batches} ({batch_start + 1}-{batch_end})...", end=" ", flush=True)
-
+    def batch_prompt(batch: list[dict]) -> str:
         # Build edition context
         edition_context = {}
         for char_info in batch:
             for slug in char_info.get("edition_slugs", [])[:5]:
                 edition_context[slug] = []
+        return build_batch_prompt(batch, edition_context)
+
+    client = ClaudeClient(api_key, MODEL, system=SYSTEM_PROMPT, max_tokens=MAX_TOKENS,
+                          cache_only=args.cache_only)
 
-        prompt = build_batch_prompt(batch, edition_context)
+    def handle(call):
+        nonlocal generated_count, api_errors
+        batch_start, batch_end = call.start, call.end
 
-        try:
-            results = call_claude_api(prompt, api_key)
-            print(f"OK ({len(results)} characters)")
+        print(f"Batch {call.index + 1} ({batch_start + 1}-{batch_end} of {total})...", end=" ")
+
+        if call.error is None:
+            results = [r for r in call.value if isinstance(r, dict)]  # None = malformed element
+            print(f"OK ({len(results)} characters, {call.timing()})")
+            batch_generated = []
 
             for result in results:
                 # Validate and clean
@@ -411,71 +403,62 @@ def run():
                     print(f"    SKIP (already exists): {result_slug}")
                     continue
                 result["slug"] = result_slug
-                generated.append(result)
+                batch_generated.append(result)
                 existing_slugs.add(result_slug)
 
+            generated_count += len(batch_generated)
+            log.append(batch_end, batch_generated)
             api_errors = 0  # reset on success
 
-        except json.JSONDecodeError as e:
-            print(f"JSON parse error: {e}")
+        elif isinstance(call.error, json.JSONDecodeError):
+            print(f"JSON parse error: {call.error}")
             api_errors += 1
-        except Exception as e:
-            err_str = str(e).lower()
-            if "rate_limit" in err_str or "429" in err_str:
-                print("Rate limited, waiting 60s...")
-                time.sleep(60)
-                # Retry this batch
-                continue
-            print(f"API error: {e}")
+        else:
+            # Rate limits were already retried (with retry-after) by the client
+            print(f"API error: {call.error}")
             api_errors += 1
 
+        if call.error is not None:
+            log.fail(batch_start)  # retried on --resume
         if api_errors > 5:
             print("\nToo many consecutive API errors, saving checkpoint and stopping")
-            break
-
-        batches_since_checkpoint += 1
-
-        # Checkpoint
-        if batches_since_checkpoint >= CHECKPOINT_EVERY:
-            with open(CHECKPOINT_PATH, "w") as f:
-                json.dump({
-                    "processed_count": batch_end,
-                    "generated": generated,
-                }, f, indent=2)
-            print(f"  [Checkpoint saved: {batch_end} processed, {len(generated)} generated]")
-            batches_since_checkpoint = 0
+            return True
 
-        # Rate limiting
-        time.sleep(3)
+    # Concurrent, rate-limited calls; results are handled in character order, and a
+    # truncated or unparseable batch is split and retried
+    stopped = client.run_batches(missing_sorted[start_index:], batch_prompt, handle, sizer,
+                                 start=start_index, one_per_item=True)
+    print(client.stats())
+    print(sizer.stats())
+    if stopped:
+        log.close()
+        print(f"Checkpoint kept at {CHECKPOINT_PATH}; re-run with --resume")
+        return
 
-    # Save output
-    with open(OUTPUT_PATH, "w") as f:
-        json.dump(generated, f, indent=2)
-    print(f"\nSaved {len(generated)} new characters to {OUTPUT_PATH}")
+    # Save output (streamed from the checkpoint log)
+    dump_json_array(log.records(), OUTPUT_PATH)
+    print(f"\nSaved {generated_count} new characters to {OUTPUT_PATH}")
 
     # Merge into characters.json
-    merged = existing_characters + generated
-    with open(CHARACTERS_PATH, "w") as f:
-        json.dump(merged, f, indent=2)
-    print(f"Updated characters.json: {len(existing_characters)} → {len(merged)} characters")
-
-    # Clean up checkpoint
-    if CHECKPOINT_PATH.exists():
-        CHECKPOINT_PATH.unlink()
-        print("Checkpoint cleaned up")
+    merged = dump_json_array(chain(existing_characters, log.records()), CHARACTERS_PATH)
+    print(f"Updated characters.json: {len(existing_characters)} → {merged} characters")
 
     # Summary
     print(f"\n{'=' * 55}")
     print("PHASE 10 COMPLETE")
     print("=" * 55)
     universe_counts = {}
-    for char in generated:
+    for char in log.records():
         u = char.get("universe", "Unknown")
         universe_counts[u] = universe_counts.get(u, 0) + 1
     print(f"\nNew characters by universe:")
     for u, count in sorted(universe_counts.items(), key=lambda x: -x[1]):
         print(f"  {u}: {count}")
 
+    # Clean up checkpoint
+    if log.remove():
+        print("Checkpoint cleaned up")
+
 
 if __name__ == "__main__":
     run()
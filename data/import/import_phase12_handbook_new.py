@@ -10,7 +10,11 @@ Usage:
   python3 import_phase12_handbook_new.py              # Full run
   python3 import_phase12_handbook_new.py --sample 20   # Sample first 20
   python3 import_phase12_handbook_new.py --resume       # Resume from checkpoint
+  python3 import_phase12_handbook_new.py --cache-only   # Rebuild from cached replies, no API calls
   python3 import_phase12_handbook_new.py --analyze-only # Only report gaps
+  python3 import_phase12_handbook_new.py --bulk submit  # Offline: submit everything as one job
+  python3 import_phase12_handbook_new.py --bulk poll    # ... check on it
+  python3 import_phase12_handbook_new.py --bulk collect # ... merge its results (see bulk_jobs.py)
 """
 
 import argparse
@@ -18,11 +22,17 @@ import json
 import os
 import re
 import sys
-import time
+from itertools import chain
 from pathlib import Path
 
 SCRIPT_DIR = Path(__file__).parent
 WEB_DATA_DIR = SCRIPT_DIR.parent.parent / "web" / "data"
+sys.path.insert(0, str(SCRIPT_DIR.parent))
+
+from checkpoint_log import CheckpointLog, dump_json_array  # noqa: E402
+from batch_sizer import BatchSizer  # noqa: E402
+from bulk_jobs import BulkJob, local_job, print_status  # noqa: E402
+from claude_client import ClaudeClient  # noqa: E402
 
 HANDBOOK_PATH = WEB_DATA_DIR / "handbook_entries.json"
 CHARACTERS_PATH = WEB_DATA_DIR / "characters.json"
@@ -31,11 +41,14 @@ EVENTS_PATH = WEB_DATA_DIR / "events.json"
 ERAS_PATH = WEB_DATA_DIR / "eras.json"
 
 OUTPUT_PATH = SCRIPT_DIR / "phase12_new_handbook.json"
-CHECKPOINT_PATH = SCRIPT_DIR / "phase12_checkpoint.json"
+CHECKPOINT_PATH = SCRIPT_DIR / "phase12_checkpoint.jsonl"
+LEGACY_CHECKPOINT_PATH = SCRIPT_DIR / "phase12_checkpoint.json"
 GAPS_PATH = SCRIPT_DIR / "phase12_gaps.json"
 
-BATCH_SIZE = 5  # Rich output needed, smaller batches
-CHECKPOINT_EVERY = 10  # batches
+BATCH_SIZE = 5  # Rich output needed, smaller batches (starting size; adapted to output per entry)
+
+MODEL = "claude-sonnet-4-5-20250929"
+MAX_TOKENS = 16384
 
 SYSTEM_PROMPT = """You are a Marvel Comics, Star Wars Comics, and Conan Comics expert.
 Your job is to write comprehensive handbook/encyclopedia entries for a comics chronology app.
@@ -268,40 +281,17 @@ Respond with a JSON array of handbook entry objects:
 Only output the JSON array, no other text."""
 
 
-def call_claude_api(prompt: str, api_key: str) -> list[dict]:
-    """Call Claude API and parse response."""
-    try:
-        import anthropic
-    except ImportError:
-        print("ERROR: anthropic package not installed. Run: pip install anthropic")
-        sys.exit(1)
-
-    client = anthropic.Anthropic(api_key=api_key)
-
-    response = client.messages.create(
-        model="claude-sonnet-4-5-20250929",
-        max_tokens=16384,
-        system=SYSTEM_PROMPT,
-        messages=[{"role": "user", "content": prompt}],
-    )
-
-    content = response.content[0].text.strip()
-
-    # Extract JSON
-    if content.startswith("```"):
-        content = content.split("```")[1]
-        if content.startswith("json"):
-            content = content[4:]
-    content = content.strip()
-
-    return json.loads(content)
-
-
 def run():
     parser = argparse.ArgumentParser(description="Phase 12: Generate new handbook entries")
     parser.add_argument("--sample", type=int, default=0, help="Process only first N characters")
     parser.add_argument("--resume", action="store_true", help="Resume from checkpoint")
+    parser.add_argument("--cache-only", action="store_true",
+                        help="Replay cached Claude replies only; never call the API")
     parser.add_argument("--analyze-only", action="store_true", help="Only report gaps")
+    parser.add_argument("--bulk", choices=("submit", "poll", "collect"),
+                        help="Offline mode: submit every batch as one bulk job, poll it, collect its results")
+    parser.add_argument("--bulk-local", action="store_true",
+                        help="With --bulk submit: leave the job for the local stand-in (bulk_jobs.py standin)")
     args = parser.parse_args()
 
     print("Phase 12: Generate New Handbook Entries")
@@ -397,9 +387,10 @@ def run():
                 print(f"  {c['name']} ({c.get('universe', 'Earth-616')}): {eds} editions")
         return
 
-    # AI generation
+    # AI generation (no key needed for cache replays or the local bulk stand-in)
+    local = args.bulk_local if args.bulk == "submit" else bool(args.bulk) and local_job("phase12_handbook")
     api_key = os.environ.get("ANTHROPIC_API_KEY")
-    if not api_key:
+    if not api_key and not args.cache_only and not local:
         print("ERROR: ANTHROPIC_API_KEY environment variable not set")
         sys.exit(1)
 
@@ -414,43 +405,63 @@ def run():
         event_slugs_by_char[char["slug"]] = find_character_events(char, events)
         eras_by_char[char["slug"]] = determine_eras(char, editions, eras)
 
+    client = ClaudeClient(api_key, MODEL, system=SYSTEM_PROMPT, max_tokens=MAX_TOKENS,
+                          cache_only=args.cache_only)
+
+    def batch_prompt(batch: list[dict]) -> str:
+        return build_batch_prompt(
+            batch, edition_slugs_by_char, event_slugs_by_char, eras_by_char,
+            all_era_slugs, existing_handbook_slugs
+        )
+
+    # Offline bulk mode: one job with every batch, merged by a later --bulk collect
+    bulk = BulkJob("phase12_handbook", client) if args.bulk else None
+    keys = [char["slug"] for char in prioritized]
+    if args.bulk == "submit":
+        manifest = bulk.submit(keys, batch_prompt, prioritized, BATCH_SIZE, local=args.bulk_local)
+        print(f"Submitted {len(manifest['ranges'])} requests as one {manifest['backend']} bulk job: {bulk.dir}")
+        return
+    if args.bulk == "poll":
+        print_status(bulk.status())
+        return
+
     # Handle resume
     start_index = 0
-    generated = []
-    if args.resume and CHECKPOINT_PATH.exists():
-        with open(CHECKPOINT_PATH) as f:
-            checkpoint = json.load(f)
-        start_index = checkpoint["processed_count"]
-        generated = checkpoint["generated"]
+    # Generated entries live in the checkpoint log; only their slugs are kept in memory
+    generated_count = 0
+    log = CheckpointLog(CHECKPOINT_PATH, legacy=(LEGACY_CHECKPOINT_PATH, "generated"))
+    generated_slugs = set()
+    if args.resume and not bulk:
+        for entry in log.replay():
+            generated_slugs.add(entry["slug"])
+            generated_count += 1
+        start_index = log.processed
         print(f"Resuming from checkpoint: {start_index} already processed")
+    log.open(resume=args.resume and not bulk)
 
     total = len(prioritized)
-    batches_since_checkpoint = 0
+    sizer = BatchSizer(MAX_TOKENS, BATCH_SIZE)
     api_errors = 0
 
     print(f"\nTotal characters to generate: {total - start_index}")
-    print(f"Batch size: {BATCH_SIZE}")
+    print(f"Batch size: {BATCH_SIZE} to start, adapted to output size")
     print(f"Estimated API calls: {(total - start_index + BATCH_SIZE - 1) // BATCH_SIZE}")
     print()
 
-    generated_slugs = {g["slug"] for g in generated}
+    valid_edition_slugs = {ed["slug"] for ed in editions}
+    valid_event_slugs = {ev["slug"] for ev in events}
+    valid_era_slugs = set(all_era_slugs)
 
-    for batch_start in range(start_index, total, BATCH_SIZE):
-        batch_end = min(batch_start + BATCH_SIZE, total)
-        batch = prioritized[batch_start:batch_end]
-        batch_num = batch_start // BATCH_SIZE + 1
-        total_batches = (total + BATCH_SIZE - 1) // BATCH_SIZE
+    def handle(call):
+        nonlocal generated_count, api_errors
+        batch_start, batch_end = call.start, call.end
 
-        print(f"Batch {batch_num}/{total_batches} ({batch_start + 1}-{batch_end})...", end=" ", flush=True)
+        print(f"Batch {call.index + 1} ({batch_start + 1}-{batch_end} of {total})...", end=" ")
 
-        prompt = build_batch_prompt(
-            batch, edition_slugs_by_char, event_slugs_by_char, eras_by_char,
-            all_era_slugs, existing_handbook_slugs
-        )
-
-        try:
-            results = call_claude_api(prompt, api_key)
-            print(f"OK ({len(results)} entries)")
+        if call.error is None:
+            results = [r for r in call.value if isinstance(r, dict)]  # None = malformed element
+            print(f"OK ({len(results)} entries, {call.timing()})")
+            batch_generated = []
 
             for result in results:
                 result_slug = result.get("slug", "")
@@ -460,17 +471,17 @@ def run():
 
                 # Validate related_edition_slugs against actual editions
                 valid_ed_slugs = [s for s in result.get("related_edition_slugs", [])
-                                  if s in {ed["slug"] for ed in editions}]
+                                  if s in valid_edition_slugs]
                 result["related_edition_slugs"] = valid_ed_slugs
 
                 # Validate related_event_slugs
                 valid_ev_slugs = [s for s in result.get("related_event_slugs", [])
-                                  if s in {ev["slug"] for ev in events}]
+                                  if s in valid_event_slugs]
                 result["related_event_slugs"] = valid_ev_slugs
 
                 # Validate era slugs in status_by_era
                 valid_eras = [s for s in result.get("status_by_era", [])
-                              if s.get("era_slug") in set(all_era_slugs)]
+                              if s.get("era_slug") in valid_era_slugs]
                 result["status_by_era"] = valid_eras
 
                 # Ensure retcon_history is empty (manual curation)
@@ -480,64 +491,59 @@ def run():
                 if "related_conflict_slugs" not in result:
                     result["related_conflict_slugs"] = []
 
-                generated.append(result)
+                batch_generated.append(result)
                 generated_slugs.add(result_slug)
 
+            generated_count += len(batch_generated)
+            log.append(batch_end, batch_generated)
             api_errors = 0
 
-        except json.JSONDecodeError as e:
-            print(f"JSON parse error: {e}")
+        elif isinstance(call.error, json.JSONDecodeError):
+            print(f"JSON parse error: {call.error}")
             api_errors += 1
-        except Exception as e:
-            err_str = str(e).lower()
-            if "rate_limit" in err_str or "429" in err_str:
-                print("Rate limited, waiting 60s...")
-                time.sleep(60)
-                continue
-            print(f"API error: {e}")
+        else:
+            # Rate limits were already retried (with retry-after) by the client
+            print(f"API error: {call.error}")
             api_errors += 1
 
+        if call.error is not None:
+            log.fail(batch_start)  # retried on --resume
         if api_errors > 5:
             print("\nToo many consecutive API errors, saving checkpoint and stopping")
-            break
-
-        batches_since_checkpoint += 1
-
-        # Checkpoint
-        if batches_since_checkpoint >= CHECKPOINT_EVERY:
-            with open(CHECKPOINT_PATH, "w") as f:
-                json.dump({
-                    "processed_count": batch_end,
-                    "generated": generated,
-                }, f, indent=2)
-            print(f"  [Checkpoint saved: {batch_end} processed, {len(generated)} entries]")
-            batches_since_checkpoint = 0
-
-        # Rate limiting
-        time.sleep(5)
+            return True
+
+    if bulk:
+        # The bulk job's results, handed over in character order like a live run
+        stopped = any(handle(call) for call in bulk.collect(keys))
+    else:
+        # Concurrent, rate-limited calls; results are handled in character order, and a
+        # truncated or unparseable batch is split and retried
+        stopped = client.run_batches(prioritized[start_index:], batch_prompt, handle, sizer,
+                                     start=start_index, one_per_item=True)
+        print(client.stats())
+        print(sizer.stats())
+    if stopped:
+        log.close()
+        if bulk:
+            print(f"Bulk job kept at {bulk.dir}; re-run with --bulk collect")
+        else:
+            print(f"Checkpoint kept at {CHECKPOINT_PATH}; re-run with --resume")
+        return
 
-    # Save output
-    with open(OUTPUT_PATH, "w") as f:
-        json.dump(generated, f, indent=2)
-    print(f"\nSaved {len(generated)} new handbook entries to {OUTPUT_PATH}")
+    # Save output (streamed from the checkpoint log)
+    dump_json_array(log.records(), OUTPUT_PATH)
+    print(f"\nSaved {generated_count} new handbook entries to {OUTPUT_PATH}")
 
     # Merge into handbook_entries.json
-    merged = handbook + generated
-    with open(HANDBOOK_PATH, "w") as f:
-        json.dump(merged, f, indent=2)
-    print(f"Updated handbook_entries.json: {len(handbook)} → {len(merged)} entries")
-
-    # Clean up checkpoint
-    if CHECKPOINT_PATH.exists():
-        CHECKPOINT_PATH.unlink()
-        print("Checkpoint cleaned up")
+    merged = dump_json_array(chain(handbook, log.records()), HANDBOOK_PATH)
+    print(f"Updated handbook_entries.json: {len(handbook)} → {merged} entries")
 
     # Summary
     print(f"\n{'=' * 55}")
     print("PHASE 12 COMPLETE")
     print("=" * 55)
     type_counts = {}
-    for entry in generated:
+    for entry in log.records():
         t = entry.get("entry_type", "unknown")
         type_counts[t] = type_counts.get(t, 0) + 1
     print(f"\nNew entries by type:")
@@ -545,7 +551,7 @@ def run():
         print(f"  {t}: {count}")
 
     universe_counts = {}
-    for entry in generated:
+    for entry in log.records():
         # Infer universe from tags or description
         tags = entry.get("tags", [])
         if "star-wars" in tags or "star wars" in entry.get("description", "").lower():
@@ -560,6 +566,10 @@ def run():
     for u, count in sorted(universe_counts.items(), key=lambda x: -x[1]):
         print(f"  {u}: {count}")
 
+    # Clean up checkpoint
+    if log.remove():
+        print("Checkpoint cleaned up")
+
 
 if __name__ == "__main__":
     run()
@@ -1,15 +1,25 @@
 #!/usr/bin/env python3
-"""Phase 1: Parse & Deduplicate archive editions against existing data."""
+"""Phase 1: Parse & Deduplicate archive editions against existing data.
 
+Usage:
+  python3 import_phase1_parse.py           # Full run over the whole archive
+  python3 import_phase1_parse.py --delta   # Only records added/modified since the last merge
+"""
+
+import argparse
+import hashlib
 import json
 import os
 import sys
 from collections import Counter
-from difflib import SequenceMatcher
 from pathlib import Path
 
 SCRIPT_DIR = Path(__file__).parent
 DATA_DIR = SCRIPT_DIR.parent
+sys.path.insert(0, str(DATA_DIR))
+
+from fuzzy_match import FuzzyIndex  # noqa: E402
+from isbn_index import IsbnIndex, canonical_isbn  # noqa: E402
 WEB_DATA_DIR = DATA_DIR.parent / "web" / "data"
 
 ARCHIVE_PATH = DATA_DIR / "marvel_collected_editions_archive.json"
@@ -21,6 +31,11 @@ OUTPUT_ISBN_BACKFILL = SCRIPT_DIR / "phase1_isbn_backfill.json"
 OUTPUT_STAR_WARS = SCRIPT_DIR / "phase1_star_wars.json"
 OUTPUT_CONAN = SCRIPT_DIR / "phase1_conan.json"
 
+# Delta import state: the committed state is only replaced by Phase 8 after a
+# successful merge, so a failed run never advances the watermark.
+DELTA_STATE_PATH = SCRIPT_DIR / "import_delta_state.json"
+DELTA_PENDING_PATH = SCRIPT_DIR / "phase1_delta_pending.json"
+
 FUZZY_THRESHOLD = 0.85
 
 
@@ -37,22 +52,89 @@ def normalize_title_for_matching(title: str) -> str:
     return t.strip()
 
 
+def archive_date(date_str: str) -> str:
+    """Convert an archive DD/MM/YYYY date to sortable YYYY-MM-DD ('' if unparseable)."""
+    parts = (date_str or "").strip().split("/")
+    if len(parts) != 3:
+        return ""
+    day, month, year = parts
+    try:
+        return f"{int(year):04d}-{int(month):02d}-{int(day):02d}"
+    except ValueError:
+        return ""
+
+
+def record_key(entry: dict) -> str:
+    """Stable identity of an archive record."""
+    return entry.get("ID") or entry.get("Code") or entry.get("ISBN") or entry["Title"]
+
+
+def record_fingerprint(entry: dict) -> str:
+    """Content hash of an archive record, independent of key order."""
+    return hashlib.sha1(json.dumps(entry, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def load_delta_state() -> dict:
+    if DELTA_STATE_PATH.exists():
+        with open(DELTA_STATE_PATH) as f:
+            return json.load(f)
+    return {"watermark": "", "fingerprints": {}}
+
+
+def select_delta(archive: list[dict], state: dict) -> tuple[list[dict], dict]:
+    """Pick archive records that are new or changed since the committed delta state.
+
+    A record is selected when its Added/Modified date is past the watermark or
+    its fingerprint differs from the one recorded at the last merge (catching
+    edits that did not bump Modified). Changed records without an ISBN are left
+    out: they can't be matched back to the edition they already produced, so
+    re-importing them would create a duplicate.
+    """
+    watermark = state.get("watermark", "")
+    fingerprints = state.get("fingerprints", {})
+
+    selected = []
+    stats = {"new": 0, "modified": 0, "modified_without_isbn_skipped": 0, "unchanged": 0}
+    for entry in archive:
+        key = record_key(entry)
+        previous = fingerprints.get(key)
+        latest = max(archive_date(entry.get("Added", "")), archive_date(entry.get("Modified", "")))
+        if previous is None:
+            stats["new"] += 1
+            selected.append(entry)
+        elif previous != record_fingerprint(entry) or latest > watermark:
+            if entry.get("ISBN", "").strip():
+                stats["modified"] += 1
+                selected.append(entry)
+            else:
+                stats["modified_without_isbn_skipped"] += 1
+        else:
+            stats["unchanged"] += 1
+    return selected, stats
+
+
+def build_delta_state(archive: list[dict]) -> dict:
+    """Delta state describing the full archive as of this run."""
+    dates = [archive_date(e.get(field, "")) for e in archive for field in ("Added", "Modified")]
+    return {
+        "watermark": max(dates, default=""),
+        "fingerprints": {record_key(e): record_fingerprint(e) for e in archive},
+    }
+
+
 def merge_variant_covers(entries: list[dict]) -> list[dict]:
-    """Merge entries sharing the same ISBN (variant covers)."""
-    isbn_groups: dict[str, list[dict]] = {}
+    """Merge entries sharing the same ISBN (variant covers), in any ISBN-10/13 spelling."""
+    isbn_groups = IsbnIndex()
     no_isbn = []
 
     for entry in entries:
-        isbn = entry.get("ISBN", "").strip()
-        if isbn:
-            isbn_groups.setdefault(isbn, []).append(entry)
-        else:
+        if not isbn_groups.add(entry.get("ISBN"), entry):
             no_isbn.append(entry)
 
     merged = []
     variant_merge_count = 0
 
-    for isbn, group in isbn_groups.items():
+    for isbn, group in isbn_groups.groups():
         if len(group) == 1:
             merged.append(group[0])
             continue
@@ -65,7 +147,7 @@ def merge_variant_covers(entries: list[dict]) -> list[dict]:
             len(e["Title"])
         ))
         # Collect all Diamond codes
-        codes = list({e["Code"] for e in group if e.get("Code")})
+        codes = sorted({e["Code"] for e in group if e.get("Code")})
         best = dict(best)
         best["variant_codes"] = codes
         merged.append(best)
@@ -95,19 +177,14 @@ def filter_non_marvel(entries: list[dict]) -> tuple[list[dict], list[dict], list
 def isbn_dedup(archive_entries: list[dict], existing_editions: list[dict]) -> tuple[list[dict], list[dict]]:
     """Remove archive entries whose ISBN already exists in existing data.
     Returns (new_entries, isbn_backfill_updates)."""
-    existing_isbn_map = {}
-    for ed in existing_editions:
-        isbn = (ed.get("isbn") or "").strip()
-        if isbn:
-            existing_isbn_map[isbn] = ed
+    existing_isbn_map = IsbnIndex.from_records(existing_editions, "isbn")
 
     new_entries = []
     backfill_updates = []
 
     for entry in archive_entries:
-        isbn = entry.get("ISBN", "").strip()
-        if isbn and isbn in existing_isbn_map:
-            existing_ed = existing_isbn_map[isbn]
+        existing_ed = existing_isbn_map.get(entry.get("ISBN"))
+        if existing_ed:
             update = {"slug": existing_ed["slug"]}
             changed = False
             # Backfill missing fields
@@ -143,25 +220,18 @@ def fuzzy_title_match(archive_entries: list[dict], existing_editions: list[dict]
             normed = normalize_title_for_matching(entry["Title"])
             archive_isbn_map[normed] = entry
 
+    archive_titles = list(archive_isbn_map)
+    index = FuzzyIndex(archive_titles)
+
     fuzzy_matches = []
-    matched_archive_titles = set()
+    matched_archive_ids: set[int] = set()
 
     for ex_normed, ex_ed in existing_normed:
-        best_ratio = 0
-        best_archive_title = None
-        best_archive_entry = None
-
-        for arch_normed, arch_entry in archive_isbn_map.items():
-            if arch_normed in matched_archive_titles:
-                continue
-            ratio = SequenceMatcher(None, ex_normed, arch_normed).ratio()
-            if ratio > best_ratio:
-                best_ratio = ratio
-                best_archive_title = arch_normed
-                best_archive_entry = arch_entry
-
-        if best_ratio >= FUZZY_THRESHOLD and best_archive_entry:
-            matched_archive_titles.add(best_archive_title)
+        match = index.best(ex_normed, FUZZY_THRESHOLD, exclude=matched_archive_ids)
+        if match:
+            best_id, best_ratio = match
+            best_archive_entry = archive_isbn_map[archive_titles[best_id]]
+            matched_archive_ids.add(best_id)
             fuzzy_matches.append({
                 "existing_slug": ex_ed["slug"],
                 "existing_title": ex_ed["title"],
@@ -173,21 +243,41 @@ def fuzzy_title_match(archive_entries: list[dict], existing_editions: list[dict]
     return fuzzy_matches
 
 
-def run():
+def run(argv: list[str] | None = None, existing: list[dict] | None = None, save: bool = True):
+    """Run Phase 1. `existing` skips reloading collected_editions.json;
+    save=False keeps phase1_parsed.json out of the round-trip (reports are still written)."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--delta", action="store_true",
+                        help="Only process archive records added/modified since the last merge")
+    args = parser.parse_args(argv)
+
     print("Phase 1: Parse & Deduplicate")
     print("=" * 50)
 
     # Load data
     with open(ARCHIVE_PATH) as f:
         archive = json.load(f)
-    with open(EXISTING_PATH) as f:
-        existing = json.load(f)
+    if existing is None:
+        with open(EXISTING_PATH) as f:
+            existing = json.load(f)
 
     print(f"Archive entries loaded: {len(archive)}")
     print(f"Existing editions loaded: {len(existing)}")
 
+    # Step 0: Delta selection (Phase 8 commits the pending state after merging)
+    candidates = archive
+    delta_stats = None
+    if args.delta:
+        state = load_delta_state()
+        candidates, delta_stats = select_delta(archive, state)
+        print(f"Delta since {state.get('watermark') or 'never'}: {len(candidates)} records "
+              f"({delta_stats['new']} new, {delta_stats['modified']} modified, "
+              f"{delta_stats['modified_without_isbn_skipped']} modified without ISBN skipped)")
+    with open(DELTA_PENDING_PATH, "w") as f:
+        json.dump(build_delta_state(archive), f)
+
     # Step 1: Merge variant covers
-    merged, variant_count = merge_variant_covers(archive)
+    merged, variant_count = merge_variant_covers(candidates)
     print(f"After variant merge: {len(merged)} entries ({variant_count} variants collapsed)")
 
     # Step 2: Categorize (but keep all entries)
@@ -209,18 +299,19 @@ def run():
     print(f"Fuzzy title matches (ISBN backfill): {len(fuzzy_matches)}")
 
     # Remove fuzzy-matched entries from new_entries (they're already in existing)
-    fuzzy_matched_isbns = {m["archive_isbn"] for m in fuzzy_matches if m["archive_isbn"]}
+    fuzzy_matched_isbns = {canonical_isbn(m["archive_isbn"]) for m in fuzzy_matches if m["archive_isbn"]}
     before_fuzzy = len(new_entries)
-    new_entries = [e for e in new_entries if e.get("ISBN", "") not in fuzzy_matched_isbns or not e.get("ISBN")]
+    new_entries = [e for e in new_entries if canonical_isbn(e.get("ISBN")) not in fuzzy_matched_isbns or not e.get("ISBN")]
     fuzzy_removed = before_fuzzy - len(new_entries)
     print(f"Fuzzy-matched entries removed: {fuzzy_removed}")
 
     print(f"\nFinal new entries for import: {len(new_entries)}")
 
     # Save outputs
-    with open(OUTPUT_PARSED, "w") as f:
-        json.dump(new_entries, f, indent=2)
-    print(f"Saved: {OUTPUT_PARSED}")
+    if save:
+        with open(OUTPUT_PARSED, "w") as f:
+            json.dump(new_entries, f, indent=2)
+        print(f"Saved: {OUTPUT_PARSED}")
 
     with open(OUTPUT_ISBN_BACKFILL, "w") as f:
         # Combine ISBN backfills and fuzzy match backfills
@@ -240,6 +331,7 @@ def run():
     # Report
     report = {
         "archive_total": len(archive),
+        "delta": delta_stats,
         "existing_total": len(existing),
         "variant_merges": variant_count,
         "after_variant_merge": len(merged),
@@ -199,14 +199,17 @@ def deduplicate_slugs(entries: list[dict], existing_slugs: set[str]) -> list[dic
     return entries
 
 
-def run():
+def run(entries: list[dict] | None = None, existing: list[dict] | None = None, save: bool = True):
+    """Run Phase 2 on Phase 1's entries (loaded from disk when not passed in)."""
     print("Phase 2: Clean Titles & Map Formats")
     print("=" * 50)
 
-    with open(INPUT_PATH) as f:
-        entries = json.load(f)
-    with open(EXISTING_PATH) as f:
-        existing = json.load(f)
+    if entries is None:
+        with open(INPUT_PATH) as f:
+            entries = json.load(f)
+    if existing is None:
+        with open(EXISTING_PATH) as f:
+            existing = json.load(f)
 
     existing_slugs = {e["slug"] for e in existing}
     print(f"Input entries: {len(entries)}")
@@ -268,9 +271,10 @@ def run():
 
     print(f"\nCleaned entries: {len(cleaned)}")
 
-    with open(OUTPUT_PATH, "w") as f:
-        json.dump(cleaned, f, indent=2)
-    print(f"Saved: {OUTPUT_PATH}")
+    if save:
+        with open(OUTPUT_PATH, "w") as f:
+            json.dump(cleaned, f, indent=2)
+        print(f"Saved: {OUTPUT_PATH}")
 
     return cleaned
 
@@ -1,12 +1,24 @@
 #!/usr/bin/env python3
-"""Phase 4: Assign eras to new editions based on content years and release dates."""
+"""Phase 4: Assign eras to new editions based on content years and release dates.
+
+Content years come from the "(YYYY)" volumes the edition collects: real cover
+dates where the series calendar (data/series_calendar.py) has them, the
+volume's launch year otherwise. Its launch-year estimates are not used, and
+neither are runs without a "(YYYY)", whose volume would be a guess. Editions
+with no dated volume fall back to the "(YYYY)" years in the Collects text,
+then to the release date.
+"""
 
 import json
 import re
+import sys
 from pathlib import Path
 
 SCRIPT_DIR = Path(__file__).parent
 WEB_DATA_DIR = SCRIPT_DIR.parent.parent / "web" / "data"
+sys.path.insert(0, str(SCRIPT_DIR.parent))
+
+from series_calendar import collects_years  # noqa: E402
 
 INPUT_PATH = SCRIPT_DIR / "phase2_cleaned.json"
 ERAS_PATH = WEB_DATA_DIR / "eras.json"
@@ -26,6 +38,11 @@ def extract_content_years(collects: str) -> list[int]:
     return [int(y) for y in YEAR_PATTERN.findall(collects) if 1940 <= int(y) <= 2030]
 
 
+def calendar_content_years(collects: str) -> list[int]:
+    """Start year of each collected "(YYYY)" run: its cover date, or its launch year if undated."""
+    return [int(start) for start, _ in collects_years(collects, dated_only=True)]
+
+
 def find_best_era(year: int, eras: list[dict]) -> str:
     """Find the best matching era for a given content year."""
     candidates = []
@@ -49,12 +66,14 @@ def find_best_era(year: int, eras: list[dict]) -> str:
     return closest["slug"]
 
 
-def run():
+def run(entries: list[dict] | None = None, save: bool = True):
+    """Run Phase 4, assigning era_slug on the entries in place."""
     print("Phase 4: Assign Eras")
     print("=" * 50)
 
-    with open(INPUT_PATH) as f:
-        entries = json.load(f)
+    if entries is None:
+        with open(INPUT_PATH) as f:
+            entries = json.load(f)
 
     eras = load_eras()
     print(f"Loaded {len(eras)} eras")
@@ -67,7 +86,7 @@ def run():
 
     for entry in entries:
         collects = entry.get("issues_collected", "")
-        years = extract_content_years(collects)
+        years = calendar_content_years(collects) or extract_content_years(collects)
 
         if years:
             # Use earliest content year
@@ -101,9 +120,10 @@ def run():
         if count:
             print(f"  {era['name']}: {count}")
 
-    with open(OUTPUT_PATH, "w") as f:
-        json.dump(entries, f, indent=2)
-    print(f"\nSaved: {OUTPUT_PATH}")
+    if save:
+        with open(OUTPUT_PATH, "w") as f:
+            json.dump(entries, f, indent=2)
+        print(f"\nSaved: {OUTPUT_PATH}")
 
     return entries
 
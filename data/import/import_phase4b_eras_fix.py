@@ -5,37 +5,40 @@ The original Phase 4 used the series launch year (e.g., 1963 from "X-Men (1963)"
 as the content year, which misassigns editions collecting high-numbered issues.
 Example: "Avengers (1963) #300" was tagged birth-of-marvel instead of event-age.
 
-Fix: pub_year ≈ series_launch_year + (issue_number / issues_per_year)
-Uses median publication year across all issues in the edition.
+Fix: estimate pub_year ≈ series_launch_year + (issue_number / issues_per_year),
+except for volumes the series calendar (data/series_calendar.py) has real
+cover dates for; its launch-year estimates for other volumes are not used.
+Issue ranges come from the shared collects parser (data/collects_parser.py).
+Uses median publication year across all issues in the edition, mapped to the
+era in eras.json whose range contains it (closest to the range's midpoint).
+Only an exact-slug entry in the shared era-rule table (data/era_rules.py,
+EXPLICIT_ERA_MAP) takes precedence over the estimate.
+
+    python3 import_phase4b_eras_fix.py --check   # diff against the launch-year estimate, write nothing
 """
 
+import argparse
 import json
-import re
 import statistics
+import sys
+from functools import lru_cache
 from pathlib import Path
 
 SCRIPT_DIR = Path(__file__).parent
-WEB_DATA_DIR = SCRIPT_DIR.parent.parent / "web" / "data"
+DATA_DIR = SCRIPT_DIR.parent
+WEB_DATA_DIR = DATA_DIR.parent / "web" / "data"
+sys.path.insert(0, str(DATA_DIR))
+
+from collects_parser import collects_cache, parse_collects_ranges  # noqa: E402
+from era_rules import EXACT_PASSES, era_rules  # noqa: E402
+from series_calendar import series_calendar, split_series  # noqa: E402
 
 ENRICHED_PATH = SCRIPT_DIR / "phase5_enriched.json"
 EDITIONS_PATH = WEB_DATA_DIR / "collected_editions.json"
 ERAS_PATH = WEB_DATA_DIR / "eras.json"
 OUTPUT_CORRECTIONS = SCRIPT_DIR / "phase4b_era_corrections.json"
 
-# Matches: Series Name (YEAR) #NUM or Series Name (YEAR) #NUM-NUM
-SERIES_ISSUE_PATTERN = re.compile(
-    r"([A-Z][A-Za-z\s\-\':,&.]+?)\s*\((\d{4})\)\s*#(\d+)(?:\s*[-–]\s*(\d+))?"
-)
-
-# Matches: SERIES NAME #NUM (no year, like "GIANT-SIZE INVADERS #1")
-BARE_ISSUE_PATTERN = re.compile(
-    r"([A-Z][A-Za-z\s\-\':,&.]+?)\s*#(\d+)(?:\s*[-–]\s*(\d+))?"
-)
-
-# Matches: Annual (YEAR) #NUM or ANNUAL #NUM
-ANNUAL_PATTERN = re.compile(r"ANNUAL\s*(?:\((\d{4})\)\s*)?#?(\d+)", re.IGNORECASE)
-
-# Known series cadences (issues per year) for major long-running titles
+# Fallback cadences (issues per year) for series missing from the calendar
 # Most Marvel monthlies are ~12/year. Some were bi-monthly or bi-weekly.
 SERIES_CADENCE = {
     "amazing spider-man": 12,
@@ -78,6 +81,7 @@ SERIES_CADENCE = {
     "sub-mariner": 12,
 }
 DEFAULT_CADENCE = 12
+LATEST_YEAR = 2026
 
 
 def load_eras():
@@ -85,38 +89,49 @@ def load_eras():
         return json.load(f)
 
 
-def estimate_pub_years(issues_collected: str) -> list[float]:
-    """Estimate publication years for all issues referenced in the collected field."""
+@lru_cache(maxsize=None)
+def series_cadence(series_lower: str) -> int:
+    """Issues per year for a series, from the first matching SERIES_CADENCE key."""
+    for key, cad in SERIES_CADENCE.items():
+        if key in series_lower or series_lower in key:
+            return cad
+    return DEFAULT_CADENCE
+
+
+def estimate_pub_years(issues_collected: str, use_calendar: bool = True) -> list[float]:
+    """Estimate publication years for all issues referenced in the collected field.
+
+    The string is parsed by the shared collects parser (data/collects_parser.py,
+    cached per distinct text); ranges of a series with a launch year are
+    dated, annuals are not (their numbers don't follow the series cadence).
+    Volumes with cover dates in the series calendar use them; everything else
+    (and everything, with use_calendar=False) is estimated from the launch
+    year and cadence, the original Phase 4b estimate.
+    """
     years = []
+    calendar = series_calendar()
 
-    for match in SERIES_ISSUE_PATTERN.finditer(issues_collected):
-        series_name = match.group(1).strip()
-        launch_year = int(match.group(2))
-        issue_start = int(match.group(3))
-        issue_end = int(match.group(4)) if match.group(4) else issue_start
+    for r in parse_collects_ranges(issues_collected, "", use_cache=True):
+        base, launch_year = split_series(r["series_name"])
+        if launch_year is None or r["is_annual"]:
+            continue
+        mid_issue = (r["start"] + r["end"]) / 2
 
-        # Look up cadence
-        series_lower = series_name.lower().strip()
-        cadence = DEFAULT_CADENCE
-        for key, cad in SERIES_CADENCE.items():
-            if key in series_lower or series_lower in key:
-                cadence = cad
-                break
+        cover_year = calendar.year(r["series_name"], int(mid_issue), dated_only=True) if use_calendar else None
+        if cover_year is not None:
+            years.append(cover_year)
+            continue
 
         # For newer volumes (launch year > 2000), issue numbers are low,
         # so launch_year + issue/cadence ≈ launch_year, which is correct
-        mid_issue = (issue_start + issue_end) / 2
-        est_year = launch_year + mid_issue / cadence
+        est_year = launch_year + mid_issue / series_cadence(base)
 
-        # Sanity check: don't go before launch year or beyond 2026
-        est_year = max(launch_year, min(est_year, 2026))
+        # Numbers that would land past LATEST_YEAR are legacy numbering
+        # ("FF (1998) #60-70, #500-524"), not a count from this launch
+        if est_year > LATEST_YEAR:
+            continue
         years.append(est_year)
 
-    # Also handle annuals with years
-    for match in ANNUAL_PATTERN.finditer(issues_collected):
-        if match.group(1):
-            years.append(float(match.group(1)))
-
     return years
 
 
@@ -141,12 +156,19 @@ def find_best_era(year: float, eras: list[dict]) -> str:
     return closest["slug"]
 
 
-def fix_era(entry: dict, eras: list[dict]) -> tuple[str, str, float | None]:
+def fix_era(entry: dict, eras: list[dict], use_calendar: bool = True,
+            use_rules: bool = True) -> tuple[str, str, float | None]:
     """Return (old_era, new_era, estimated_year) for an edition."""
     old_era = entry.get("era_slug", "")
     collects = entry.get("issues_collected", "")
 
-    pub_years = estimate_pub_years(collects)
+    # An exact-slug curated entry beats any year estimate
+    if use_rules:
+        verdict = era_rules().evaluate(entry, EXACT_PASSES)
+        if verdict.era:
+            return old_era, verdict.era, None
+
+    pub_years = estimate_pub_years(collects, use_calendar)
 
     if pub_years:
         # Use median publication year
@@ -173,13 +195,50 @@ def fix_era(entry: dict, eras: list[dict]) -> tuple[str, str, float | None]:
     return old_era, old_era, None
 
 
-def run():
+def check(eras: list[dict]):
+    """Compare fix_era on the web catalog with the original launch-year estimate.
+
+    Every edition where the two disagree is listed with its cause: an exact
+    EXPLICIT_ERA_MAP entry, or the calendar's cover dates. Nothing is written.
+    """
+    with open(EDITIONS_PATH) as f:
+        editions = json.load(f)
+
+    causes = {"explicit": [], "calendar": []}
+    for entry in editions:
+        _, baseline, _ = fix_era(entry, eras, use_calendar=False, use_rules=False)
+        _, new_era, year = fix_era(entry, eras)
+        if new_era == baseline:
+            continue
+        cause = "calendar" if year is not None else "explicit"
+        causes[cause].append((entry, baseline, new_era, year))
+
+    total = sum(len(v) for v in causes.values())
+    print(f"{len(editions)} editions: {total} differ from the launch-year estimate")
+    for cause, rows in causes.items():
+        print(f"\n{cause}: {len(rows)}")
+        for entry, baseline, new_era, year in rows:
+            kept = " (catalog)" if new_era == entry.get("era_slug") else ""
+            est = f" est. {year:.1f}" if year is not None else ""
+            print(f"  {entry['slug']}: {baseline} → {new_era}{kept}{est}")
+
+
+def run(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Phase 4b: Fix era assignments")
+    parser.add_argument("--check", action="store_true",
+                        help="Diff the web catalog against the launch-year estimate; write nothing")
+    args = parser.parse_args(argv)
+
     print("Phase 4b: Fix Era Assignments")
     print("=" * 60)
 
     eras = load_eras()
     print(f"Loaded {len(eras)} eras")
 
+    if args.check:
+        check(eras)
+        return
+
     # Load both the enriched data and the web data
     with open(ENRICHED_PATH) as f:
         enriched = json.load(f)
@@ -211,6 +270,7 @@ def run():
             unchanged += 1
 
     print(f"\nEnriched editions: {changed} changed, {unchanged} unchanged")
+    print(collects_cache().stats())
 
     # Update web editions too (find matching slugs)
     enriched_map = {e["slug"]: e["era_slug"] for e in enriched}
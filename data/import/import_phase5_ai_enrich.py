@@ -2,32 +2,43 @@
 """Phase 5: AI-generate synopses, importance levels, and connection notes.
 
 Requires ANTHROPIC_API_KEY environment variable.
-Uses Claude API in batches of 20 editions per call.
-Checkpointed every 5 batches (100 editions) — safe to restart.
+Uses Claude API in batches of 10 editions per call, several calls in flight
+at once (see data/claude_client.py for concurrency and rate limits).
+Checkpointed after every batch (append-only JSONL log) — safe to restart.
+A batch the API fails on gets heuristic fallbacks in the output but is not
+logged, so --resume retries it; the output is streamed from the log.
 
 Usage:
   python3 import_phase5_ai_enrich.py              # Full run
   python3 import_phase5_ai_enrich.py --sample 50   # Sample run (first 50)
   python3 import_phase5_ai_enrich.py --resume       # Resume from checkpoint
+  python3 import_phase5_ai_enrich.py --cache-only   # Rebuild from cached replies, no API calls
 """
 
 import argparse
 import json
 import os
 import sys
-import time
 from pathlib import Path
 
 SCRIPT_DIR = Path(__file__).parent
 WEB_DATA_DIR = SCRIPT_DIR.parent.parent / "web" / "data"
+sys.path.insert(0, str(SCRIPT_DIR.parent))
+
+from checkpoint_log import CheckpointLog, dump_json_array  # noqa: E402
+from batch_sizer import BatchSizer  # noqa: E402
+from claude_client import ClaudeClient  # noqa: E402
 
 INPUT_PATH = SCRIPT_DIR / "phase2_cleaned.json"
 EXISTING_PATH = WEB_DATA_DIR / "collected_editions.json"
 OUTPUT_PATH = SCRIPT_DIR / "phase5_enriched.json"
-CHECKPOINT_PATH = SCRIPT_DIR / "phase5_checkpoint.json"
+CHECKPOINT_PATH = SCRIPT_DIR / "phase5_checkpoint.jsonl"
+LEGACY_CHECKPOINT_PATH = SCRIPT_DIR / "phase5_checkpoint.json"
+
+BATCH_SIZE = 10  # starting size; adapted to the observed output per entry
 
-BATCH_SIZE = 10
-CHECKPOINT_EVERY = 10  # batches
+MODEL = "claude-sonnet-4-5-20250929"
+MAX_TOKENS = 8192
 
 # Heuristic importance rules (AI can override)
 def heuristic_importance(entry: dict) -> str:
@@ -97,6 +108,31 @@ EXAMPLE_EDITIONS = [
 ]
 
 
+def heuristic_fallback(entry: dict) -> dict:
+    """Placeholder synopsis and heuristic importance for an entry the API did not enrich."""
+    entry["importance"] = entry.pop("_heuristic_importance", entry.get("importance"))
+    entry["synopsis"] = f"Collects {entry.get('issues_collected', 'various issues')}."
+    entry["connection_notes"] = ""
+    return entry
+
+
+def enriched_records(entries: list[dict], records, failed: set[str]):
+    """Yield one enriched record per entry, in entry order.
+
+    Logged records are matched to entries by slug. Records logged after a
+    failure and then redone on --resume appear twice in the log; the stale
+    copy is skipped. Entries in failed (or missing from the log) get the
+    heuristic fallback.
+    """
+    records = iter(records)
+    for entry in entries:
+        if entry["slug"] in failed:
+            yield entry
+            continue
+        record = next((r for r in records if r["slug"] == entry["slug"]), None)
+        yield record if record is not None else heuristic_fallback(entry)
+
+
 def build_batch_prompt(batch: list[dict]) -> str:
     editions_text = ""
     for i, entry in enumerate(batch, 1):
@@ -134,51 +170,26 @@ Respond with a JSON array of objects, one per edition, in the same order:
 Only output the JSON array, no other text."""
 
 
-def call_claude_api(prompt: str, api_key: str) -> list[dict]:
-    """Call Claude API and parse response."""
-    try:
-        import anthropic
-    except ImportError:
-        print("ERROR: anthropic package not installed. Run: pip install anthropic")
-        sys.exit(1)
-
-    client = anthropic.Anthropic(api_key=api_key)
-
-    response = client.messages.create(
-        model="claude-sonnet-4-5-20250929",
-        max_tokens=8192,
-        system=SYSTEM_PROMPT,
-        messages=[{"role": "user", "content": prompt}],
-    )
-
-    content = response.content[0].text.strip()
-
-    # Extract JSON from response (handle markdown code blocks)
-    if content.startswith("```"):
-        content = content.split("```")[1]
-        if content.startswith("json"):
-            content = content[4:]
-    content = content.strip()
-
-    return json.loads(content)
-
-
-def run():
+def run(argv: list[str] | None = None, entries: list[dict] | None = None, save: bool = True):
     parser = argparse.ArgumentParser()
     parser.add_argument("--sample", type=int, default=0, help="Process only first N entries")
     parser.add_argument("--resume", action="store_true", help="Resume from checkpoint")
-    args = parser.parse_args()
+    parser.add_argument("--cache-only", action="store_true",
+                        help="Replay cached Claude replies only; never call the API")
+    args = parser.parse_args(argv)
 
     print("Phase 5: AI-Generate Synopses & Importance")
     print("=" * 50)
 
     api_key = os.environ.get("ANTHROPIC_API_KEY")
-    if not api_key:
+    if not api_key and not args.cache_only:
         print("ERROR: ANTHROPIC_API_KEY environment variable not set")
         sys.exit(1)
 
-    with open(INPUT_PATH) as f:
-        entries = json.load(f)
+    in_memory = entries is not None
+    if entries is None:
+        with open(INPUT_PATH) as f:
+            entries = json.load(f)
 
     # Apply heuristic importance
     for entry in entries:
@@ -191,107 +202,113 @@ def run():
 
     # Handle resume
     start_index = 0
-    enriched = []
-    if args.resume and CHECKPOINT_PATH.exists():
-        with open(CHECKPOINT_PATH) as f:
-            checkpoint = json.load(f)
-        start_index = checkpoint["processed_count"]
-        enriched = checkpoint["enriched"]
-        print(f"Resuming from checkpoint: {start_index} already processed")
+    log = CheckpointLog(CHECKPOINT_PATH, legacy=(LEGACY_CHECKPOINT_PATH, "enriched"))
+    if args.resume:
+        for _ in log.replay():
+            pass
+        start_index = log.processed
+        if start_index:
+            print(f"Resuming from checkpoint: {start_index} already processed")
+    log.open(resume=args.resume)
 
     total = len(entries)
-    batches_since_checkpoint = 0
+    sizer = BatchSizer(MAX_TOKENS, BATCH_SIZE)
+    failed = set()  # slugs given the heuristic fallback this run; retried on --resume
 
     print(f"Total entries to process: {total - start_index}")
-    print(f"Batch size: {BATCH_SIZE}")
+    print(f"Batch size: {BATCH_SIZE} to start, adapted to output size")
     print(f"Estimated API calls: {(total - start_index + BATCH_SIZE - 1) // BATCH_SIZE}")
     print()
 
-    for batch_start in range(start_index, total, BATCH_SIZE):
-        batch_end = min(batch_start + BATCH_SIZE, total)
-        batch = entries[batch_start:batch_end]
-        batch_num = batch_start // BATCH_SIZE + 1
-        total_batches = (total + BATCH_SIZE - 1) // BATCH_SIZE
+    client = ClaudeClient(api_key, MODEL, system=SYSTEM_PROMPT, max_tokens=MAX_TOKENS,
+                          cache_only=args.cache_only)
 
-        print(f"Batch {batch_num}/{total_batches} (entries {batch_start + 1}-{batch_end})...", end=" ", flush=True)
+    def handle(call):
+        batch_start, batch_end = call.start, call.end
+        batch = entries[batch_start:batch_end]
 
-        prompt = build_batch_prompt(batch)
+        print(f"Batch {call.index + 1} (entries {batch_start + 1}-{batch_end} of {total})...", end=" ")
 
-        try:
-            results = call_claude_api(prompt, api_key)
+        if call.error is None:
+            results = call.value
 
             # Apply results to entries
             for i, entry in enumerate(batch):
-                if i < len(results):
+                if i < len(results) and isinstance(results[i], dict):
                     result = results[i]
                     entry["synopsis"] = result.get("synopsis", "")
                     entry["importance"] = result.get("importance", entry["_heuristic_importance"])
                     entry["connection_notes"] = result.get("connection_notes", "")
                 else:
-                    # Fallback if API returned fewer results
+                    # Fallback if API returned fewer results (or a malformed one)
                     entry["importance"] = entry["_heuristic_importance"]
 
                 # Clean up temp field
                 del entry["_heuristic_importance"]
-                enriched.append(entry)
 
-            print(f"OK ({len(results)} results)")
+            print(f"OK ({len(results)} results, {call.timing()})")
+            log.append(batch_end, batch)
 
-        except json.JSONDecodeError as e:
-            print(f"JSON parse error: {e}")
-            # Use heuristic fallback
+        else:
+            if isinstance(call.error, json.JSONDecodeError):
+                print(f"JSON parse error: {call.error}")
+            else:
+                print(f"API error: {call.error}")
+            # Heuristic fallback for this run's output; not logged, so --resume retries it
             for entry in batch:
-                entry["importance"] = entry.pop("_heuristic_importance")
-                entry["synopsis"] = f"Collects {entry.get('issues_collected', 'various issues')}."
-                entry["connection_notes"] = ""
-                enriched.append(entry)
+                heuristic_fallback(entry)
+                failed.add(entry["slug"])
             print("Used heuristic fallback")
+            log.fail(batch_start)
+
+    # Concurrent, rate-limited calls; results are handled in entry order, and a
+    # truncated or unparseable batch is split and retried before falling back
+    client.run_batches(entries[start_index:], build_batch_prompt, handle, sizer, start=start_index,
+                       one_per_item=True)
+    print(client.stats())
+    print(sizer.stats())
+
+    # Save final output (streamed from the checkpoint log)
+    if save:
+        count = dump_json_array(enriched_records(entries, log.records(), failed), OUTPUT_PATH)
+        print(f"\nSaved: {OUTPUT_PATH}")
+        print(f"Total enriched: {count}")
+
+    # The in-memory pipeline hands the result to Phase 6; a file run leaves it on disk
+    enriched = list(enriched_records(entries, log.records(), failed)) if in_memory else None
+
+    if failed:
+        log.close()
+        print(f"{len(failed)} entries used the heuristic fallback; checkpoint kept at "
+              f"{CHECKPOINT_PATH}, re-run with --resume to retry them")
+    elif log.remove():
+        print("Checkpoint cleaned up")
+
+    return enriched
 
-        except Exception as e:
-            print(f"API error: {e}")
-            for entry in batch:
-                entry["importance"] = entry.pop("_heuristic_importance")
-                entry["synopsis"] = f"Collects {entry.get('issues_collected', 'various issues')}."
-                entry["connection_notes"] = ""
-                enriched.append(entry)
-            print("Used heuristic fallback")
 
-        batches_since_checkpoint += 1
-
-        # Checkpoint
-        if batches_since_checkpoint >= CHECKPOINT_EVERY:
-            checkpoint = {
-                "processed_count": batch_end,
-                "enriched": enriched,
-            }
-            with open(CHECKPOINT_PATH, "w") as f:
-                json.dump(checkpoint, f)
-            print(f"  [Checkpoint saved: {batch_end}/{total}]")
-            batches_since_checkpoint = 0
-
-        # Rate limiting
-        time.sleep(1)
-
-    # Handle any remaining entries that weren't in a batch (shouldn't happen but safety)
-    for entry in entries[len(enriched):]:
-        if "_heuristic_importance" in entry:
-            entry["importance"] = entry.pop("_heuristic_importance")
+def run_heuristic(entries: list[dict] | None = None, save: bool = True):
+    """Fallback when AI enrichment is skipped: placeholder synopses + heuristic importance."""
+    print("Phase 5: Heuristic Enrichment (AI skipped)")
+    print("=" * 50)
+
+    if entries is None:
+        with open(INPUT_PATH) as f:
+            entries = json.load(f)
+
+    for entry in entries:
+        if not entry.get("synopsis"):
             entry["synopsis"] = f"Collects {entry.get('issues_collected', 'various issues')}."
-            entry["connection_notes"] = ""
-            enriched.append(entry)
-
-    # Save final output
-    with open(OUTPUT_PATH, "w") as f:
-        json.dump(enriched, f, indent=2)
-    print(f"\nSaved: {OUTPUT_PATH}")
-    print(f"Total enriched: {len(enriched)}")
-
-    # Clean up checkpoint
-    if CHECKPOINT_PATH.exists():
-        CHECKPOINT_PATH.unlink()
-        print("Checkpoint cleaned up")
+        if not entry.get("importance") or entry["importance"] == "supplemental":
+            if entry["format"] in ("omnibus", "epic_collection"):
+                entry["importance"] = "recommended"
 
-    return enriched
+    if save:
+        with open(OUTPUT_PATH, "w") as f:
+            json.dump(entries, f, indent=2)
+    print(f"Heuristic enrichment applied to {len(entries)} entries")
+
+    return entries
 
 
 if __name__ == "__main__":
@@ -9,11 +9,17 @@ Generates:
 
 import json
 import re
+import sys
 from collections import defaultdict
 from pathlib import Path
 
 SCRIPT_DIR = Path(__file__).parent
-WEB_DATA_DIR = SCRIPT_DIR.parent.parent / "web" / "data"
+DATA_DIR = SCRIPT_DIR.parent
+WEB_DATA_DIR = DATA_DIR.parent / "web" / "data"
+sys.path.insert(0, str(DATA_DIR))
+
+from issue_bitsets import IssueBitsets  # noqa: E402
+from issue_ranges import issue_total  # noqa: E402
 
 INPUT_EDITIONS = SCRIPT_DIR / "phase5_enriched.json"
 INPUT_ISSUES = SCRIPT_DIR / "phase3_edition_issues.json"
@@ -24,6 +30,12 @@ OUTPUT_PATH = SCRIPT_DIR / "phase6_connections.json"
 # Volume number extraction patterns
 VOL_PATTERN = re.compile(r"vol\.?\s*(\d+)", re.IGNORECASE)
 
+# Parallel connections: minimum shared issues, and strength from
+# PARALLEL_STRENGTH (barely overlapping) up by PARALLEL_STRENGTH_RANGE (one contains the other)
+PARALLEL_MIN_SHARED = 2
+PARALLEL_STRENGTH = 5
+PARALLEL_STRENGTH_RANGE = 3
+
 
 def extract_series_prefix(slug: str) -> str:
     """Extract the series prefix from a slug (everything before vol number or format suffix)."""
@@ -89,125 +101,97 @@ def build_sequential_connections(new_editions: list[dict], all_editions: list[di
 
 
 def build_collected_in_connections(new_editions: list[dict], edition_issues: list[dict]) -> list[dict]:
-    """Build collected_in connections when an Epic Collection is a subset of an Omnibus."""
-    connections = []
-
-    # Build issue sets per edition
-    issue_sets: dict[str, set[tuple[str, int]]] = defaultdict(set)
-    slug_to_format: dict[str, str] = {}
-
-    for issue in edition_issues:
-        key = (issue["series_name"], issue["issue_number"])
-        issue_sets[issue["edition_slug"]].add(key)
-
-    # Load format info from both existing and new
-    for ed in new_editions:
-        slug_to_format[ed["slug"]] = ed["format"]
-
-    new_slugs = {e["slug"] for e in new_editions}
-
-    # Check for subset relationships
-    slugs_with_issues = [s for s in issue_sets if len(issue_sets[s]) >= 3]
-
-    for i, slug_a in enumerate(slugs_with_issues):
-        fmt_a = slug_to_format.get(slug_a, "")
-        issues_a = issue_sets[slug_a]
-        if len(issues_a) < 3:
-            continue
-
-        for slug_b in slugs_with_issues[i + 1:]:
-            fmt_b = slug_to_format.get(slug_b, "")
-            issues_b = issue_sets[slug_b]
-
-            # Only connect if at least one is new
+    """Build collected_in connections when an Epic Collection is a subset of an Omnibus.
+
+    edition_issues may be per-issue records or ranges. Issues compare on
+    (series, number). Instead of testing every pair, each edition asks the
+    issue bitsets for its supersets: the editions in the posting lists of its
+    rarest issues, checked exactly for containment. The work grows with how
+    many editions hold those rare issues, not n^2.
+    """
+    index = IssueBitsets(edition_issues, match_annual=False)
+    slug_to_format = {ed["slug"]: ed["format"] for ed in new_editions}
+    new_slugs = set(slug_to_format)
+
+    counts = {s: index.issue_count(s) for s in index.editions()}
+    slugs_with_issues = [s for s in counts if counts[s] >= 3]
+    position = {s: i for i, s in enumerate(slugs_with_issues)}
+
+    found = []  # (pair position, connection): same order as the old pairwise scan
+    for slug_a in slugs_with_issues:
+        for slug_b in index.supersets(slug_a):
+            # Strict subset of an omnibus, with at least one side new
+            if counts[slug_b] <= counts[slug_a] or slug_to_format.get(slug_b) != "omnibus":
+                continue
             if slug_a not in new_slugs and slug_b not in new_slugs:
                 continue
+            pair = sorted((position[slug_a], position[slug_b]))
+            found.append((pair, {
+                "source_type": "edition",
+                "source_slug": slug_a,
+                "target_type": "edition",
+                "target_slug": slug_b,
+                "connection_type": "collected_in",
+                "strength": 5,
+                "confidence": 90,
+                "interpretation": "official",
+                "description": f"{slug_a} issues are collected in omnibus {slug_b}",
+            }))
 
-            # Check if one is subset of the other
-            if issues_a < issues_b and fmt_b == "omnibus":
-                # A is collected in B (omnibus)
-                connections.append({
-                    "source_type": "edition",
-                    "source_slug": slug_a,
-                    "target_type": "edition",
-                    "target_slug": slug_b,
-                    "connection_type": "collected_in",
-                    "strength": 5,
-                    "confidence": 90,
-                    "interpretation": "official",
-                    "description": f"{slug_a} issues are collected in omnibus {slug_b}",
-                })
-            elif issues_b < issues_a and fmt_a == "omnibus":
-                connections.append({
-                    "source_type": "edition",
-                    "source_slug": slug_b,
-                    "target_type": "edition",
-                    "target_slug": slug_a,
-                    "connection_type": "collected_in",
-                    "strength": 5,
-                    "confidence": 90,
-                    "interpretation": "official",
-                    "description": f"{slug_b} issues are collected in omnibus {slug_a}",
-                })
-
-    return connections
+    found.sort(key=lambda f: f[0])
+    return [conn for _, conn in found]
 
 
 def build_parallel_connections(new_editions: list[dict], edition_issues: list[dict]) -> list[dict]:
-    """Build parallel connections between editions sharing crossover issues."""
-    connections = []
+    """Build parallel connections between editions sharing crossover issues.
 
-    # Build issue-to-editions map
-    issue_to_editions: dict[tuple[str, int], list[str]] = defaultdict(list)
-    for issue in edition_issues:
-        key = (issue["series_name"], issue["issue_number"])
-        issue_to_editions[key].append(issue["edition_slug"])
+    Pairs need PARALLEL_MIN_SHARED issues in common, one side new; strength
+    grows with the share of the smaller edition's issues that overlap.
+    edition_issues may be per-issue records or ranges.
+    """
+    index = IssueBitsets(edition_issues, match_annual=False)
+    new_slugs = [e["slug"] for e in new_editions if e["slug"] in index.bits]
+    counts = {}
 
-    new_slugs = {e["slug"] for e in new_editions}
-
-    # Find pairs that share issues across different series
-    seen_pairs = set()
-    for editions in issue_to_editions.values():
-        if len(editions) < 2:
-            continue
-        for i, slug_a in enumerate(editions):
-            for slug_b in editions[i + 1:]:
-                if slug_a == slug_b:
-                    continue
-                pair = tuple(sorted([slug_a, slug_b]))
-                if pair in seen_pairs:
-                    continue
-                if slug_a not in new_slugs and slug_b not in new_slugs:
-                    continue
-                seen_pairs.add(pair)
-                connections.append({
-                    "source_type": "edition",
-                    "source_slug": pair[0],
-                    "target_type": "edition",
-                    "target_slug": pair[1],
-                    "connection_type": "parallel",
-                    "strength": 6,
-                    "confidence": 85,
-                    "interpretation": "official",
-                    "description": f"Shared crossover issues between {pair[0]} and {pair[1]}",
-                })
+    connections = []
+    for (slug_a, slug_b), shared in index.shared_pairs(new_slugs, PARALLEL_MIN_SHARED).items():
+        for slug in (slug_a, slug_b):
+            if slug not in counts:
+                counts[slug] = index.issue_count(slug)
+        overlap = shared / min(counts[slug_a], counts[slug_b])
+        connections.append({
+            "source_type": "edition",
+            "source_slug": slug_a,
+            "target_type": "edition",
+            "target_slug": slug_b,
+            "connection_type": "parallel",
+            "strength": PARALLEL_STRENGTH + round(PARALLEL_STRENGTH_RANGE * overlap),
+            "confidence": 85,
+            "interpretation": "official",
+            "description": f"{shared} shared crossover issues between {slug_a} and {slug_b}",
+        })
 
     return connections
 
 
-def run():
+def run(new_editions: list[dict] | None = None, new_issues: list[dict] | None = None,
+        existing_editions: list[dict] | None = None, save: bool = True):
+    """Run Phase 6. Pipeline objects passed in skip the corresponding file loads."""
     print("Phase 6: Auto-Generate Connections")
     print("=" * 50)
 
     # Load data
-    with open(INPUT_EDITIONS) as f:
-        new_editions = json.load(f)
-    with open(EXISTING_EDITIONS_PATH) as f:
-        existing_editions = json.load(f)
+    if new_editions is None:
+        with open(INPUT_EDITIONS) as f:
+            new_editions = json.load(f)
+    if existing_editions is None:
+        with open(EXISTING_EDITIONS_PATH) as f:
+            existing_editions = json.load(f)
     with open(EXISTING_CONNECTIONS_PATH) as f:
         existing_connections = json.load(f)
-    with open(INPUT_ISSUES) as f:
-        new_issues = json.load(f)
+    if new_issues is None:
+        with open(INPUT_ISSUES) as f:
+            new_issues = json.load(f)
 
     # Also load existing issues for cross-reference
     existing_issues_path = WEB_DATA_DIR / "edition_issues.json"
@@ -232,7 +216,7 @@ def run():
 
     print(f"New editions: {len(new_editions)}")
     print(f"Existing connections: {len(existing_connections)}")
-    print(f"All issues for cross-ref: {len(all_issues)}")
+    print(f"All issues for cross-ref: {issue_total(all_issues)}")
 
     # Generate connections
     sequential = build_sequential_connections(new_editions, all_editions)
@@ -270,9 +254,10 @@ def run():
 
     print(f"Valid new connections: {len(valid)}")
 
-    with open(OUTPUT_PATH, "w") as f:
-        json.dump(valid, f, indent=2)
-    print(f"Saved: {OUTPUT_PATH}")
+    if save:
+        with open(OUTPUT_PATH, "w") as f:
+            json.dump(valid, f, indent=2)
+        print(f"Saved: {OUTPUT_PATH}")
 
     return valid
 
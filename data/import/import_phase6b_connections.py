@@ -7,38 +7,55 @@ Uses Claude API to generate the missing connection types:
 - prerequisite: must-read-first dependencies
 - spin_off: character/series spin-offs
 
-Sends batches of 15 editions with a full slug reference list.
-Checkpointed every 10 batches. Safe to restart with --resume.
+Sends batches of ~15 editions (sized to the output, see batch_sizer.py), each
+with the candidate editions most related to that batch (shared issues,
+creators, characters, graph proximity) up to a token budget. The candidates chosen for each batch are logged to logs/phase6b_context.jsonl.
+Checkpointed after every batch (append-only JSONL log). Safe to restart with --resume.
 
 Usage:
   python3 import_phase6b_connections.py
   python3 import_phase6b_connections.py --resume
   python3 import_phase6b_connections.py --sample 30  # First 30 editions only
+  python3 import_phase6b_connections.py --cache-only  # Rebuild from cached replies, no API calls
+  python3 import_phase6b_connections.py --context-budget 5000  # Larger candidate list per batch
 """
 
 import argparse
 import json
 import os
 import sys
-import time
+from itertools import chain
 from pathlib import Path
 
 SCRIPT_DIR = Path(__file__).parent
 WEB_DATA_DIR = SCRIPT_DIR.parent.parent / "web" / "data"
+sys.path.insert(0, str(SCRIPT_DIR.parent))
+
+from checkpoint_log import CheckpointLog, dump_json_array  # noqa: E402
+from batch_sizer import BatchSizer  # noqa: E402
+from claude_client import ClaudeClient, estimate_tokens  # noqa: E402
+from context_selector import ContextSelector  # noqa: E402
 
 EDITIONS_PATH = WEB_DATA_DIR / "collected_editions.json"
 CONNECTIONS_PATH = WEB_DATA_DIR / "connections.json"
+CHARACTERS_PATH = WEB_DATA_DIR / "characters.json"
+ERAS_PATH = WEB_DATA_DIR / "eras.json"
 ENRICHED_PATH = SCRIPT_DIR / "phase5_enriched.json"
 OUTPUT_PATH = SCRIPT_DIR / "phase6b_connections.json"
-CHECKPOINT_PATH = SCRIPT_DIR / "phase6b_checkpoint.json"
+CHECKPOINT_PATH = SCRIPT_DIR / "phase6b_checkpoint.jsonl"
+LEGACY_CHECKPOINT_PATH = SCRIPT_DIR / "phase6b_checkpoint.json"
+CONTEXT_LOG_PATH = SCRIPT_DIR / "logs" / "phase6b_context.jsonl"
+
+BATCH_SIZE = 15  # starting size; adapted to the observed output per edition
+CONTEXT_TOKEN_BUDGET = 3000  # candidate list per batch (the full slug list was ~14K tokens)
 
-BATCH_SIZE = 15
-CHECKPOINT_EVERY = 10  # batches
+MODEL = "claude-sonnet-4-5-20250929"
+MAX_TOKENS = 4096
 
 
 SYSTEM_PROMPT = """You are a Marvel Comics chronology expert building a reading graph.
 Given a batch of collected editions, identify semantic connections between them and to
-other editions in the reference list.
+other editions in the candidate list.
 
 Connection types to generate:
 1. recommended_after (strength 6-7, confidence 80) — "if you enjoyed X, read Y next"
@@ -63,7 +80,7 @@ Connection types to generate:
 Rules:
 - Only generate connections where you're confident the relationship exists
 - source_slug is the edition you'd read FIRST, target_slug is what follows
-- Both slugs MUST come from the reference list — never invent slugs
+- Both slugs MUST come from the candidate list — never invent slugs
 - Don't duplicate leads_to connections (those are handled by sequential volume detection)
 - Focus on CROSS-SERIES connections, not sequential volumes of the same run
 - For each batch edition, try to find 1-3 outgoing connections
@@ -80,52 +97,7 @@ Examples of good connections:
 """
 
 
-def build_reference_list(all_editions: list[dict]) -> str:
-    """Build a compressed slug-only reference list to minimize token usage.
-
-    The full slug|title|era format was ~260K chars (~65K tokens), exceeding
-    rate limits. Slug-only is ~55K chars (~14K tokens).
-    """
-    return "\n".join(ed["slug"] for ed in all_editions)
-
-
-def build_era_context(batch: list[dict], all_editions: list[dict]) -> str:
-    """Build a focused context list of editions from same/adjacent eras.
-
-    Instead of sending all 2778 slugs with titles, send detailed info only
-    for the ~200-400 editions most likely to be connected to this batch.
-    """
-    # Get eras represented in this batch
-    batch_eras = {ed.get("era_slug", "") for ed in batch}
-
-    # Load era ordering
-    era_order = [
-        "birth-of-marvel", "the-expansion", "bronze-age", "rise-of-x-men",
-        "event-age", "speculation-crash", "heroes-reborn-return",
-        "marvel-knights-ultimate", "bendis-avengers", "hickman-saga",
-        "all-new-all-different", "dawn-of-krakoa", "blood-hunt-doom",
-        "current-ongoings"
-    ]
-    era_idx = {e: i for i, e in enumerate(era_order)}
-
-    # Include adjacent eras (+/- 1)
-    target_eras = set()
-    for era in batch_eras:
-        idx = era_idx.get(era, 7)
-        for offset in [-1, 0, 1]:
-            adj_idx = max(0, min(len(era_order) - 1, idx + offset))
-            target_eras.add(era_order[adj_idx])
-
-    # Build focused context: slug|title for editions in target eras
-    lines = []
-    for ed in all_editions:
-        if ed.get("era_slug") in target_eras:
-            lines.append(f"{ed['slug']}|{ed['title'][:50]}")
-
-    return "\n".join(lines)
-
-
-def build_batch_prompt(batch: list[dict], ref_list: str) -> str:
+def build_batch_prompt(batch: list[dict], context: str) -> str:
     editions_text = ""
     for i, ed in enumerate(batch, 1):
         editions_text += f"\n--- Edition {i} ---\n"
@@ -147,8 +119,8 @@ Do NOT generate leads_to connections (those exist already for sequential volumes
 EDITIONS TO PROCESS:
 {editions_text}
 
-VALID EDITION SLUGS (one per line — both source and target must be from this list):
-{ref_list}
+CANDIDATE EDITIONS (slug|title, most related first — both source and target slugs must come from this list):
+{context}
 
 Respond with a JSON array:
 [{{"source_slug":"...","target_slug":"...","connection_type":"recommended_after|ties_into|prerequisite|spin_off","strength":5,"confidence":80,"description":"..."}}]
@@ -156,46 +128,21 @@ Respond with a JSON array:
 Only output JSON. If no connections, output []."""
 
 
-def call_claude_api(prompt: str, api_key: str) -> list[dict]:
-    """Call Claude API and parse response."""
-    try:
-        import anthropic
-    except ImportError:
-        print("ERROR: anthropic package not installed. Run: pip install anthropic")
-        sys.exit(1)
-
-    client = anthropic.Anthropic(api_key=api_key)
-
-    response = client.messages.create(
-        model="claude-sonnet-4-5-20250929",
-        max_tokens=4096,
-        system=SYSTEM_PROMPT,
-        messages=[{"role": "user", "content": prompt}],
-    )
-
-    content = response.content[0].text.strip()
-
-    # Extract JSON from response
-    if content.startswith("```"):
-        content = content.split("```")[1]
-        if content.startswith("json"):
-            content = content[4:]
-    content = content.strip()
-
-    return json.loads(content)
-
-
 def run():
     parser = argparse.ArgumentParser()
     parser.add_argument("--sample", type=int, default=0, help="Process only first N editions")
     parser.add_argument("--resume", action="store_true", help="Resume from checkpoint")
+    parser.add_argument("--cache-only", action="store_true",
+                        help="Replay cached Claude replies only; never call the API")
+    parser.add_argument("--context-budget", type=int, default=CONTEXT_TOKEN_BUDGET,
+                        help="Token budget for each batch's candidate edition list")
     args = parser.parse_args()
 
     print("Phase 6b: AI-Generate Semantic Connections")
     print("=" * 60)
 
     api_key = os.environ.get("ANTHROPIC_API_KEY")
-    if not api_key:
+    if not api_key and not args.cache_only:
         print("ERROR: ANTHROPIC_API_KEY environment variable not set")
         sys.exit(1)
 
@@ -218,10 +165,16 @@ def run():
         existing_keys.add(key)
     print(f"Existing connections: {len(existing_connections)}")
 
-    # Build reference list (slug-only to minimize tokens)
+    # Rank candidate editions per batch instead of sending the whole catalog
     all_slugs = {ed["slug"] for ed in all_editions}
-    ref_list = build_reference_list(all_editions)
-    print(f"Reference list: {len(all_slugs)} slugs, {len(ref_list)} chars (~{len(ref_list)//4} tokens)")
+    with open(CHARACTERS_PATH) as f:
+        characters = json.load(f)
+    with open(ERAS_PATH) as f:
+        era_order = [e["slug"] for e in sorted(json.load(f), key=lambda e: e["number"])]
+    selector = ContextSelector(all_editions, existing_connections, characters, era_order)
+    full_list_tokens = sum(len(slug) + 1 for slug in all_slugs) // 4
+    print(f"Context: up to {args.context_budget} tokens per batch "
+          f"(full slug list would be ~{full_list_tokens} tokens)")
 
     # Handle sample mode
     if args.sample:
@@ -230,41 +183,56 @@ def run():
 
     # Handle resume
     start_index = 0
-    new_connections = []
-    if args.resume and CHECKPOINT_PATH.exists():
-        with open(CHECKPOINT_PATH) as f:
-            checkpoint = json.load(f)
-        start_index = checkpoint["processed_count"]
-        new_connections = checkpoint["connections"]
+    # New connections live in the checkpoint log, not in memory; only counts are kept
+    new_count = 0
+    type_counts = {}
+    log = CheckpointLog(CHECKPOINT_PATH, legacy=(LEGACY_CHECKPOINT_PATH, "connections"))
+    if args.resume:
         # Add checkpoint connections to existing keys
-        for c in new_connections:
+        for c in log.replay():
+            new_count += 1
+            type_counts[c["connection_type"]] = type_counts.get(c["connection_type"], 0) + 1
             key = (c["source_slug"], c["target_slug"], c["connection_type"])
             existing_keys.add(key)
-        print(f"Resuming from checkpoint: {start_index} already processed, {len(new_connections)} connections found")
+        start_index = log.processed
+        print(f"Resuming from checkpoint: {start_index} already processed, {new_count} connections found")
+    log.open(resume=args.resume)
 
     total = len(new_editions)
-    total_batches = (total - start_index + BATCH_SIZE - 1) // BATCH_SIZE
-    batches_since_checkpoint = 0
+    est_batches = (total - start_index + BATCH_SIZE - 1) // BATCH_SIZE
+    sizer = BatchSizer(MAX_TOKENS, BATCH_SIZE)
     api_errors = 0
 
-    print(f"\nBatches remaining: {total_batches}")
-    print(f"Estimated time: ~{total_batches * 10}s ({total_batches * 10 / 60:.0f} min)")
+    client = ClaudeClient(api_key, MODEL, system=SYSTEM_PROMPT, max_tokens=MAX_TOKENS,
+                          cache_only=args.cache_only)
+    # The tokens/minute bucket is the binding limit; every prompt carries about a full context budget
+    est_minutes = est_batches * (estimate_tokens(SYSTEM_PROMPT) + args.context_budget + 1500) / client.tokens_per_minute
+
+    print(f"\nBatches remaining: ~{est_batches} ({BATCH_SIZE} editions to start, adapted to output size)")
+    print(f"Estimated time: ~{est_minutes:.0f} min at {client.tokens_per_minute} input tokens/min")
     print()
 
-    for batch_start in range(start_index, total, BATCH_SIZE):
-        batch_end = min(batch_start + BATCH_SIZE, total)
-        batch = new_editions[batch_start:batch_end]
-        batch_num = (batch_start - start_index) // BATCH_SIZE + 1
+    context_tokens = []
+    CONTEXT_LOG_PATH.parent.mkdir(exist_ok=True)
+    context_log = open(CONTEXT_LOG_PATH, "a" if args.resume else "w")
+
+    def batch_prompt(batch):
+        selection = selector.select(batch, args.context_budget)
+        context_tokens.append(selection.tokens)
+        context_log.write(json.dumps(selection.record(batch, args.context_budget)) + "\n")
+        return build_batch_prompt(batch, selection.text)
 
-        print(f"Batch {batch_num}/{total_batches} (editions {batch_start + 1}-{batch_end})...", end=" ", flush=True)
+    def handle(call):
+        nonlocal new_count, api_errors
+        batch_start, batch_end = call.start, call.end
 
-        prompt = build_batch_prompt(batch, ref_list)
+        print(f"Batch {call.index + 1} (editions {batch_start + 1}-{batch_end} of {total})...", end=" ")
 
-        try:
-            results = call_claude_api(prompt, api_key)
+        if call.error is None:
+            results = [r for r in call.value if isinstance(r, dict)]  # None = malformed element
 
             # Validate and deduplicate results
-            valid = 0
+            batch_connections = []
             for conn in results:
                 src = conn.get("source_slug", "")
                 tgt = conn.get("target_slug", "")
@@ -286,7 +254,7 @@ def run():
                     continue
                 existing_keys.add(key)
 
-                new_connections.append({
+                batch_connections.append({
                     "source_type": "edition",
                     "source_slug": src,
                     "target_type": "edition",
@@ -296,108 +264,60 @@ def run():
                     "confidence": conn.get("confidence", 80),
                     "description": conn.get("description", "")[:100],
                 })
-                valid += 1
+                type_counts[ctype] = type_counts.get(ctype, 0) + 1
 
-            print(f"OK ({valid} new connections from {len(results)} results)")
+            new_count += len(batch_connections)
+            log.append(batch_end, batch_connections)
+            print(f"OK ({len(batch_connections)} new connections from {len(results)} results, {call.timing()})")
 
-        except json.JSONDecodeError as e:
+        elif isinstance(call.error, json.JSONDecodeError):
             api_errors += 1
-            print(f"JSON parse error: {e}")
-
-        except Exception as e:
-            err_str = str(e)
-            if "rate_limit" in err_str or "429" in err_str:
-                # Rate limit — wait and retry once
-                print(f"Rate limited, waiting 60s...")
-                time.sleep(60)
-                try:
-                    era_context = build_era_context(batch, all_editions)
-                    prompt = build_batch_prompt(batch, ref_list, era_context)
-                    results = call_claude_api(prompt, api_key)
-                    valid = 0
-                    for conn in results:
-                        src = conn.get("source_slug", "")
-                        tgt = conn.get("target_slug", "")
-                        ctype = conn.get("connection_type", "")
-                        if src not in all_slugs or tgt not in all_slugs:
-                            continue
-                        if ctype not in ("recommended_after", "ties_into", "prerequisite", "spin_off"):
-                            continue
-                        if src == tgt:
-                            continue
-                        key = (src, tgt, ctype)
-                        if key in existing_keys:
-                            continue
-                        existing_keys.add(key)
-                        new_connections.append({
-                            "source_type": "edition",
-                            "source_slug": src,
-                            "target_type": "edition",
-                            "target_slug": tgt,
-                            "connection_type": ctype,
-                            "strength": conn.get("strength", 6),
-                            "confidence": conn.get("confidence", 80),
-                            "description": conn.get("description", "")[:100],
-                        })
-                        valid += 1
-                    print(f"Retry OK ({valid} new connections)")
-                except Exception as e2:
-                    api_errors += 1
-                    print(f"Retry failed: {e2}")
-            else:
-                api_errors += 1
-                print(f"API error: {e}")
+            print(f"JSON parse error: {call.error}")
+            log.fail(batch_start)  # retried on --resume
 
+        else:
+            # Rate limits and transient errors were already retried by the client
+            api_errors += 1
+            print(f"API error: {call.error}")
+
+            log.fail(batch_start)  # retried on --resume
             if api_errors > 10:
                 print("\nToo many errors, stopping.")
-                break
-
-        batches_since_checkpoint += 1
-
-        # Checkpoint
-        if batches_since_checkpoint >= CHECKPOINT_EVERY:
-            checkpoint = {
-                "processed_count": batch_end,
-                "connections": new_connections,
-            }
-            with open(CHECKPOINT_PATH, "w") as f:
-                json.dump(checkpoint, f)
-            print(f"  [Checkpoint: {batch_end}/{total}, {len(new_connections)} connections so far]")
-            batches_since_checkpoint = 0
-
-        # Rate limiting — respect 30K tokens/min limit
-        # Each request is ~20K tokens, so wait ~45s between requests
-        time.sleep(45)
-
-    # Connection type distribution
-    type_counts = {}
-    for c in new_connections:
-        t = c["connection_type"]
-        type_counts[t] = type_counts.get(t, 0) + 1
+                return True
+
+    # Concurrent calls within the requests/tokens-per-minute limits, handled in edition order;
+    # a truncated or unparseable batch is split and retried
+    stopped = client.run_batches(new_editions[start_index:], batch_prompt, handle, sizer, start=start_index)
+    context_log.close()
+    print(client.stats())
+    print(sizer.stats())
+    if stopped:
+        log.close()
+        print(f"Checkpoint kept at {CHECKPOINT_PATH}; re-run with --resume")
+        return
+    if context_tokens:
+        print(f"Context: avg {sum(context_tokens) // len(context_tokens)} tokens per prompt, "
+              f"selections logged to {CONTEXT_LOG_PATH}")
 
     print(f"\n{'=' * 60}")
     print(f"RESULTS")
     print(f"{'=' * 60}")
-    print(f"New connections generated: {len(new_connections)}")
+    print(f"New connections generated: {new_count}")
     print(f"API errors: {api_errors}")
     print(f"\nBy type:")
     for t, count in sorted(type_counts.items(), key=lambda x: -x[1]):
         print(f"  {t}: {count}")
 
-    # Save new connections to separate file
-    with open(OUTPUT_PATH, "w") as f:
-        json.dump(new_connections, f, indent=2)
+    # Save new connections to separate file (streamed from the checkpoint log)
+    dump_json_array(log.records(), OUTPUT_PATH)
     print(f"\nSaved: {OUTPUT_PATH}")
 
     # Merge into main connections.json
-    merged = existing_connections + new_connections
-    with open(CONNECTIONS_PATH, "w") as f:
-        json.dump(merged, f, indent=2)
-    print(f"Merged into: {CONNECTIONS_PATH} ({len(merged)} total)")
+    merged = dump_json_array(chain(existing_connections, log.records()), CONNECTIONS_PATH)
+    print(f"Merged into: {CONNECTIONS_PATH} ({merged} total)")
 
     # Clean up checkpoint
-    if CHECKPOINT_PATH.exists():
-        CHECKPOINT_PATH.unlink()
+    if log.remove():
         print("Checkpoint cleaned up")
 
 
@@ -24,6 +24,10 @@ from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 SCRIPT_DIR = Path(__file__).parent
+sys.path.insert(0, str(SCRIPT_DIR.parent))
+
+from isbn_index import clean_isbn, isbn13_to_isbn10  # noqa: E402
+
 INPUT_PATH = SCRIPT_DIR / "phase5_enriched.json"
 OUTPUT_PATH = INPUT_PATH  # Updates in-place
 PROGRESS_PATH = SCRIPT_DIR / "phase7_progress.json"
@@ -32,16 +36,6 @@ SAVE_EVERY = 50
 HEADERS = {"User-Agent": "MarvelCartographer/1.0 (comic-chronology-app)"}
 
 
-def isbn13_to_isbn10(isbn13: str) -> str | None:
-    """Convert ISBN-13 to ISBN-10."""
-    if not isbn13 or len(isbn13) != 13 or not isbn13.startswith("978"):
-        return None
-    body = isbn13[3:12]  # 9 digits
-    total = sum(int(d) * (10 - i) for i, d in enumerate(body))
-    check = (11 - (total % 11)) % 11
-    return body + ("X" if check == 10 else str(check))
-
-
 def head_check(url: str, min_size: int = 1000) -> bool:
     """HEAD request to verify URL returns a real image (not a placeholder)."""
     try:
@@ -144,7 +138,7 @@ def try_open_library_isbn(isbn: str) -> str | None:
 # ---------------------------------------------------------------------------
 def find_cover(entry: dict) -> tuple[str | None, str]:
     """Try all sources for a cover. Returns (url, source_name)."""
-    isbn = (entry.get("isbn") or "").strip()
+    isbn = clean_isbn(entry.get("isbn"))
     title = entry.get("title", "")
 
     # Source 1: Amazon direct (fastest, no rate limit)
@@ -170,17 +164,20 @@ def find_cover(entry: dict) -> tuple[str | None, str]:
     return None, "miss"
 
 
-def run():
+def run(argv: list[str] | None = None, entries: list[dict] | None = None, save: bool = True):
+    """Run Phase 7. With save=False the entries are only updated in memory:
+    no periodic rewrites of phase5_enriched.json, so --resume is unavailable."""
     parser = argparse.ArgumentParser()
     parser.add_argument("--sample", type=int, default=0)
     parser.add_argument("--resume", action="store_true")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     print("Phase 7: Fetch Cover Images (Multi-Source)")
     print("=" * 50)
 
-    with open(INPUT_PATH) as f:
-        entries = json.load(f)
+    if entries is None:
+        with open(INPUT_PATH) as f:
+            entries = json.load(f)
 
     # Resume support
     start_index = 0
@@ -224,7 +221,7 @@ def run():
             print("✗")
 
         # Save progress periodically
-        if (i + 1) % SAVE_EVERY == 0:
+        if save and (i + 1) % SAVE_EVERY == 0:
             with open(OUTPUT_PATH, "w") as f:
                 json.dump(entries, f, indent=2)
             with open(PROGRESS_PATH, "w") as f:
@@ -234,9 +231,10 @@ def run():
             print(f"  [Saved: {i + 1}/{total}, coverage: {coverage:.0f}%]")
 
     # Final save
-    with open(OUTPUT_PATH, "w") as f:
-        json.dump(entries, f, indent=2)
-    print(f"\nSaved: {OUTPUT_PATH}")
+    if save:
+        with open(OUTPUT_PATH, "w") as f:
+            json.dump(entries, f, indent=2)
+        print(f"\nSaved: {OUTPUT_PATH}")
 
     total_processed = total - start_index - skipped
     coverage = found / total_processed * 100 if total_processed > 0 else 0
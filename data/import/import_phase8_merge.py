@@ -4,11 +4,17 @@
 import json
 import os
 import shutil
+import sys
 from collections import Counter
 from pathlib import Path
 
 SCRIPT_DIR = Path(__file__).parent
 DATA_DIR = SCRIPT_DIR.parent
+sys.path.insert(0, str(DATA_DIR))
+
+from isbn_index import IsbnIndex  # noqa: E402
+from issue_ranges import expand_ranges  # noqa: E402
+
 WEB_DATA_DIR = DATA_DIR.parent / "web" / "data"
 ARCHIVE_DIR = DATA_DIR / "archive"
 
@@ -17,6 +23,8 @@ NEW_EDITIONS_PATH = SCRIPT_DIR / "phase5_enriched.json"
 NEW_ISSUES_PATH = SCRIPT_DIR / "phase3_edition_issues.json"
 NEW_CONNECTIONS_PATH = SCRIPT_DIR / "phase6_connections.json"
 ISBN_BACKFILL_PATH = SCRIPT_DIR / "phase1_isbn_backfill.json"
+DELTA_PENDING_PATH = SCRIPT_DIR / "phase1_delta_pending.json"
+DELTA_STATE_PATH = SCRIPT_DIR / "import_delta_state.json"
 
 # Existing data files
 EXISTING_EDITIONS_PATH = WEB_DATA_DIR / "collected_editions.json"
@@ -71,6 +79,15 @@ def check_duplicate_slugs(editions: list[dict]) -> list[str]:
     return [f"Duplicate slug: {slug} ({count}x)" for slug, count in counts.items() if count > 1]
 
 
+def check_duplicate_isbns(editions: list[dict]) -> list[str]:
+    """Check for editions sharing an ISBN (compared as canonical ISBN-13)."""
+    duplicates = IsbnIndex.from_records(editions, "isbn").duplicates()
+    return [
+        f"Duplicate ISBN: {isbn} ({', '.join(e['slug'] for e in group)})"
+        for isbn, group in duplicates.items()
+    ]
+
+
 def validate_connections(connections: list[dict], valid_slugs: set[str]) -> list[str]:
     """Validate all connection slugs exist."""
     errors = []
@@ -102,17 +119,21 @@ def apply_isbn_backfill(editions: list[dict], backfills: list[dict]) -> int:
     return count
 
 
-def run():
+def run(new_editions: list[dict] | None = None, new_issues: list[dict] | None = None,
+        new_connections: list[dict] | None = None, existing_editions: list[dict] | None = None):
+    """Run Phase 8. Pipeline objects passed in skip reading the phase output files."""
     print("Phase 8: Merge & Validate")
     print("=" * 50)
 
     report = {}
 
     # Load all data
-    with open(EXISTING_EDITIONS_PATH) as f:
-        existing_editions = json.load(f)
-    with open(NEW_EDITIONS_PATH) as f:
-        new_editions = json.load(f)
+    if existing_editions is None:
+        with open(EXISTING_EDITIONS_PATH) as f:
+            existing_editions = json.load(f)
+    if new_editions is None:
+        with open(NEW_EDITIONS_PATH) as f:
+            new_editions = json.load(f)
 
     print(f"Existing editions: {len(existing_editions)}")
     print(f"New editions: {len(new_editions)}")
@@ -120,20 +141,22 @@ def run():
     # Load connections
     with open(EXISTING_CONNECTIONS_PATH) as f:
         existing_connections = json.load(f)
-    if NEW_CONNECTIONS_PATH.exists():
-        with open(NEW_CONNECTIONS_PATH) as f:
-            new_connections = json.load(f)
-    else:
-        new_connections = []
+    if new_connections is None:
+        if NEW_CONNECTIONS_PATH.exists():
+            with open(NEW_CONNECTIONS_PATH) as f:
+                new_connections = json.load(f)
+        else:
+            new_connections = []
 
     # Load issues
     with open(EXISTING_ISSUES_PATH) as f:
         existing_issues = json.load(f)
-    if NEW_ISSUES_PATH.exists():
-        with open(NEW_ISSUES_PATH) as f:
-            new_issues = json.load(f)
-    else:
-        new_issues = []
+    if new_issues is None:
+        if NEW_ISSUES_PATH.exists():
+            with open(NEW_ISSUES_PATH) as f:
+                new_issues = json.load(f)
+        else:
+            new_issues = []
 
     # Load backfills
     if ISBN_BACKFILL_PATH.exists():
@@ -167,6 +190,13 @@ def run():
             print(f"  {err}")
     else:
         print("Slug uniqueness: PASSED")
+    isbn_errors = check_duplicate_isbns(merged_editions)
+    if isbn_errors:
+        print(f"Duplicate ISBN warnings: {len(isbn_errors)}")
+        for err in isbn_errors[:5]:
+            print(f"  {err}")
+    else:
+        print("ISBN uniqueness: PASSED")
 
     # Step 4: Validate connections
     all_slugs = {e["slug"] for e in merged_editions}
@@ -184,7 +214,8 @@ def run():
     else:
         print("Connection validation: PASSED")
 
-    # Step 5: Merge issues
+    # Step 5: Merge issues (Phase 3 ranges → one row per issue for the published file)
+    new_issues = expand_ranges(new_issues)
     merged_issues = existing_issues + new_issues
 
     # Step 6: Save merged files
@@ -208,6 +239,11 @@ def run():
     shutil.copy2(EXISTING_CONNECTIONS_PATH, ARCHIVE_DIR / "connections.json")
     print(f"Copied to archive: {ARCHIVE_DIR}")
 
+    # Step 8: Advance the delta-import watermark now that the merge is on disk
+    if DELTA_PENDING_PATH.exists():
+        shutil.copyfile(DELTA_PENDING_PATH, DELTA_STATE_PATH)
+        print(f"Delta state committed: {DELTA_STATE_PATH}")
+
     # Report
     report = {
         "existing_editions": len(existing_editions),
@@ -222,6 +258,7 @@ def run():
         "isbn_backfills_applied": backfill_count,
         "edition_validation_errors": len(edition_errors),
         "slug_collision_errors": len(slug_errors),
+        "duplicate_isbn_warnings": len(isbn_errors),
         "connection_validation_errors": len(conn_errors),
         "status": "SUCCESS" if not slug_errors else "WARNINGS",
     }
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Phase 8b: Precompute every pair of editions that share issues.
+
+The Issue Overlap Detector's find_edition_overlaps() used to self-join
+edition_issues on (series_name, issue_number, is_annual) on every request.
+This phase computes every edition pair with at least one shared issue from
+the merged edition_issues.json once, as issue bitsets (data/issue_bitsets.py),
+and writes a compact shard for scripts/seed-edition-overlaps.mjs to load into
+the edition_overlaps table (migration 021):
+
+  {"editions": [slug, ...],                     sorted
+   "series":   [series_name, ...],              sorted
+   "pairs":    [[a, b, shared, [[series, annual, start, end], ...]], ...]}
+
+a < b index editions, series indexes series, annual is 0/1, and each pair's
+shared issues are listed as runs (start..end inclusive).
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+DATA_DIR = SCRIPT_DIR.parent
+WEB_DATA_DIR = DATA_DIR.parent / "web" / "data"
+sys.path.insert(0, str(DATA_DIR))
+
+from issue_bitsets import IssueBitsets  # noqa: E402
+
+INPUT_ISSUES = WEB_DATA_DIR / "edition_issues.json"
+OUTPUT_PATH = WEB_DATA_DIR / "edition_overlaps.json"
+
+
+def build_overlaps(edition_issues: list[dict]) -> dict:
+    """The overlap shard for per-issue or range records (annuals match annuals only)."""
+    index = IssueBitsets(edition_issues, match_annual=True)
+    slugs = sorted(index.editions())
+    position = {slug: i for i, slug in enumerate(slugs)}
+    series = sorted({key[0] for key in index.blocks})
+    series_index = {name: i for i, name in enumerate(series)}
+
+    pairs = []
+    for (slug_a, slug_b), shared in sorted(index.shared_pairs().items()):
+        runs = [[series_index[name], int(annual), start, end]
+                for (name, annual), start, end in index.shared_ranges(slug_a, slug_b)]
+        pairs.append([position[slug_a], position[slug_b], shared, runs])
+    return {"editions": slugs, "series": series, "pairs": pairs}
+
+
+def run(edition_issues: list[dict] | None = None, save: bool = True) -> dict:
+    """Run Phase 8b. Pipeline objects passed in skip the edition_issues.json load."""
+    print("Phase 8b: Precompute Edition Overlaps")
+    print("=" * 50)
+
+    if edition_issues is None:
+        with open(INPUT_ISSUES) as f:
+            edition_issues = json.load(f)
+    print(f"Edition issue records: {len(edition_issues)}")
+
+    started = time.monotonic()
+    shard = build_overlaps(edition_issues)
+    elapsed = time.monotonic() - started
+    shared = sum(p[2] for p in shard["pairs"])
+    print(f"Editions with issues: {len(shard['editions'])}")
+    print(f"Overlapping pairs: {len(shard['pairs'])} ({shared} shared issues) in {elapsed:.2f}s")
+
+    if save:
+        with open(OUTPUT_PATH, "w") as f:
+            json.dump(shard, f, separators=(",", ":"))
+        print(f"\nSaved: {OUTPUT_PATH} ({OUTPUT_PATH.stat().st_size // 1024} KB)")
+    return shard
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""Import pipeline runner: content-hash memoized DAG over the import phases.
+
+Each phase declares the files it reads and writes. Before running a phase the
+runner hashes its inputs and outputs and compares them to the hashes recorded
+after the phase last ran (pipeline_state.json). A phase whose inputs and
+outputs are unchanged is skipped, so an edit to one input only re-runs the
+phases downstream of it.
+
+Files that a phase rewrites and that earlier phases also touch (Phase 4
+updating phase2_cleaned.json in place, Phase 7 updating phase5_enriched.json,
+Phase 8 merging into web/data) are treated as pipeline-owned: the earlier
+phases' recorded hashes are refreshed so the pipeline's own writes never
+invalidate them. Only external edits do.
+
+With --jobs N, phases run on a process pool as soon as the phases they share
+files with have finished. Each phase's output goes to logs/<phase>.log instead
+of the shared stdout.
+
+With --in-memory, all phases run in one process and each phase's result is
+passed straight to the next run() instead of being dumped to and re-loaded
+from its intermediate JSON file. This mode always runs every phase.
+
+Usage:
+  python3 import_pipeline.py                  # Phases 1-4, 6, 8, 8b (heuristic Phase 5)
+  python3 import_pipeline.py --with-ai        # Include Phase 5 AI enrichment
+  python3 import_pipeline.py --with-covers    # Include Phase 7 cover fetching
+  python3 import_pipeline.py --all            # AI and covers
+  python3 import_pipeline.py --seed           # After merge, push to Supabase
+  python3 import_pipeline.py --dry-run        # Show which phases would run
+  python3 import_pipeline.py --force          # Ignore recorded hashes, run everything
+  python3 import_pipeline.py --jobs 4         # Run independent phases concurrently
+  python3 import_pipeline.py --in-memory      # One process, no intermediate JSON round-trips
+  python3 import_pipeline.py --delta          # Only archive records added/modified since last merge
+"""
+
+import argparse
+import contextlib
+import hashlib
+import importlib
+import json
+import os
+import subprocess
+import sys
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+DATA_DIR = SCRIPT_DIR.parent
+REPO_DIR = DATA_DIR.parent
+WEB_DATA_DIR = REPO_DIR / "web" / "data"
+
+STATE_PATH = SCRIPT_DIR / "pipeline_state.json"
+LOG_DIR = SCRIPT_DIR / "logs"
+
+ARCHIVE = DATA_DIR / "marvel_collected_editions_archive.json"
+EDITIONS = WEB_DATA_DIR / "collected_editions.json"
+CONNECTIONS = WEB_DATA_DIR / "connections.json"
+EDITION_ISSUES = WEB_DATA_DIR / "edition_issues.json"
+EDITION_OVERLAPS = WEB_DATA_DIR / "edition_overlaps.json"
+ERAS = WEB_DATA_DIR / "eras.json"
+SERIES_CALENDAR = DATA_DIR / "series_calendar.json"
+
+DELTA_STATE = SCRIPT_DIR / "import_delta_state.json"
+DELTA_PENDING = SCRIPT_DIR / "phase1_delta_pending.json"
+PHASE1_PARSED = SCRIPT_DIR / "phase1_parsed.json"
+PHASE1_BACKFILL = SCRIPT_DIR / "phase1_isbn_backfill.json"
+PHASE2_CLEANED = SCRIPT_DIR / "phase2_cleaned.json"
+PHASE3_ISSUES = SCRIPT_DIR / "phase3_edition_issues.json"
+PHASE5_ENRICHED = SCRIPT_DIR / "phase5_enriched.json"
+PHASE6_CONNECTIONS = SCRIPT_DIR / "phase6_connections.json"
+
+
+@dataclass
+class Phase:
+    """One pipeline step: `module.func` reads `inputs` and writes `outputs`."""
+    name: str
+    module: str
+    func: str
+    inputs: list[Path]
+    outputs: list[Path]
+    argv: list[str] | None = None  # set for entry points that parse their own arguments
+    variant: str = ""  # recorded with the hashes; a different variant forces a re-run
+
+
+def build_phases(with_ai: bool, with_covers: bool, delta: bool = False) -> list[Phase]:
+    """Declare the pipeline in execution order."""
+    phases = [
+        Phase("phase1", "import_phase1_parse", "run",
+              inputs=[ARCHIVE, EDITIONS, DELTA_STATE],
+              outputs=[PHASE1_PARSED, PHASE1_BACKFILL, DELTA_PENDING],
+              argv=["--delta"] if delta else [],
+              variant="delta" if delta else ""),
+        Phase("phase2", "import_phase2_clean", "run",
+              inputs=[PHASE1_PARSED, EDITIONS],
+              outputs=[PHASE2_CLEANED]),
+        # Phase 4 rewrites phase2_cleaned.json in place, so it goes before the
+        # phases that only read it (3 and 5), which can then run side by side.
+        Phase("phase4", "import_phase4_eras", "run",
+              inputs=[PHASE2_CLEANED, ERAS, SERIES_CALENDAR],
+              outputs=[PHASE2_CLEANED]),
+        Phase("phase3", "import_phase3_issues", "run",
+              inputs=[PHASE2_CLEANED],
+              outputs=[PHASE3_ISSUES]),
+    ]
+
+    if with_ai and os.environ.get("ANTHROPIC_API_KEY"):
+        phases.append(Phase("phase5", "import_phase5_ai_enrich", "run",
+                            inputs=[PHASE2_CLEANED],
+                            outputs=[PHASE5_ENRICHED],
+                            argv=[],
+                            variant="ai"))
+    else:
+        if with_ai:
+            print("ERROR: ANTHROPIC_API_KEY not set. Using heuristic Phase 5.")
+            print("Set it with: export ANTHROPIC_API_KEY=your-key")
+        phases.append(Phase("phase5", "import_phase5_ai_enrich", "run_heuristic",
+                            inputs=[PHASE2_CLEANED],
+                            outputs=[PHASE5_ENRICHED],
+                            variant="heuristic"))
+
+    phases.append(Phase("phase6", "import_phase6_connections", "run",
+                        inputs=[PHASE5_ENRICHED, PHASE3_ISSUES, EDITIONS, CONNECTIONS, EDITION_ISSUES],
+                        outputs=[PHASE6_CONNECTIONS]))
+
+    if with_covers:
+        phases.append(Phase("phase7", "import_phase7_covers", "run",
+                            inputs=[PHASE5_ENRICHED],
+                            outputs=[PHASE5_ENRICHED],
+                            argv=[]))
+
+    phases.append(Phase("phase8", "import_phase8_merge", "run",
+                        inputs=[PHASE5_ENRICHED, PHASE3_ISSUES, PHASE6_CONNECTIONS, PHASE1_BACKFILL,
+                                DELTA_PENDING, EDITIONS, CONNECTIONS, EDITION_ISSUES],
+                        outputs=[EDITIONS, CONNECTIONS, EDITION_ISSUES, DELTA_STATE]))
+    phases.append(Phase("phase8b", "import_phase8b_overlaps", "run",
+                        inputs=[EDITION_ISSUES],
+                        outputs=[EDITION_OVERLAPS]))
+    return phases
+
+
+# ---------------------------------------------------------------------------
+# Hashing & state
+# ---------------------------------------------------------------------------
+def rel(path: Path) -> str:
+    """State keys are repo-relative so the state file survives checkouts elsewhere."""
+    return str(path.resolve().relative_to(REPO_DIR.resolve()))
+
+
+class FileHasher:
+    """SHA-256 of file contents, with a (size, mtime) fast path for unchanged files."""
+
+    def __init__(self, stat_cache: dict):
+        self.stat_cache = stat_cache
+
+    def hash(self, path: Path) -> str | None:
+        if not path.exists():
+            return None
+        st = path.stat()
+        key = rel(path)
+        cached = self.stat_cache.get(key)
+        if cached and cached["size"] == st.st_size and cached["mtime_ns"] == st.st_mtime_ns:
+            return cached["sha256"]
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+        self.stat_cache[key] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}
+        return digest
+
+    def snapshot(self, paths: list[Path]) -> dict[str, str | None]:
+        return {rel(p): self.hash(p) for p in paths}
+
+
+def load_state() -> dict:
+    if STATE_PATH.exists():
+        with open(STATE_PATH) as f:
+            return json.load(f)
+    return {"phases": {}, "files": {}}
+
+
+def save_state(state: dict):
+    with open(STATE_PATH, "w") as f:
+        json.dump(state, f, indent=2)
+
+
+def stale_reason(phase: Phase, record: dict | None, hasher: FileHasher) -> str | None:
+    """Return why a phase must run, or None if its recorded hashes are current."""
+    if record is None:
+        return "never run"
+    if record.get("variant", "") != phase.variant:
+        return f"variant changed ({record.get('variant') or '-'} → {phase.variant or '-'})"
+    for path, digest in hasher.snapshot(phase.inputs).items():
+        if record["inputs"].get(path) != digest:
+            return f"input changed: {path}"
+    for path, digest in hasher.snapshot(phase.outputs).items():
+        if digest is None:
+            return f"output missing: {path}"
+        if record["outputs"].get(path) != digest:
+            return f"output modified: {path}"
+    return None
+
+
+def record_run(phase: Phase, phases: list[Phase], state: dict, hasher: FileHasher):
+    """Record hashes after a phase ran and refresh earlier phases that share its outputs."""
+    state["phases"][phase.name] = {
+        "variant": phase.variant,
+        "inputs": hasher.snapshot(phase.inputs),
+        "outputs": hasher.snapshot(phase.outputs),
+    }
+    written = hasher.snapshot(phase.outputs)
+    for earlier in phases[:phases.index(phase)]:
+        record = state["phases"].get(earlier.name)
+        if not record:
+            continue
+        for section in ("inputs", "outputs"):
+            for path in record[section]:
+                if path in written:
+                    record[section][path] = written[path]
+
+
+# ---------------------------------------------------------------------------
+# Execution
+# ---------------------------------------------------------------------------
+def run_phase(phase: Phase, **kwargs):
+    """Import the phase module and call its entry point in-process."""
+    if str(SCRIPT_DIR) not in sys.path:
+        sys.path.insert(0, str(SCRIPT_DIR))
+    module = importlib.import_module(phase.module)
+    func = getattr(module, phase.func)
+    if phase.argv is not None:
+        kwargs["argv"] = phase.argv
+    return func(**kwargs)
+
+
+def run_in_memory(phases: list[Phase], write_intermediates: bool) -> list[str]:
+    """Run every phase in one process, handing each phase's return value to the next.
+
+    Intermediate files (phase1_parsed, phase2_cleaned, phase3_edition_issues,
+    phase5_enriched, phase6_connections) are only written with
+    write_intermediates; reports and the ISBN backfill are always written, and
+    Phase 8 still merges into web/data (and Phase 8b reads the merged
+    edition_issues.json back). No hashes are recorded, so the next
+    memoized run re-checks everything against what this run left on disk.
+    """
+    by_name = {phase.name: phase for phase in phases}
+    save = write_intermediates
+
+    with open(EDITIONS) as f:
+        existing = json.load(f)
+
+    parsed = run_phase(by_name["phase1"], existing=existing, save=save)
+    print()
+    cleaned = run_phase(by_name["phase2"], entries=parsed, existing=existing, save=save)
+    print()
+    cleaned = run_phase(by_name["phase4"], entries=cleaned, save=save)
+    print()
+    issues = run_phase(by_name["phase3"], entries=cleaned, save=save)
+    print()
+    enriched = run_phase(by_name["phase5"], entries=cleaned, save=save)
+    print()
+    connections = run_phase(by_name["phase6"], new_editions=enriched, new_issues=issues,
+                            existing_editions=existing, save=save)
+    print()
+    if "phase7" in by_name:
+        enriched = run_phase(by_name["phase7"], entries=enriched, save=save)
+        print()
+    run_phase(by_name["phase8"], new_editions=enriched, new_issues=issues,
+              new_connections=connections, existing_editions=existing)
+    print()
+    run_phase(by_name["phase8b"])
+    print()
+    return list(by_name)
+
+
+def phase_dependencies(phases: list[Phase]) -> dict[str, set[str]]:
+    """Derive each phase's prerequisites from the files it shares with earlier phases.
+
+    A later phase waits on an earlier one when it reads a file the earlier phase
+    writes, writes a file the earlier phase reads, or writes the same file. Those
+    are exactly the orderings the sequential declaration relies on, so running
+    the DAG concurrently produces the same files as running it in order.
+    """
+    deps: dict[str, set[str]] = {}
+    for i, phase in enumerate(phases):
+        reads, writes = set(phase.inputs), set(phase.outputs)
+        deps[phase.name] = {
+            earlier.name for earlier in phases[:i]
+            if reads & set(earlier.outputs) or writes & set(earlier.inputs) or writes & set(earlier.outputs)
+        }
+    return deps
+
+
+def run_phase_logged(phase: Phase, log_path: Path) -> float:
+    """Worker entry point: run a phase with its stdout/stderr captured in its own log file."""
+    started = time.monotonic()
+    with open(log_path, "w") as log, contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+        try:
+            run_phase(phase)
+        except SystemExit as e:
+            # SystemExit isn't an Exception: hand the scheduler an ordinary failure
+            traceback.print_exc()
+            raise RuntimeError(f"exited with status {e.code}") from None
+        except BaseException:
+            traceback.print_exc()
+            raise
+    return time.monotonic() - started
+
+
+def run_parallel(phases: list[Phase], state: dict, hasher: FileHasher, jobs: int, force: bool) -> list[str]:
+    """Run phases on a process pool as soon as their prerequisites have finished."""
+    deps = phase_dependencies(phases)
+    LOG_DIR.mkdir(exist_ok=True)
+
+    pending = list(phases)
+    done: set[str] = set()
+    ran: list[str] = []
+    failed: list[str] = []
+    running = {}
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            # Dispatch (or skip) every phase whose prerequisites are done.
+            # Skipping can unblock further phases, so repeat until nothing changes.
+            progressed = True
+            while progressed and not failed:
+                progressed = False
+                for phase in list(pending):
+                    if not deps[phase.name] <= done:
+                        continue
+                    pending.remove(phase)
+                    progressed = True
+                    reason = "forced" if force else stale_reason(phase, state["phases"].get(phase.name), hasher)
+                    if reason is None:
+                        print(f"▷ {phase.name}: up to date, skipped")
+                        done.add(phase.name)
+                        continue
+                    log_path = LOG_DIR / f"{phase.name}.log"
+                    print(f"▶ {phase.name}: started ({reason}) → {log_path.relative_to(SCRIPT_DIR)}")
+                    running[pool.submit(run_phase_logged, phase, log_path)] = phase
+
+            if not running:
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                phase = running.pop(future)
+                try:
+                    elapsed = future.result()
+                except BaseException as e:
+                    print(f"✗ {phase.name}: failed ({e}) — see {LOG_DIR / (phase.name + '.log')}")
+                    failed.append(phase.name)
+                    continue
+                record_run(phase, phases, state, hasher)
+                save_state(state)
+                done.add(phase.name)
+                ran.append(phase.name)
+                print(f"✓ {phase.name}: finished in {elapsed:.1f}s")
+
+    if failed:
+        print(f"\nFailed: {', '.join(failed)}. Not started: {', '.join(p.name for p in pending) or 'none'}")
+        sys.exit(1)
+    return ran
+
+
+def run_sequential(phases: list[Phase], state: dict, hasher: FileHasher, force: bool) -> list[str]:
+    """Run phases in declaration order in this process, streaming their output."""
+    ran = []
+    for phase in phases:
+        reason = "forced" if force else stale_reason(phase, state["phases"].get(phase.name), hasher)
+        if reason is None:
+            print(f"▷ {phase.name}: up to date, skipped")
+            continue
+
+        print(f"▶ {phase.name}: running ({reason})")
+        run_phase(phase)
+        record_run(phase, phases, state, hasher)
+        save_state(state)
+        ran.append(phase.name)
+        print()
+    return ran
+
+
+def run_seed():
+    """Push merged data to Supabase (never memoized — remote state is not hashable)."""
+    subprocess.run([sys.executable, "push_to_supabase.py"], cwd=DATA_DIR, check=True)
+    subprocess.run(["node", "scripts/seed-edition-issues.mjs"], cwd=REPO_DIR, check=True)
+    subprocess.run(["node", "scripts/seed-edition-overlaps.mjs"], cwd=REPO_DIR, check=True)
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Memoized edition import pipeline")
+    parser.add_argument("--with-ai", action="store_true", help="Include Phase 5 AI enrichment")
+    parser.add_argument("--with-covers", action="store_true", help="Include Phase 7 cover fetching")
+    parser.add_argument("--all", action="store_true", help="Include AI enrichment and covers")
+    parser.add_argument("--seed", action="store_true", help="After merge, push to Supabase")
+    parser.add_argument("--force", action="store_true", help="Run every phase regardless of hashes")
+    parser.add_argument("--dry-run", action="store_true", help="Report stale phases without running")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Run independent phases concurrently on N worker processes")
+    parser.add_argument("--delta", action="store_true",
+                        help="Only import archive records added/modified since the last merge")
+    parser.add_argument("--in-memory", action="store_true",
+                        help="Pass data between phases in memory instead of via intermediate JSON")
+    parser.add_argument("--write-intermediates", action="store_true",
+                        help="With --in-memory, still write each phase's intermediate JSON file")
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("  Marvel Cartographer — Edition Import Pipeline")
+    print("=" * 50)
+    print()
+
+    phases = build_phases(args.with_ai or args.all, args.with_covers or args.all, args.delta)
+    state = load_state()
+    hasher = FileHasher(state.setdefault("files", {}))
+
+    if args.dry_run:
+        deps = phase_dependencies(phases)
+        for phase in phases:
+            reason = "forced" if args.force else stale_reason(phase, state["phases"].get(phase.name), hasher)
+            after = f" after {', '.join(sorted(deps[phase.name]))}" if deps[phase.name] else ""
+            status = f"would run ({reason})" if reason else "up to date"
+            print(f"{'▶' if reason else '▷'} {phase.name}: {status}{after}")
+        return
+
+    if args.in_memory:
+        ran = run_in_memory(phases, args.write_intermediates)
+    elif args.jobs > 1:
+        ran = run_parallel(phases, state, hasher, args.jobs, args.force)
+    else:
+        ran = run_sequential(phases, state, hasher, args.force)
+
+    if args.seed:
+        print("▶ seed: Push to Supabase")
+        run_seed()
+
+    print()
+    print(f"Phases run: {len(ran)}/{len(phases)} ({', '.join(ran) or 'none'})")
+    print(f"State: {STATE_PATH}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""ISBN normalization and a canonical ISBN lookup index.
+
+Archive entries ("ISBN"), web/data/collected_editions.json ("isbn") and
+Supabase rows ("isbn") all store ISBNs as free-form strings. Keying on the raw
+string misses duplicates that only differ in formatting (hyphens, spaces,
+ISBN-10 vs ISBN-13). canonical_isbn() reduces every spelling of the same book
+to one key:
+  - valid ISBN-10 / ISBN-13 (checksum verified) → 13-digit ISBN-13
+  - anything else non-empty → the cleaned string, so unparseable values still
+    dedup against identical spellings
+  - empty / None → None
+"""
+
+import re
+
+_NON_ISBN_CHARS = re.compile(r"[^0-9X]")
+
+
+def clean_isbn(raw: str | None) -> str:
+    """Strip hyphens, spaces and other punctuation; uppercase the X check digit."""
+    if not raw:
+        return ""
+    return _NON_ISBN_CHARS.sub("", str(raw).upper())
+
+
+def isbn10_check_digit(body: str) -> str:
+    """Check digit for the first 9 digits of an ISBN-10."""
+    total = sum(int(d) * (10 - i) for i, d in enumerate(body))
+    check = (11 - (total % 11)) % 11
+    return "X" if check == 10 else str(check)
+
+
+def isbn13_check_digit(body: str) -> str:
+    """Check digit for the first 12 digits of an ISBN-13."""
+    total = sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(body))
+    return str((10 - total % 10) % 10)
+
+
+def is_valid_isbn10(isbn: str) -> bool:
+    return (len(isbn) == 10 and isbn[:9].isdigit()
+            and (isbn[9].isdigit() or isbn[9] == "X")
+            and isbn10_check_digit(isbn[:9]) == isbn[9])
+
+
+def is_valid_isbn13(isbn: str) -> bool:
+    return len(isbn) == 13 and isbn.isdigit() and isbn13_check_digit(isbn[:12]) == isbn[12]
+
+
+def isbn10_to_isbn13(isbn10: str) -> str | None:
+    """Convert ISBN-10 to ISBN-13 (978 prefix)."""
+    isbn10 = clean_isbn(isbn10)
+    if len(isbn10) != 10 or not isbn10[:9].isdigit():
+        return None
+    body = "978" + isbn10[:9]
+    return body + isbn13_check_digit(body)
+
+
+def isbn13_to_isbn10(isbn13: str) -> str | None:
+    """Convert ISBN-13 to ISBN-10. Only 978-prefixed ISBNs have an ISBN-10 form."""
+    isbn13 = clean_isbn(isbn13)
+    if len(isbn13) != 13 or not isbn13.startswith("978") or not isbn13.isdigit():
+        return None
+    body = isbn13[3:12]  # 9 digits
+    return body + isbn10_check_digit(body)
+
+
+def canonical_isbn(raw: str | None) -> str | None:
+    """Canonical lookup key for an ISBN string (see module docstring)."""
+    isbn = clean_isbn(raw)
+    if not isbn:
+        return None
+    if is_valid_isbn13(isbn):
+        return isbn
+    if is_valid_isbn10(isbn):
+        return isbn10_to_isbn13(isbn)
+    return isbn
+
+
+class IsbnIndex:
+    """Canonical ISBN → records, in insertion order.
+
+    Lookups accept any spelling of an ISBN (raw, hyphenated, ISBN-10 or -13).
+    """
+
+    def __init__(self):
+        self._records: dict[str, list[dict]] = {}
+
+    @classmethod
+    def from_records(cls, records: list[dict], field: str = "isbn") -> "IsbnIndex":
+        index = cls()
+        for record in records:
+            index.add(record.get(field), record)
+        return index
+
+    def add(self, raw: str | None, record: dict) -> str | None:
+        """Index record under raw's canonical key. Returns the key (None if no ISBN)."""
+        key = canonical_isbn(raw)
+        if key:
+            self._records.setdefault(key, []).append(record)
+        return key
+
+    def get(self, raw: str | None) -> dict | None:
+        """First record indexed under raw's canonical key."""
+        records = self._records.get(canonical_isbn(raw) or "")
+        return records[0] if records else None
+
+    def get_all(self, raw: str | None) -> list[dict]:
+        return self._records.get(canonical_isbn(raw) or "", [])
+
+    def __contains__(self, raw: str | None) -> bool:
+        return (canonical_isbn(raw) or "") in self._records
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def groups(self):
+        """(canonical key, records) pairs in first-seen order."""
+        return self._records.items()
+
+    def duplicates(self) -> dict[str, list[dict]]:
+        """Canonical keys shared by more than one record."""
+        return {key: records for key, records in self._records.items() if len(records) > 1}
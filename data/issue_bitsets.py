@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""Edition issue sets as integer bitsets, for overlap, containment and similarity queries.
+
+Every distinct (series, issue number, annual) in the records gets a dense
+integer id, and each edition's issues become one Python int with those bits
+set. Set algebra is then integer arithmetic:
+
+    shared      (a & b).bit_count()
+    containment |a & b| / |a|         (1.0: every issue of a is in b)
+    jaccard     |a & b| / |a | b|
+
+Ids are assigned series by series, in issue order, skipping only numbers no
+edition collects, so a range of issues is a run of consecutive bits: an
+edition's bitset is built with one shift per range, not one per issue.
+One-vs-all queries only visit editions sharing a series with the query
+edition (a posting list per series) and AND that series' slice of the two
+bitsets, a few machine words for all but the longest runs. Superset queries
+go one level finer: an issue -> editions posting list, built on first use.
+The candidates are the editions holding the query edition's rarest issues
+(the intersection of their posting lists), and only those get the exact
+containment check, so the work follows how rare the issues are, not how
+many editions share a series.
+
+IssueBitsets answers the whole-set questions: shared counts, supersets,
+every overlapping pair, containment and Jaccard scores, identical-set groups
+(cover variants, reprints under another title) and shared_ranges(), the
+issue runs two editions have in common. Range lookups ("which editions hold
+issue X / overlap this run") stay with IssueIntervalIndex (issue_ranges.py).
+"""
+
+from bisect import bisect_right
+from collections import defaultdict
+from heapq import nsmallest
+
+from issue_ranges import as_ranges, merge_intervals
+
+
+RAREST_ISSUES = 4  # posting lists intersected to find superset candidates
+
+
+class IssueBitsets:
+    """Edition issue sets as int bitsets over dense (series, number, annual) ids.
+
+    With match_annual=False, annual and regular issues of a series are treated
+    as the same issue numbers (Phase 6's historical (series, number) keys).
+    """
+
+    def __init__(self, records: list[dict], match_annual: bool = True):
+        self.match_annual = match_annual
+        grouped: dict[str, dict[tuple, list[tuple[int, int]]]] = {}
+        universe: dict[tuple, list[tuple[int, int]]] = defaultdict(list)
+        for r in as_ranges(records):
+            key = self._key(r["series_name"], r["is_annual"])
+            grouped.setdefault(r["edition_slug"], {}).setdefault(key, []).append((r["start"], r["end"]))
+            universe[key].append((r["start"], r["end"]))
+
+        # Id blocks: one per run of collected numbers, series in sorted order
+        self.blocks: dict[tuple, list[tuple[int, int, int]]] = {}  # key -> [(start, end, first id)]
+        self.block_ids: list[int] = []                             # first id of every block, ascending
+        self.block_info: list[tuple[tuple, int, int]] = []         # (key, start, end) of every block
+        next_id = 0
+        for key in sorted(universe):
+            blocks = []
+            for start, end in merge_intervals(universe[key]):
+                blocks.append((start, end, next_id))
+                self.block_ids.append(next_id)
+                self.block_info.append((key, start, end))
+                next_id += end - start + 1
+            self.blocks[key] = blocks
+        self.size = next_id
+
+        # Whole-catalog bitsets for pairwise queries; per-series slices (shifted
+        # down to the series' first id) for one-vs-all scans
+        self.bits: dict[str, int] = {}
+        self.counts: dict[str, int] = {}
+        self.slices: dict[str, dict[tuple, int]] = {}
+        self.id_runs: dict[str, list[tuple[int, int]]] = {}        # slug -> [(first id, last id)]
+        self.postings: dict[tuple, list[tuple[str, int]]] = defaultdict(list)
+        for slug, by_key in grouped.items():
+            bits = 0
+            slices = {}
+            runs = []
+            for key, ivs in by_key.items():
+                base = self.blocks[key][0][2]
+                piece = 0
+                for start, end in merge_intervals(ivs):
+                    first = self._id(key, start)
+                    piece |= ((1 << (end - start + 1)) - 1) << (first - base)
+                    runs.append((first, first + end - start))
+                slices[key] = piece
+                bits |= piece << base
+                self.postings[key].append((slug, piece))
+            self.bits[slug] = bits
+            self.counts[slug] = bits.bit_count()
+            self.slices[slug] = slices
+            self.id_runs[slug] = runs
+        self.position = {slug: i for i, slug in enumerate(self.bits)}
+        self.slugs = list(self.bits)
+        self._issue_postings: list[list[int]] | None = None
+
+    def _key(self, series_name: str, is_annual: bool) -> tuple:
+        return (series_name, is_annual) if self.match_annual else (series_name,)
+
+    def _id(self, key: tuple, number: int) -> int | None:
+        blocks = self.blocks.get(key)
+        if not blocks:
+            return None
+        i = bisect_right(blocks, (number, float("inf"))) - 1
+        if i < 0 or blocks[i][1] < number:
+            return None
+        start, _, first = blocks[i]
+        return first + number - start
+
+    def issue_id(self, series_name: str, issue_number: int, is_annual: bool = False) -> int | None:
+        """Dense id of an issue, or None if no edition collects it."""
+        return self._id(self._key(series_name, is_annual), issue_number)
+
+    def editions(self) -> list[str]:
+        """Edition slugs in first-seen order."""
+        return list(self.bits)
+
+    def issue_count(self, slug: str) -> int:
+        return self.counts.get(slug, 0)
+
+    def shared(self, slug_a: str, slug_b: str) -> int:
+        return (self.bits.get(slug_a, 0) & self.bits.get(slug_b, 0)).bit_count()
+
+    def containment(self, slug_a: str, slug_b: str) -> float:
+        """Share of slug_a's issues that slug_b also holds."""
+        n = self.counts.get(slug_a, 0)
+        return self.shared(slug_a, slug_b) / n if n else 0.0
+
+    def jaccard(self, slug_a: str, slug_b: str) -> float:
+        a, b = self.bits.get(slug_a, 0), self.bits.get(slug_b, 0)
+        union = (a | b).bit_count()
+        return (a & b).bit_count() / union if union else 0.0
+
+    def shared_counts(self, slug: str) -> dict[str, int]:
+        """Issues slug shares with every overlapping edition (slug itself excluded).
+
+        One AND per edition per shared series, on the series' slice of the
+        bitsets; editions come in series-then-first-seen order.
+        """
+        shared: dict[str, int] = defaultdict(int)
+        for key, mine in self.slices.get(slug, {}).items():
+            for other, theirs in self.postings[key]:
+                n = (mine & theirs).bit_count()
+                if n:
+                    shared[other] += n
+        shared.pop(slug, None)
+        return dict(shared)
+
+    def containments(self, slug: str) -> dict[str, float]:
+        """Share of slug's issues held by every overlapping edition."""
+        n = self.counts.get(slug, 0)
+        return {other: k / n for other, k in self.shared_counts(slug).items()}
+
+    def jaccards(self, slug: str) -> dict[str, float]:
+        """Jaccard similarity of slug with every overlapping edition."""
+        n = self.counts.get(slug, 0)
+        return {other: k / (n + self.counts[other] - k) for other, k in self.shared_counts(slug).items()}
+
+    def issue_postings(self) -> list[list[int]]:
+        """Positions of the editions holding each issue id, ascending; built on first use."""
+        if self._issue_postings is None:
+            postings: list[list[int]] = [[] for _ in range(self.size)]
+            for pos, slug in enumerate(self.slugs):
+                for first, last in self.id_runs[slug]:
+                    for i in range(first, last + 1):
+                        postings[i].append(pos)
+            self._issue_postings = postings
+        return self._issue_postings
+
+    def supersets(self, slug: str) -> list[str]:
+        """Editions holding every issue of slug (slug itself excluded), in first-seen order.
+
+        Candidates are the editions in the posting lists of all of slug's
+        RAREST_ISSUES rarest issues; each is then checked exactly against the
+        whole bitset.
+        """
+        mine = self.bits.get(slug, 0)
+        if not mine:
+            return []
+        postings = self.issue_postings()
+        ids = (i for first, last in self.id_runs[slug] for i in range(first, last + 1))
+        rarest = nsmallest(RAREST_ISSUES, ids, key=lambda i: len(postings[i]))
+        candidates = set(postings[rarest[0]])
+        for i in rarest[1:]:
+            if len(candidates) <= 1:
+                break
+            candidates.intersection_update(postings[i])
+        candidates.discard(self.position[slug])
+        return [self.slugs[pos] for pos in sorted(candidates)
+                if self.bits[self.slugs[pos]] & mine == mine]
+
+    def shared_pairs(self, slugs=None, min_shared: int = 1) -> dict[tuple[str, str], int]:
+        """Shared-issue count for every pair of editions with at least min_shared in common.
+
+        Pairs are keyed (lower slug, higher slug); with slugs given only pairs
+        touching one of them are counted.
+        """
+        pairs: dict[tuple[str, str], int] = {}
+        for slug in self.bits if slugs is None else slugs:
+            for other, n in self.shared_counts(slug).items():
+                if n >= min_shared:
+                    pairs[(slug, other) if slug < other else (other, slug)] = n
+        return pairs
+
+    def identical_groups(self, min_issues: int = 1) -> list[list[str]]:
+        """Groups of two or more editions collecting exactly the same issues, in first-seen order."""
+        groups: dict[int, list[str]] = defaultdict(list)
+        for slug, bits in self.bits.items():
+            if self.counts[slug] >= min_issues:
+                groups[bits].append(slug)
+        return [group for group in groups.values() if len(group) > 1]
+
+    def ranges(self, bits: int) -> list[tuple[tuple, int, int]]:
+        """(key, start, end) issue runs of a bitset, in id order."""
+        runs = []
+        while bits:
+            low = (bits & -bits).bit_length() - 1
+            rest = bits >> low
+            length = (~rest & (rest + 1)).bit_length() - 1
+            bits ^= ((1 << length) - 1) << low
+            # A run of ids can cross id blocks (the next run of numbers, or the next series)
+            while length:
+                i = bisect_right(self.block_ids, low) - 1
+                key, start, end = self.block_info[i]
+                first = start + low - self.block_ids[i]
+                take = min(length, end - first + 1)
+                runs.append((key, first, first + take - 1))
+                low += take
+                length -= take
+        return runs
+
+    def shared_ranges(self, slug_a: str, slug_b: str) -> list[tuple[tuple, int, int]]:
+        """(key, start, end) runs of the issues two editions have in common."""
+        return self.ranges(self.bits.get(slug_a, 0) & self.bits.get(slug_b, 0))
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""Interval storage and queries for edition issue lists.
+
+An edition's issues are stored as ranges instead of one record per issue:
+
+    {"edition_slug": "avengers-omnibus-v1", "series_name": "Avengers (1963)",
+     "start": 1, "end": 30, "is_annual": false}
+
+Phase 3 writes ranges; Phase 8 expands them into per-issue rows only for the
+published edition_issues.json (the Supabase edition_issues table and the web
+app keep one row per issue). as_ranges() accepts either shape, so per-issue
+files can be queried the same way.
+
+IssueIntervalIndex answers "which editions contain issue X", "which editions
+overlap a run of issues" and "how many issues does this edition share with
+every other edition" from one centered interval tree per series. Whole-set
+questions (supersets, every overlapping pair, similarity) are answered by
+IssueBitsets (issue_bitsets.py).
+"""
+
+from collections import defaultdict
+
+
+def range_record(edition_slug: str, series_name: str, start: int, end: int, is_annual: bool) -> dict:
+    return {
+        "edition_slug": edition_slug,
+        "series_name": series_name,
+        "start": start,
+        "end": end,
+        "is_annual": is_annual,
+    }
+
+
+def as_ranges(records: list[dict]) -> list[dict]:
+    """Range records for a mix of range and per-issue records, in input order."""
+    ranges = []
+    for r in records:
+        if "issue_number" in r:
+            n = r["issue_number"]
+            ranges.append(range_record(r["edition_slug"], r["series_name"], n, n, r.get("is_annual", False)))
+        else:
+            ranges.append(r)
+    return ranges
+
+
+def merge_intervals(intervals) -> list[tuple[int, int]]:
+    """Sorted, disjoint (start, end) intervals covering the input; adjacent runs are joined."""
+    merged: list[list[int]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [(s, e) for s, e in merged]
+
+
+def compress_issues(records: list[dict]) -> list[dict]:
+    """Collapse per-issue (or overlapping range) records into minimal ranges.
+
+    Groups keep first-seen (edition, series, annual) order; ranges within a
+    group ascend.
+    """
+    groups: dict[tuple[str, str, bool], list[tuple[int, int]]] = {}
+    for r in as_ranges(records):
+        key = (r["edition_slug"], r["series_name"], r["is_annual"])
+        groups.setdefault(key, []).append((r["start"], r["end"]))
+    return [
+        range_record(slug, series, start, end, annual)
+        for (slug, series, annual), intervals in groups.items()
+        for start, end in merge_intervals(intervals)
+    ]
+
+
+def expand_ranges(records: list[dict]) -> list[dict]:
+    """Per-issue records ({edition_slug, series_name, issue_number, is_annual}) for ranges."""
+    issues = []
+    for r in records:
+        if "issue_number" in r:
+            issues.append(r)
+            continue
+        for n in range(r["start"], r["end"] + 1):
+            issues.append({
+                "edition_slug": r["edition_slug"],
+                "series_name": r["series_name"],
+                "issue_number": n,
+                "is_annual": r["is_annual"],
+            })
+    return issues
+
+
+def issue_total(records: list[dict]) -> int:
+    """Number of issues the records cover (ranges count end - start + 1)."""
+    return sum(1 if "issue_number" in r else r["end"] - r["start"] + 1 for r in records)
+
+
+class IntervalTree:
+    """Centered interval tree over closed integer intervals (start, end, payload)."""
+
+    __slots__ = ("center", "by_start", "by_end", "left", "right")
+
+    def __init__(self, intervals: list[tuple[int, int, object]]):
+        points = sorted(p for s, e, _ in intervals for p in (s, e))
+        self.center = points[len(points) // 2] if points else 0
+        here, left, right = [], [], []
+        for iv in intervals:
+            if iv[1] < self.center:
+                left.append(iv)
+            elif iv[0] > self.center:
+                right.append(iv)
+            else:
+                here.append(iv)
+        self.by_start = sorted(here, key=lambda iv: iv[0])
+        self.by_end = sorted(here, key=lambda iv: -iv[1])
+        self.left = IntervalTree(left) if left else None
+        self.right = IntervalTree(right) if right else None
+
+    def overlapping(self, lo: int, hi: int) -> list[tuple[int, int, object]]:
+        """Intervals intersecting [lo, hi]."""
+        found = []
+        node = self
+        stack = []
+        while node is not None or stack:
+            if node is None:
+                node = stack.pop()
+            if hi < node.center:
+                for iv in node.by_start:
+                    if iv[0] > hi:
+                        break
+                    found.append(iv)
+                node = node.left
+            elif lo > node.center:
+                for iv in node.by_end:
+                    if iv[1] < lo:
+                        break
+                    found.append(iv)
+                node = node.right
+            else:
+                found.extend(node.by_start)
+                if node.right is not None:
+                    stack.append(node.right)
+                node = node.left
+        return found
+
+    def at(self, point: int) -> list[tuple[int, int, object]]:
+        return self.overlapping(point, point)
+
+
+class IssueIntervalIndex:
+    """Edition issue ranges indexed per series.
+
+    With match_annual=False, annual and regular issues of a series are treated
+    as the same issue numbers (Phase 6's historical (series, number) keys).
+    """
+
+    def __init__(self, records: list[dict], match_annual: bool = True):
+        self.match_annual = match_annual
+        grouped: dict[str, dict[tuple, list[tuple[int, int]]]] = {}
+        for r in as_ranges(records):
+            key = self._key(r["series_name"], r["is_annual"])
+            grouped.setdefault(r["edition_slug"], {}).setdefault(key, []).append((r["start"], r["end"]))
+
+        # Per-edition ranges are merged so interval intersections count each issue once
+        self.edition_ranges: dict[str, dict[tuple, list[tuple[int, int]]]] = {
+            slug: {key: merge_intervals(ivs) for key, ivs in by_key.items()}
+            for slug, by_key in grouped.items()
+        }
+        per_key: dict[tuple, list[tuple[int, int, str]]] = defaultdict(list)
+        for slug, by_key in self.edition_ranges.items():
+            for key, ivs in by_key.items():
+                per_key[key].extend((s, e, slug) for s, e in ivs)
+        self.trees = {key: IntervalTree(ivs) for key, ivs in per_key.items()}
+
+    def _key(self, series_name: str, is_annual: bool) -> tuple:
+        return (series_name, is_annual) if self.match_annual else (series_name,)
+
+    def editions(self) -> list[str]:
+        """Edition slugs in first-seen order."""
+        return list(self.edition_ranges)
+
+    def issue_count(self, slug: str) -> int:
+        return sum(e - s + 1 for ivs in self.edition_ranges.get(slug, {}).values() for s, e in ivs)
+
+    def editions_containing(self, series_name: str, issue_number: int, is_annual: bool = False) -> list[str]:
+        tree = self.trees.get(self._key(series_name, is_annual))
+        return [slug for _, _, slug in tree.at(issue_number)] if tree else []
+
+    def overlapping(self, series_name: str, start: int, end: int,
+                    is_annual: bool = False) -> list[tuple[str, int, int]]:
+        """(edition_slug, start, end) of stored ranges intersecting start..end."""
+        tree = self.trees.get(self._key(series_name, is_annual))
+        return [(slug, s, e) for s, e, slug in tree.overlapping(start, end)] if tree else []
+
+    def shared_counts(self, slug: str) -> dict[str, int]:
+        """Issues slug shares with every overlapping edition (slug itself excluded)."""
+        shared: dict[str, int] = defaultdict(int)
+        for key, ivs in self.edition_ranges.get(slug, {}).items():
+            tree = self.trees[key]
+            for lo, hi in ivs:
+                for s, e, other in tree.overlapping(lo, hi):
+                    if other != slug:
+                        shared[other] += min(hi, e) - max(lo, s) + 1
+        return dict(shared)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Incremental parser for replies whose payload is one JSON array.
+
+The enrichment scripts used to wait for the whole reply, strip a code fence
+and json.loads() it: one malformed element, or a reply cut off at
+max_tokens, lost every item in the batch. A JsonArrayStream is fed the reply
+text as it streams in (ClaudeClient passes it each text delta) and parses
+one array element at a time:
+
+  - anything before the first "[" (a ```json fence, a sentence of preamble)
+    is skipped, and so is anything after the closing "]"
+  - an element is parsed as soon as its closing bracket (or the comma after
+    a scalar) arrives, so a truncated reply keeps every element it finished
+  - an element that doesn't parse is recorded as None, keeping positions,
+    and parsing resumes at the next element
+  - complete is True once the array's closing "]" was seen; a reply without
+    it was cut off
+
+Only brackets, braces, quotes, commas and backslashes are looked at between
+elements, so the scan is a few regex searches per element.
+"""
+
+import json
+import re
+
+STRUCTURAL = re.compile(r'[\[\]{}",]')
+STRING_END = re.compile(r'["\\]')
+WHITESPACE = " \t\r\n"
+
+
+class JsonArrayStream:
+    """Feed reply text in chunks; complete elements accumulate in .elements."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Forget everything fed so far (the request is being retried)."""
+        self.elements: list = []
+        self.malformed = 0
+        self.started = False
+        self.complete = False
+        self.buf = ""
+        self.pos = 0       # scan position in buf
+        self.start = None  # buf offset where the current element began
+        self.depth = 0     # bracket depth inside the current element
+        self.in_string = False
+
+    def element(self, text: str):
+        try:
+            return json.loads(text)
+        except ValueError:
+            self.malformed += 1
+            return None
+
+    def feed(self, text: str) -> list:
+        """Parse more reply text; returns the elements it completed (None for a malformed one)."""
+        buf = self.buf + text
+        i, n = self.pos, len(buf)
+        done = []
+        while i < n and not self.complete:
+            if not self.started:
+                j = buf.find("[", i)
+                if j < 0:
+                    i = n
+                    break
+                self.started = True
+                i = j + 1
+                continue
+
+            if self.in_string:
+                m = STRING_END.search(buf, i)
+                if m is None:
+                    i = n
+                    break
+                if m.group() == "\\":
+                    if m.end() == n:  # the escaped character hasn't arrived yet
+                        i = m.start()
+                        break
+                    i = m.end() + 1
+                    continue
+                self.in_string = False
+                i = m.end()
+                continue
+
+            if self.depth == 0 and self.start is None:
+                while i < n and buf[i] in WHITESPACE:
+                    i += 1
+                if i == n:
+                    break
+                if buf[i] not in ",]":
+                    self.start = i
+
+            m = STRUCTURAL.search(buf, i)
+            if m is None:
+                i = n
+                break
+            c = m.group()
+            i = m.end()
+            if c == '"':
+                self.in_string = True
+            elif c in "[{":
+                self.depth += 1
+            elif self.depth > 0 and c in "]}":
+                self.depth -= 1
+                if self.depth == 0:
+                    done.append(self.element(buf[self.start:i]))
+                    self.start = None
+            elif self.depth == 0 and c in ",]":
+                if self.start is not None:  # a scalar element ends at the comma
+                    done.append(self.element(buf[self.start:m.start()]))
+                    self.start = None
+                self.complete = c == "]"
+
+        # Keep only the unfinished element (or nothing) buffered
+        keep = self.start if self.start is not None else i
+        self.buf = buf[keep:]
+        self.pos = i - keep
+        if self.start is not None:
+            self.start = 0
+        self.elements.extend(done)
+        return done
+
+
+def parse_json_array(text: str) -> JsonArrayStream:
+    """A whole reply through JsonArrayStream (cached replies, non-streaming calls)."""
+    stream = JsonArrayStream()
+    stream.feed(text)
+    return stream
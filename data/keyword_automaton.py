@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Aho-Corasick automaton for matching many keywords in one pass.
+
+Rule tables in this repo (era rules, franchise filters) test dozens to
+hundreds of substrings against the same title/slug/synopsis text. A
+KeywordAutomaton compiles the keywords once; find() then reports every
+keyword occurring in a text in a single linear scan, however many keywords
+there are.
+
+Matching is on raw substrings (same semantics as `kw in text`); callers
+lowercase text and keywords themselves.
+"""
+
+from collections import deque
+
+
+class KeywordAutomaton:
+    """Multi-pattern substring matcher (goto/fail/output tables)."""
+
+    def __init__(self, keywords):
+        self.goto: list[dict[str, int]] = [{}]
+        self.fail: list[int] = [0]
+        self.out: list[tuple[str, ...]] = [()]
+        self.keywords: set[str] = set()
+
+        for kw in keywords:
+            if not kw or kw in self.keywords:
+                continue
+            self.keywords.add(kw)
+            state = 0
+            for ch in kw:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append(())
+                state = nxt
+            self.out[state] += (kw,)
+
+        # Breadth-first fail links; each state inherits its fail state's outputs
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] += self.out[self.fail[nxt]]
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def iter_matches(self, text: str):
+        """Yield (end_index, keyword) for every occurrence, overlaps included."""
+        goto, fail, out = self.goto, self.fail, self.out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for kw in out[state]:
+                yield i, kw
+
+    def find(self, text: str) -> set[str]:
+        """Every keyword occurring in text."""
+        found = set()
+        goto, fail, out = self.goto, self.fail, self.out
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Tag editions with every matching keyword class in one automaton scan.
+
+A class is a list of alternatives; an alternative is a keyword, or a tuple
+of keywords that must all appear:
+
+    {"conan_family": ["conan", "kull", "solomon kane", "solomon-kane"],
+     "byrne_ff": [("byrne", "fantastic four")]}
+
+An edition's fields (title, slug, and optionally synopsis) are lowercased and
+joined with a separator, so plain keywords behave like `kw in title or kw in
+slug` but never match across fields. "^" at the start or "$" at the end of a
+keyword anchors it to the start or end of a field ("^halo-", "^tron-download-tp$").
+
+Tags are cached by the scanned text, so rules downstream only test set
+membership and an edition seen twice (variants, re-runs over the same
+catalog) is scanned once.
+"""
+
+from collections import OrderedDict
+
+from keyword_automaton import KeywordAutomaton
+
+FIELD_SEP = "\x00"  # also the anchor character for ^ and $
+DEFAULT_CACHE_SIZE = 8192
+
+
+def anchored(keyword: str) -> str:
+    """Automaton keyword for a class keyword ("^x" / "x$" -> field-separator anchors)."""
+    if keyword.startswith("^"):
+        keyword = FIELD_SEP + keyword[1:]
+    if keyword.endswith("$"):
+        keyword = keyword[:-1] + FIELD_SEP
+    return keyword
+
+
+class KeywordClassifier:
+    """Compiled keyword classes: one automaton, one scan per text."""
+
+    def __init__(self, classes: dict[str, list], fields: tuple[str, ...] = ("title", "slug"),
+                 cache_size: int = DEFAULT_CACHE_SIZE):
+        self.classes = classes
+        self.fields = fields
+        # keyword -> [(class name, alternative)], alternatives as tuples of automaton keywords
+        self.triggers: dict[str, list[tuple[str, tuple[str, ...]]]] = {}
+        for name, alternatives in classes.items():
+            for alt in alternatives:
+                keywords = tuple(anchored(k) for k in (alt if isinstance(alt, tuple) else (alt,)))
+                for kw in set(keywords):
+                    self.triggers.setdefault(kw, []).append((name, keywords))
+        self.automaton = KeywordAutomaton(self.triggers)
+        self.cache_size = cache_size
+        self.cache: OrderedDict[str, frozenset[str]] = OrderedDict()
+        self.hits = self.misses = 0
+
+    def text_of(self, edition: dict) -> str:
+        parts = ((edition.get(f) or "").lower() for f in self.fields)
+        return FIELD_SEP + FIELD_SEP.join(parts) + FIELD_SEP
+
+    def tags_for_text(self, text: str) -> frozenset[str]:
+        """Class names with an alternative fully present in text (already joined/lowercased)."""
+        cached = self.cache.get(text)
+        if cached is not None:
+            self.cache.move_to_end(text)
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        found = self.automaton.find(text)
+        tags = set()
+        for kw in found:
+            for name, keywords in self.triggers[kw]:
+                if name not in tags and all(k in found for k in keywords):
+                    tags.add(name)
+        tags = frozenset(tags)
+
+        self.cache[text] = tags
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return tags
+
+    def tags(self, edition: dict) -> frozenset[str]:
+        """Every keyword class matching the edition."""
+        return self.tags_for_text(self.text_of(edition))
+
+    def stats(self) -> str:
+        return f"keyword classifier: {self.hits} cached, {self.misses} scanned"
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Content-addressed cache for parsers of `issues_collected` strings.
+
+Variant covers, reprints and TPB/HC pairs share identical issues_collected
+text, and Phase 3, Phase 4b, the era rules (via the series calendar) and
+web/scripts/generate-edition-issues.py all parse the same strings. A
+ParseCache wraps one parser function:
+
+  - key:     sha1 of the input text
+  - version: sha1 of the parser's source file, so editing the parser (or the
+             tables in its module) invalidates its entries; files the parser
+             reads (depends) are hashed in too
+  - store:   data/.cache/parse_<name>.json, loaded into one dict on first
+             use (that dict is the in-memory cache too) and written back by
+             save() (also registered atexit)
+  - bound:   the dict is kept in least-recently-used order; save() keeps only
+             the max_entries most recent, so entries for strings no run
+             asks for any more age out (the file is only rewritten when a
+             run adds entries)
+
+Parser results must be JSON-serializable; tuples come back from disk as lists.
+"""
+
+import atexit
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Callable
+
+CACHE_DIR = Path(__file__).parent / ".cache"
+DEFAULT_MAX_ENTRIES = 50_000
+
+
+def text_key(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def source_version(func: Callable, depends: tuple[Path, ...] = ()) -> str:
+    """Hash of the source file defining func and of any files it depends on."""
+    digest = hashlib.sha1(Path(inspect.getfile(func)).read_bytes())
+    for path in depends:
+        digest.update(Path(path).read_bytes() if Path(path).exists() else b"")
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """Memoize parser(text) in one bounded dict persisted to disk, keyed on the text content."""
+
+    def __init__(self, name: str, parser: Callable[[str], object],
+                 max_entries: int = DEFAULT_MAX_ENTRIES, cache_dir: Path | None = None,
+                 depends: tuple[Path, ...] = ()):
+        self.name = name
+        self.parser = parser
+        self.version = source_version(parser, depends)
+        self.path = (cache_dir or CACHE_DIR) / f"parse_{name}.json"
+        self.max_entries = max_entries
+        self.disk: dict[str, object] | None = None
+        self.dirty = False
+        self.hits = self.misses = 0
+        atexit.register(self.save)
+
+    def _load(self) -> dict:
+        if self.disk is None:
+            self.disk = {}
+            if self.path.exists():
+                try:
+                    with open(self.path) as f:
+                        stored = json.load(f)
+                except (OSError, json.JSONDecodeError):
+                    stored = {}
+                if stored.get("version") == self.version:
+                    self.disk = stored.get("entries", {})
+        return self.disk
+
+    def get(self, text: str):
+        """parser(text), computed at most once per distinct text and parser version."""
+        key = text_key(text or "")
+        disk = self._load()
+        if key in disk:
+            value = disk[key] = disk.pop(key)  # most recently used last
+            self.hits += 1
+        else:
+            value = self.parser(text)
+            disk[key] = value
+            self.dirty = True
+            self.misses += 1
+        return value
+
+    def save(self):
+        """Write new entries to disk (atomic replace), evicting the least recently used."""
+        if not self.dirty or self.disk is None:
+            return
+        for key in list(self.disk)[:max(len(self.disk) - self.max_entries, 0)]:
+            del self.disk[key]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"version": self.version, "entries": self.disk}, f)
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+    def stats(self) -> str:
+        return f"{self.name} parse cache: {self.hits} hits, {self.misses} misses"
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Content-addressed on-disk cache for Claude responses.
+
+Every enrichment script sends deterministic prompts built from the catalog,
+so re-running a phase (after a crash without --resume, or after a data tweak
+that leaves most prompts unchanged) re-sends and re-bills the same batches.
+ClaudeClient checks this cache before calling the API:
+
+  - key:      sha256 of (model, system prompt, user prompt, max_tokens);
+              a reply cut off at max_tokens is only replayed for that limit
+  - value:    the raw reply text (parsed again by the caller), stored once
+              it parsed, truncated JSON arrays included (with their finished
+              elements) so a replay splits the batch the same way
+  - storage:  data/.cache/claude/<key[:2]>/<key>.json, written atomically
+  - eviction: least recently used entries (by mtime, bumped on every hit)
+              are deleted once the directory exceeds max_bytes
+              (CLAUDE_CACHE_MAX_MB, default 256)
+
+With --cache-only a script replays cached replies and treats misses as
+errors instead of calling the API.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+CACHE_DIR = Path(__file__).parent / ".cache" / "claude"
+DEFAULT_MAX_MB = 256
+
+
+def response_key(model: str, system: str, prompt: str, max_tokens: int) -> str:
+    payload = json.dumps([model, system, prompt, max_tokens], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Size-bounded LRU of reply texts, one file per response."""
+
+    def __init__(self, cache_dir: Path | None = None, max_bytes: int | None = None):
+        self.dir = cache_dir or CACHE_DIR
+        if max_bytes is None:
+            max_bytes = int(os.environ.get("CLAUDE_CACHE_MAX_MB") or DEFAULT_MAX_MB) * 1024 * 1024
+        self.max_bytes = max_bytes
+        self.entries: OrderedDict[str, int] | None = None  # key -> size, oldest first
+        self.total = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def path(self, key: str) -> Path:
+        return self.dir / key[:2] / f"{key}.json"
+
+    def load(self):
+        """Index existing entries by last use (mtime) on first access."""
+        if self.entries is not None:
+            return
+        found = []
+        if self.dir.exists():
+            for path in self.dir.glob("*/*.json"):
+                st = path.stat()
+                found.append((st.st_mtime, path.stem, st.st_size))
+        found.sort()
+        self.entries = OrderedDict((key, size) for _, key, size in found)
+        self.total = sum(self.entries.values())
+
+    def get(self, key: str) -> str | None:
+        self.load()
+        if key not in self.entries:
+            self.misses += 1
+            return None
+        path = self.path(key)
+        try:
+            with open(path) as f:
+                text = json.load(f)["text"]
+        except (OSError, ValueError, KeyError):
+            self.total -= self.entries.pop(key)
+            self.misses += 1
+            return None
+        os.utime(path)
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return text
+
+    def put(self, key: str, text: str, model: str = ""):
+        self.load()
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps({"model": model, "created": int(time.time()), "text": text})
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+        self.total -= self.entries.pop(key, 0)
+        self.entries[key] = len(data.encode("utf-8"))
+        self.total += self.entries[key]
+        while self.total > self.max_bytes and len(self.entries) > 1:
+            old, size = self.entries.popitem(last=False)
+            self.path(old).unlink(missing_ok=True)
+            self.total -= size
+            self.evictions += 1
+
+    def stats(self) -> str:
+        return (f"response cache: {self.hits} hits, {self.misses} misses, "
+                f"{self.evictions} evicted, {self.total / 1024 / 1024:.1f} MB")
+
+
+_cache: ResponseCache | None = None
+
+
+def response_cache() -> ResponseCache:
+    """Process-wide cache shared by every ClaudeClient."""
+    global _cache
+    if _cache is None:
+        _cache = ResponseCache()
+    return _cache
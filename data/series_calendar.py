@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""Series cover years: (series, issue) -> cover year, dated or estimated.
+
+Build step (run after refreshing the series lists):
+
+    python3 data/series_calendar.py
+
+compiles marvel_series_full.json (every series name, with its launch year as
+"Avengers (1963)") and marvel_series_complete.json (issue counts) into
+series_calendar.json.
+
+Only the volumes in COVER_DATES carry real cover dates: a handful of anchor
+issues (launches, round numbers, renumberings) per long-running series, with
+the issues in between interpolated. Those years are good to a few months.
+
+Every other volume is an ESTIMATE. Neither source carries per-issue dates, so
+the run is bounded by its launch year and the launch of the next volume with
+the same name (or CURRENT_YEAR for the latest volume), and issues are spread
+across that window at the volume's own cadence: issue count / run length when
+the count is known (at least monthly), 12 a year otherwise. Bi-monthly
+stretches, hiatuses and legacy renumbering all throw it off by years, so
+callers that need a real date pass dated_only=True.
+
+SeriesCalendar expands the compiled file into one array of cover years (in
+tenths of a year) with a per-volume (offset, count) index, so year() is a
+dict lookup plus an array index. Phase 4, Phase 4b and scripts/audit_eras.py
+share it instead of each guessing from launch years.
+"""
+
+import json
+import re
+from array import array
+from pathlib import Path
+
+from collects_parser import parse_collects_ranges
+
+DATA_DIR = Path(__file__).parent
+FULL_PATH = DATA_DIR / "marvel_series_full.json"
+COMPLETE_PATH = DATA_DIR / "marvel_series_complete.json"
+CALENDAR_PATH = DATA_DIR / "series_calendar.json"
+
+CURRENT_YEAR = 2026
+DEFAULT_CADENCE = 12  # issues per year for volumes with no known issue count
+MAX_CADENCE = 24  # bi-weekly
+MAX_ISSUES = 1000
+
+# Cover dates (issue, year, month) of anchor issues. Legacy renumberings jump
+# (Fantastic Four (1998) #70 -> #500); interpolation across the gap is harmless
+# since no issues carry those numbers.
+_X_MEN = [(1, 1963, 9), (66, 1970, 3), (67, 1970, 12), (94, 1975, 8), (100, 1976, 8),
+          (137, 1980, 9), (141, 1981, 1), (200, 1985, 12), (300, 1993, 5),
+          (400, 2001, 12), (500, 2008, 9), (544, 2011, 10)]
+COVER_DATES = {
+    "fantastic four (1961)": [(1, 1961, 11), (100, 1970, 7), (200, 1978, 11), (300, 1987, 3),
+                              (400, 1995, 5), (416, 1996, 9)],
+    "fantastic four (1998)": [(1, 1998, 1), (70, 2003, 8), (500, 2003, 9), (554, 2008, 4),
+                              (570, 2009, 10), (588, 2011, 1), (600, 2012, 1), (611, 2012, 12)],
+    "amazing spider-man (1963)": [(1, 1963, 3), (100, 1971, 9), (200, 1980, 1), (300, 1988, 5),
+                                  (400, 1995, 4), (441, 1998, 11)],
+    "amazing spider-man (1999)": [(1, 1999, 1), (58, 2003, 11), (500, 2003, 12), (545, 2008, 1),
+                                  (600, 2009, 7), (700, 2013, 2)],
+    "spectacular spider-man (1976)": [(1, 1976, 12), (100, 1985, 3), (200, 1993, 5), (263, 1998, 11)],
+    "marvel team-up (1972)": [(1, 1972, 3), (100, 1980, 12), (150, 1985, 2)],
+    "avengers (1963)": [(1, 1963, 9), (100, 1972, 6), (200, 1980, 10), (300, 1989, 2),
+                        (402, 1996, 9)],
+    "avengers (1998)": [(1, 1998, 2), (84, 2004, 8), (500, 2004, 9), (503, 2004, 12)],
+    "x-men (1963)": _X_MEN,
+    "uncanny x-men (1963)": _X_MEN,
+    "uncanny x-men (1981)": _X_MEN[6:],
+    "journey into mystery (1952)": [(83, 1962, 8), (125, 1966, 2)],
+    "thor (1966)": [(126, 1966, 3), (200, 1972, 6), (300, 1980, 10), (337, 1983, 11),
+                    (400, 1989, 2), (502, 1996, 9)],
+    "tales of suspense (1959)": [(39, 1963, 3), (99, 1968, 3)],
+    "iron man (1968)": [(1, 1968, 5), (100, 1977, 7), (200, 1985, 11), (332, 1996, 9)],
+    "captain america (1968)": [(100, 1968, 4), (200, 1976, 8), (300, 1984, 12), (400, 1992, 8),
+                               (454, 1996, 8)],
+    "captain america (2004)": [(1, 2005, 1), (50, 2009, 7), (600, 2009, 8), (619, 2011, 8)],
+    "strange tales (1951)": [(101, 1962, 10), (110, 1963, 7), (168, 1968, 5)],
+    "daredevil (1964)": [(1, 1964, 4), (100, 1973, 6), (168, 1981, 1), (227, 1986, 2),
+                         (300, 1992, 1), (380, 1998, 10)],
+    "daredevil (1998)": [(1, 1998, 11), (119, 2009, 8), (500, 2009, 10), (512, 2010, 10)],
+    "incredible hulk (1968)": [(102, 1968, 4), (200, 1976, 6), (300, 1984, 10), (400, 1992, 12),
+                               (474, 1999, 3)],
+    "wolverine (1988)": [(1, 1988, 11), (100, 1996, 4), (189, 2003, 10)],
+}
+
+# "Avengers (1963)" -> base "Avengers", launch 1963
+VOLUME_NAME = re.compile(r"^(?P<base>.+?)\s*\((?P<year>\d{4})\)\s*$")
+
+
+def normalize_series(name: str) -> str:
+    name = re.sub(r"\s+", " ", name.strip().lower())
+    return name[4:] if name.startswith("the ") else name
+
+
+def split_series(series_name: str) -> tuple[str, int | None]:
+    """(normalized base name, launch year or None)."""
+    match = VOLUME_NAME.match(series_name)
+    if match:
+        return normalize_series(match.group("base")), int(match.group("year"))
+    return normalize_series(series_name), None
+
+
+def volume_key(base: str, launch: int) -> str:
+    return f"{base} ({launch})"
+
+
+# ============================================================
+# BUILD
+# ============================================================
+
+def compile_volumes(full: list[dict], complete: list[dict]) -> dict[str, list]:
+    """{volume key: [launch_year, issue_count, cadence(, anchors)]} for every volume with a launch year.
+
+    Volumes in COVER_DATES get a fourth element, [[issue, year], ...], and
+    are added even when the series lists miss them.
+    """
+    counts = {}
+    for s in complete:
+        issues = str(s.get("issues", "")).strip()
+        if issues.isdigit() and int(issues) > 0:
+            counts[s["name"]] = int(issues)
+
+    launches: dict[str, dict[int, int | None]] = {}
+    for s in full + complete:
+        base, launch = split_series(s["name"])
+        if launch is None or not 1930 <= launch <= CURRENT_YEAR:
+            continue
+        known = launches.setdefault(base, {})
+        if known.get(launch) is None:
+            known[launch] = counts.get(s["name"])
+
+    volumes = {}
+    for base, by_launch in launches.items():
+        years = sorted(by_launch)
+        for i, launch in enumerate(years):
+            end = years[i + 1] if i + 1 < len(years) else CURRENT_YEAR
+            span = max(end - launch, 1)
+            count = by_launch[launch]
+            if count is None:
+                count = min(span * DEFAULT_CADENCE, MAX_ISSUES)
+                cadence = DEFAULT_CADENCE
+            elif i + 1 < len(years):
+                # Gaps between volumes (cancellations, renames) never slow a
+                # run below monthly
+                cadence = min(max(count / span, DEFAULT_CADENCE), MAX_CADENCE)
+            else:
+                cadence = DEFAULT_CADENCE
+            volumes[volume_key(base, launch)] = [launch, count, round(cadence, 3)]
+
+    for key, anchors in COVER_DATES.items():
+        _, launch = split_series(key)
+        spec = volumes.setdefault(key, [launch, 0, DEFAULT_CADENCE])
+        spec[1] = max(spec[1], anchors[-1][0])
+        spec.append([[issue, round(year + (month - 1) / 12, 2)] for issue, year, month in anchors])
+    return volumes
+
+
+def build(full_path: Path = FULL_PATH, complete_path: Path = COMPLETE_PATH,
+          output_path: Path = CALENDAR_PATH) -> dict:
+    with open(full_path) as f:
+        full = json.load(f)
+    with open(complete_path) as f:
+        complete = json.load(f)
+
+    volumes = compile_volumes(full, complete)
+    calendar = {
+        "current_year": CURRENT_YEAR,
+        "volumes": dict(sorted(volumes.items())),
+    }
+    # One volume per line keeps the file small and diffable
+    lines = [f"    {json.dumps(key)}: {json.dumps(spec)}" for key, spec in calendar["volumes"].items()]
+    with open(output_path, "w") as f:
+        f.write(f'{{\n  "current_year": {CURRENT_YEAR},\n  "volumes": {{\n')
+        f.write(",\n".join(lines))
+        f.write("\n  }\n}\n")
+
+    undated = sum(1 for s in full if split_series(s["name"])[1] is None)
+    print(f"Series calendar: {len(volumes)} volumes ({len(COVER_DATES)} with cover dates), "
+          f"{sum(v[1] for v in volumes.values())} issues "
+          f"({undated} series without a launch year skipped)")
+    print(f"Saved: {output_path}")
+    return calendar
+
+
+# ============================================================
+# LOOKUP
+# ============================================================
+
+def interpolate(anchors: list[list], issue: int) -> float:
+    """Cover year of issue between anchor issues (clamped to the first and last)."""
+    if issue <= anchors[0][0]:
+        return anchors[0][1]
+    for (lo, lo_year), (hi, hi_year) in zip(anchors, anchors[1:]):
+        if issue <= hi:
+            return lo_year + (hi_year - lo_year) * (issue - lo) / (hi - lo)
+    return anchors[-1][1]
+
+
+class SeriesCalendar:
+    """Array-backed cover-year table loaded from series_calendar.json."""
+
+    def __init__(self, volumes: dict[str, list], current_year: int = CURRENT_YEAR):
+        self.years = array("H")  # cover year * 10
+        self.index: dict[str, tuple[int, int]] = {}
+        self.by_base: dict[str, list[tuple[int, int]]] = {}
+        self.dated: set[str] = set()  # volumes with cover-date anchors
+
+        for key, (launch, count, cadence, *anchors) in volumes.items():
+            self.index[key] = (len(self.years), count)
+            if anchors:
+                self.dated.add(key)
+                self.years.extend(round(interpolate(anchors[0], n + 1) * 10) for n in range(count))
+            else:
+                self.years.extend(
+                    round(min(launch + n / cadence, current_year) * 10) for n in range(count)
+                )
+            base, _ = split_series(key)
+            self.by_base.setdefault(base, []).append((launch, count))
+        for runs in self.by_base.values():
+            runs.sort()
+
+    @classmethod
+    def load(cls, path: Path = CALENDAR_PATH) -> "SeriesCalendar":
+        with open(path) as f:
+            data = json.load(f)
+        return cls(data["volumes"], data.get("current_year", CURRENT_YEAR))
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def volume(self, base: str, issue: int) -> int | None:
+        """Launch year of the earliest volume of base long enough to have this issue."""
+        runs = self.by_base.get(base)
+        if not runs:
+            return None
+        for launch, count in runs:
+            if issue <= count:
+                return launch
+        return max(runs, key=lambda r: r[1])[0]
+
+    def year(self, series_name: str, issue: int, dated_only: bool = False) -> float | None:
+        """Cover year of series_name #issue, or None for series not in the calendar.
+
+        series_name may carry its launch year ("Avengers (1963)"); without one
+        the earliest volume with that many issues is used. Issue numbers past
+        the end of a run (legacy renumbering) clamp to the run's last year.
+        With dated_only=True, volumes without cover dates (and names without a
+        launch year, whose volume would be a guess) return None instead of an
+        estimate.
+        """
+        base, launch = split_series(series_name)
+        if launch is None:
+            if dated_only:
+                return None
+            launch = self.volume(base, issue)
+            if launch is None:
+                return None
+        key = volume_key(base, launch)
+        slot = self.index.get(key)
+        if slot is None or (dated_only and key not in self.dated):
+            return None
+        offset, count = slot
+        n = min(max(issue, 1), count) - 1
+        return self.years[offset + n] / 10
+
+    def range_years(self, ranges: list[dict], dated_only: bool = False) -> list[tuple[float, float]]:
+        """(start year, end year) for each non-annual range record the calendar knows.
+
+        With dated_only=True only runs naming their volume ("Avengers (1963)")
+        count: cover dates where the calendar has them, otherwise the volume's
+        launch year for both ends, never an estimate.
+        """
+        years = []
+        for r in ranges:
+            if r.get("is_annual"):
+                continue
+            if dated_only:
+                _, launch = split_series(r["series_name"])
+                if launch is None:
+                    continue
+                start = self.year(r["series_name"], r["start"], dated_only=True)
+                if start is None:
+                    years.append((float(launch), float(launch)))
+                else:
+                    years.append((start, self.year(r["series_name"], r["end"], dated_only=True)))
+                continue
+            start = self.year(r["series_name"], r["start"])
+            if start is not None:
+                years.append((start, self.year(r["series_name"], r["end"])))
+        return years
+
+
+_calendar: SeriesCalendar | None = None
+
+
+def series_calendar() -> SeriesCalendar:
+    """Process-wide calendar, loaded on first use (empty if never built)."""
+    global _calendar
+    if _calendar is None:
+        _calendar = SeriesCalendar.load() if CALENDAR_PATH.exists() else SeriesCalendar({})
+    return _calendar
+
+
+def collects_years(collects: str, dated_only: bool = False) -> list[tuple[float, float]]:
+    """(start year, end year) of each collected run in an issues_collected string."""
+    if not collects:
+        return []
+    ranges = parse_collects_ranges(collects, "", use_cache=True)
+    return series_calendar().range_years(ranges, dated_only)
+
+
+if __name__ == "__main__":
+    build()
@@ -11,9 +11,17 @@ Addresses remaining issues from the correction report:
 import json
 import re
 import os
+import sys
 from collections import defaultdict
 from datetime import datetime
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data"))
+
+from collects_parser import parse_collects_ranges  # noqa: E402
+from era_rules import CONSERVATIVE_PASSES, era_rules  # noqa: E402
+from issue_bitsets import IssueBitsets  # noqa: E402
+from keyword_classifier import KeywordClassifier  # noqa: E402
+
 BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 WEB_DATA = os.path.join(BASE, "web", "data")
 
@@ -26,80 +34,50 @@ READING_PATHS_FILE = os.path.join(WEB_DATA, "reading_paths.json")
 # STEP 1: Non-Marvel content identification
 # =============================================================================
 
-def is_star_wars(entry):
-    t = entry.get("title", "").lower()
-    s = entry.get("slug", "").lower()
-    return "star wars" in t or "star-wars" in s or s.startswith("journey-to-star-wars")
-
-
-def is_conan_family(entry):
-    t = entry.get("title", "").lower()
-    s = entry.get("slug", "").lower()
-    patterns = ["conan", "kull", "solomon kane", "solomon-kane"]
-    if "red sonja" in t or "red-sonja" in s:
-        return True
-    for p in patterns:
-        if p in t or p.replace(" ", "-") in s:
-            return True
-    return False
-
-
-def is_alien_franchise(entry):
-    t = entry.get("title", "").lower()
-    s = entry.get("slug", "").lower()
-    # Exclude Marvel content with "alien" in title
-    marvel_exclusions = [
+# Keyword classes over the lowercased title and slug (see data/keyword_classifier.py)
+NON_MARVEL_CLASSES = {
+    "star_wars": ["star wars", "star-wars"],
+    "conan_family": [
+        "conan", "kull", "solomon kane", "solomon-kane", "red sonja", "red-sonja",
+    ],
+    "alien": ["^alien-", "^aliens-"],
+    # Marvel content with "alien" in the title
+    "alien_marvel": [
         "alien reality", "alien nation", "aliens, ghosts",
-        "alien symbiote", "alien costume", "alien legion"
-    ]
-    for exc in marvel_exclusions:
-        if exc in t:
-            return False
-    if s.startswith("alien-") or s.startswith("aliens-"):
-        return True
-    return False
-
-
-def is_predator_franchise(entry):
-    t = entry.get("title", "").lower()
-    s = entry.get("slug", "").lower()
-    if "predator" in t or "predator" in s:
-        if "predator x" in t:
-            return False
-        return True
-    return False
+        "alien symbiote", "alien costume", "alien legion",
+    ],
+    "predator": ["predator"],
+    "predator_x": ["predator x"],
+    "other_licensed": [
+        "league of legends", "league-of-legends",
+        "planet of the apes", "planet-of-the-apes",
+        "warhammer",
+        "disney kingdoms", "disney-kingdoms",
+        # Halo - anchored so "bachalo" doesn't match
+        "^halo-", "^halo:", "^halo ",
+        "^tron-download-tp$",
+    ],
+    # Tron - anchored so "ultron" doesn't match
+    "tron": ["^tron-"],
+    "ultron": ["ultron"],
+}
 
-
-def is_other_licensed(entry):
-    t = entry.get("title", "").lower()
-    s = entry.get("slug", "").lower()
-    if "league of legends" in t or "league-of-legends" in s:
-        return True
-    if "planet of the apes" in t or "planet-of-the-apes" in s:
-        return True
-    if "warhammer" in t or "warhammer" in s:
-        return True
-    if "disney kingdoms" in t or "disney-kingdoms" in s:
-        return True
-    # Halo - careful not to match "bachalo"
-    if s.startswith("halo-") or t.startswith("halo:") or t.startswith("halo "):
-        return True
-    # Tron - careful not to match "ultron"
-    if s == "tron-download-tp" or (s.startswith("tron-") and "ultron" not in s):
-        return True
-    return False
+NON_MARVEL = KeywordClassifier(NON_MARVEL_CLASSES)
 
 
 def classify_non_marvel(entry):
-    if is_star_wars(entry):
+    tags = NON_MARVEL.tags(entry)
+    if not tags:
+        return None
+    if "star_wars" in tags:
         return "star_wars"
-    if is_conan_family(entry):
+    if "conan_family" in tags:
         return "conan_family"
-    if is_alien_franchise(entry):
+    if "alien" in tags and "alien_marvel" not in tags:
         return "alien_franchise"
-    if is_predator_franchise(entry):
+    if "predator" in tags and "predator_x" not in tags:
         return "predator"
-    if is_other_licensed(entry):
+    if "other_licensed" in tags or ("tron" in tags and "ultron" not in tags):
         return "other_licensed"
     return None
 
@@ -175,14 +153,24 @@ def find_cover_variants(editions):
         for e in variant_entries:
             remove_slugs.add(e["slug"])
 
-    # Strategy 2: Among entries sharing exact issues_collected, remove variants
+    # Strategy 2: Among entries collecting exactly the same issues, remove variants.
+    # Issue sets are compared as parsed bitsets, so "#1-12" and "#1-6, 7-12"
+    # match; entries whose issues_collected doesn't parse compare as text.
+    records = []
     issues_to_entries = defaultdict(list)
-    for e in editions:
+    for i, e in enumerate(editions):
         ic = e.get("issues_collected", "").strip()
-        if ic and len(ic) > 15:
+        if not ic or len(ic) <= 15:
+            continue
+        parsed = parse_collects_ranges(ic, str(i), use_cache=True)
+        if parsed:
+            records.extend(parsed)
+        else:
             issues_to_entries[ic].append(e)
+    groups = list(issues_to_entries.values())
+    groups += [[editions[int(i)] for i in group] for group in IssueBitsets(records).identical_groups()]
 
-    for ic, group in issues_to_entries.items():
+    for group in groups:
         if len(group) < 2:
             continue
         for e in group:
@@ -196,124 +184,6 @@ def find_cover_variants(editions):
 # STEP 3: Era misassignment fixes (CONSERVATIVE)
 # =============================================================================
 
-# Only match on explicit series references in issues_collected with year tags
-# Format: "Series Name (year)" in issues_collected -> correct era
-SERIES_YEAR_ERA = [
-    # Golden/Atlas Age -> birth-of-marvel
-    (r"sub-mariner comics", "birth-of-marvel"),
-    (r"captain america comics", "birth-of-marvel"),
-    (r"all.?winners|all select|young allies|marvel mystery", "birth-of-marvel"),
-    (r"namora \(194", "birth-of-marvel"),
-    (r"human torch \(194", "birth-of-marvel"),
-
-    # Silver Age (1961-1966) - only with explicit (1961)-(1966) year tags
-    (r"fantastic four \(1961\)", "birth-of-marvel"),
-    (r"amazing spider-man \(1963\)", "birth-of-marvel"),
-    (r"avengers \(1963\)", "birth-of-marvel"),
-    (r"x-men \(1963\)", "birth-of-marvel"),
-    (r"journey into mystery \(1952\)", "birth-of-marvel"),
-    (r"tales of suspense \(1959\)", "birth-of-marvel"),
-    (r"tales to astonish \(1959\)", "birth-of-marvel"),
-    (r"strange tales \(1951\)", "birth-of-marvel"),
-    (r"incredible hulk \(1962\)", "birth-of-marvel"),
-
-    # Late Silver Age (1966-1970)
-    (r"silver surfer \(1968\)", "the-expansion"),
-    (r"captain america \(1968\)", "the-expansion"),
-    (r"iron man \(1968\)", "the-expansion"),
-    (r"sub-mariner \(1968\)", "the-expansion"),
-    (r"doctor strange \(1968\)", "the-expansion"),
-    (r"nick fury.+agent.+shield \(196", "the-expansion"),
-    (r"marvel tales \(1964\)", "the-expansion"),
-
-    # Bronze Age (1970-1980)
-    (r"hero for hire", "bronze-age"),
-    (r"power man \(", "bronze-age"),
-    (r"power man #", "bronze-age"),
-    (r"iron fist \(1975\)", "bronze-age"),
-    (r"tomb of dracula \(197", "bronze-age"),
-    (r"werewolf by night \(197", "bronze-age"),
-    (r"ghost rider \(1973\)", "bronze-age"),
-    (r"man-thing \(197", "bronze-age"),
-    (r"jungle action", "bronze-age"),
-    (r"marvel premiere", "bronze-age"),
-    (r"marvel spotlight \(197", "bronze-age"),
-    (r"marvel team-up \(197", "bronze-age"),
-    (r"marvel two-in-one \(197", "bronze-age"),
-    (r"defenders \(1972\)", "bronze-age"),
-    (r"howard the duck \(1976\)", "bronze-age"),
-    (r"master of kung fu", "bronze-age"),
-    (r"omega the unknown \(197", "bronze-age"),
-    (r"warlock \(1972\)", "bronze-age"),
-    (r"captain marvel \(1968\)", "bronze-age"),
-    (r"daredevil \(1964\)", "bronze-age"),
-    (r"thor \(1966\)", "bronze-age"),
-    (r"spider-woman \(1978\)", "bronze-age"),
-    (r"ms\. marvel \(1977\)", "bronze-age"),
-    (r"black panther \(1977\)", "bronze-age"),
-    (r"nova \(1976\)", "bronze-age"),
-    (r"inhumans \(1975\)", "bronze-age"),
-    (r"amazing adventures \(197", "bronze-age"),
-
-    # Rise of X-Men (1975-1985) - only explicit old UXM references
-    (r"uncanny x-men \(1963\) #(9[4-9]|[1-2]\d\d)", "rise-of-x-men"),
-    (r"new mutants \(1983\)", "rise-of-x-men"),
-    (r"alpha flight \(1983\)", "rise-of-x-men"),
-    (r"dazzler \(1981\)", "rise-of-x-men"),
-    (r"micronauts \(197", "rise-of-x-men"),
-    (r"rom \(197|rom \(198", "rise-of-x-men"),
-    (r"marvel super heroes secret wars \(1984\)", "rise-of-x-men"),
-    (r"giant.size x-men \(1975\)", "rise-of-x-men"),
-
-    # Event Age (1985-1992)
-    (r"x-factor \(1986\)", "event-age"),
-    (r"new warriors \(1990\)", "event-age"),
-    (r"excalibur \(1988\)", "event-age"),
-    (r"wolverine \(1988\)", "event-age"),
-    (r"punisher \(1987\)", "event-age"),
-    (r"infinity gauntlet \(1991\)", "event-age"),
-
-    # Heroes Reborn (1996-1998)
-    (r"thunderbolts \(1997\)", "heroes-reborn-return"),
-
-    # Marvel Knights / Ultimate (1998-2004)
-    (r"daredevil \(1998\)", "marvel-knights-ultimate"),
-    (r"fantastic four \(1998\)", "marvel-knights-ultimate"),
-    (r"black panther \(1998\)", "marvel-knights-ultimate"),
-    (r"amazing spider-man \(1999\)", "marvel-knights-ultimate"),
-    (r"ultimate spider-man \(2000\)", "marvel-knights-ultimate"),
-    (r"ultimate x-men \(2001\)", "marvel-knights-ultimate"),
-    (r"ultimates \(2002\)", "marvel-knights-ultimate"),
-    (r"alias \(2001\)", "marvel-knights-ultimate"),
-    (r"new x-men \(2001\)", "marvel-knights-ultimate"),
-
-    # Bendis Avengers (2004-2012)
-    (r"new avengers \(2004\)", "bendis-avengers"),
-    (r"new avengers \(2005\)", "bendis-avengers"),
-    (r"mighty avengers \(2007\)", "bendis-avengers"),
-    (r"dark avengers \(2009\)", "bendis-avengers"),
-    (r"young avengers \(2005\)", "bendis-avengers"),
-    (r"astonishing x-men \(2004\)", "bendis-avengers"),
-
-    # Hickman Saga (2009-2015)
-    (r"fantastic four \(2009\)", "hickman-saga"),
-    (r"ff \(2011\)", "hickman-saga"),
-    (r"avengers \(2012\)", "hickman-saga"),
-    (r"new avengers \(2013\)", "hickman-saga"),
-    (r"secret wars \(2015\)", "hickman-saga"),
-]
-
-# Title-based patterns ONLY for clearly-labeled reprint collections
-TITLE_ERA_PATTERNS = [
-    # "Original Marvel Years" omnibuses of classic content
-    (r"timely.s", "birth-of-marvel"),
-    (r"golden age captain america", "birth-of-marvel"),
-    (r"golden age marvel comics", "birth-of-marvel"),
-    (r"golden age human torch", "birth-of-marvel"),
-    (r"golden age sub-mariner", "birth-of-marvel"),
-    (r"atlas era", "birth-of-marvel"),
-]
-
 # Modern eras that might contain misplaced classic content
 MODERN_ERAS = {
     "all-new-all-different", "dawn-of-krakoa", "blood-hunt-doom", "current-ongoings"
@@ -321,29 +191,12 @@ MODERN_ERAS = {
 
 
 def detect_correct_era(entry):
-    """Determine correct narrative era from issues_collected. Returns None if no change needed."""
-    issues = entry.get("issues_collected", "").lower()
-    title = entry.get("title", "").lower()
-
-    # Check issues_collected against series patterns
-    if issues:
-        for pattern, era in SERIES_YEAR_ERA:
-            if re.search(pattern, issues, re.IGNORECASE):
-                return era
-
-    # Check title patterns (only for clearly labeled reprints)
-    for pattern, era in TITLE_ERA_PATTERNS:
-        if re.search(pattern, title, re.IGNORECASE):
-            return era
-
-    # Masterworks volumes - check issues_collected for classic series
-    if "masterworks" in title or "mmw" in entry.get("slug", ""):
-        if issues:
-            for pattern, era in SERIES_YEAR_ERA:
-                if re.search(pattern, issues, re.IGNORECASE):
-                    return era
+    """Determine correct narrative era from issues_collected. Returns None if no change needed.
 
-    return None
+    Conservative: only the explicit "Series (year)" references and clearly
+    labeled reprint titles from the shared era-rule table fire.
+    """
+    return era_rules().evaluate(entry, CONSERVATIVE_PASSES).era
 
 
 def fix_era_misassignments(editions):
@@ -1,4 +1,4 @@
--- Era assignment fixes generated by audit_eras_v2.py
+-- Era assignment fixes generated by audit_eras.py (the rule set of the former audit_eras_v2.py)
 -- 87 changes
 
 BEGIN;
@@ -0,0 +1,182 @@
+#!/usr/bin/env node
+
+/**
+ * seed-edition-overlaps.mjs
+ *
+ * Re-seeds the edition_overlaps table (migration 021) from the shard written
+ * by Phase 8b (data/import/import_phase8b_overlaps.py).
+ * Deletes all existing rows and re-inserts from web/data/edition_overlaps.json.
+ *
+ * Usage:
+ *   node scripts/seed-edition-overlaps.mjs
+ */
+
+import { readFileSync, existsSync } from 'fs';
+import { resolve, dirname } from 'path';
+import { fileURLToPath } from 'url';
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = dirname(__filename);
+const PROJECT_ROOT = resolve(__dirname, '..');
+
+// Parse .env
+function loadEnv() {
+  const envPath = resolve(PROJECT_ROOT, '.env');
+  if (!existsSync(envPath)) {
+    console.error('ERROR: .env file not found at', envPath);
+    process.exit(1);
+  }
+  const lines = readFileSync(envPath, 'utf-8').split('\n');
+  const env = {};
+  for (const line of lines) {
+    const trimmed = line.trim();
+    if (!trimmed || trimmed.startsWith('#')) continue;
+    const eqIdx = trimmed.indexOf('=');
+    if (eqIdx === -1) continue;
+    env[trimmed.slice(0, eqIdx).trim()] = trimmed.slice(eqIdx + 1).trim();
+  }
+  return env;
+}
+
+const env = loadEnv();
+const SUPABASE_URL = env.NEXT_PUBLIC_SUPABASE_URL;
+const ANON_KEY = env.NEXT_PUBLIC_SUPABASE_ANON_KEY;
+const SERVICE_ROLE_KEY = env.SUPABASE_SERVICE_ROLE_KEY;
+
+if (!SUPABASE_URL || !SERVICE_ROLE_KEY || !ANON_KEY) {
+  console.error('ERROR: Missing SUPABASE_URL, ANON_KEY, or SERVICE_ROLE_KEY in .env');
+  process.exit(1);
+}
+
+const DATA_DIR = resolve(PROJECT_ROOT, 'web', 'data');
+
+async function main() {
+  const startTime = Date.now();
+  console.log('===========================================');
+  console.log('  Re-seed edition_overlaps table');
+  console.log('===========================================');
+
+  // 1. Load edition_overlaps.json
+  const shardPath = resolve(DATA_DIR, 'edition_overlaps.json');
+  if (!existsSync(shardPath)) {
+    console.error('ERROR: edition_overlaps.json not found at', shardPath);
+    console.error('Run Phase 8b first: python3 data/import/import_phase8b_overlaps.py');
+    process.exit(1);
+  }
+  const shard = JSON.parse(readFileSync(shardPath, 'utf-8'));
+  console.log(`Loaded ${shard.pairs.length} overlapping pairs over ${shard.editions.length} editions.`);
+
+  // 2. Load editions to build slug -> UUID map
+  console.log('Fetching editions from Supabase...');
+  let allEditions = [];
+  let page = 0;
+  const PAGE_SIZE = 1000;
+  while (true) {
+    const from = page * PAGE_SIZE;
+    const to = from + PAGE_SIZE - 1;
+    const res = await fetch(
+      `${SUPABASE_URL}/rest/v1/collected_editions?select=id,slug&order=slug&offset=${from}&limit=${PAGE_SIZE}`,
+      {
+        headers: {
+          'Authorization': `Bearer ${SERVICE_ROLE_KEY}`,
+          'apikey': ANON_KEY,
+        },
+      }
+    );
+    if (!res.ok) {
+      console.error('Failed to fetch editions:', res.status, await res.text());
+      process.exit(1);
+    }
+    const data = await res.json();
+    allEditions.push(...data);
+    if (data.length < PAGE_SIZE) break;
+    page++;
+  }
+
+  const slugToId = new Map(allEditions.map(e => [e.slug, e.id]));
+  console.log(`Found ${slugToId.size} editions in Supabase.`);
+
+  // 3. Delete all existing edition_overlaps
+  console.log('Deleting existing edition_overlaps...');
+  const delRes = await fetch(
+    `${SUPABASE_URL}/rest/v1/edition_overlaps?edition_a_id=not.is.null`,
+    {
+      method: 'DELETE',
+      headers: {
+        'Authorization': `Bearer ${SERVICE_ROLE_KEY}`,
+        'apikey': ANON_KEY,
+        'Prefer': 'return=minimal',
+      },
+    }
+  );
+  if (!delRes.ok) {
+    console.error('Delete failed:', delRes.status, await delRes.text());
+    process.exit(1);
+  }
+  console.log('Deleted all existing rows.');
+
+  // 4. Build rows with edition UUIDs (stored once per pair, lower UUID first)
+  const rows = [];
+  let skipped = 0;
+  for (const [a, b, sharedCount, runs] of shard.pairs) {
+    let idA = slugToId.get(shard.editions[a]);
+    let idB = slugToId.get(shard.editions[b]);
+    if (!idA || !idB) {
+      skipped++;
+      continue;
+    }
+    if (idB < idA) [idA, idB] = [idB, idA];
+    rows.push({
+      edition_a_id: idA,
+      edition_b_id: idB,
+      shared_count: sharedCount,
+      shared_ranges: runs.map(([series, annual, start, end]) => ({
+        series_name: shard.series[series],
+        is_annual: annual === 1,
+        start,
+        end,
+      })),
+    });
+  }
+
+  if (skipped > 0) {
+    console.log(`Skipped ${skipped} pairs (unresolved edition slugs).`);
+  }
+
+  // 5. Insert in batches
+  console.log(`Inserting ${rows.length} edition_overlaps in batches of 500...`);
+  const BATCH_SIZE = 500;
+  let inserted = 0;
+  for (let i = 0; i < rows.length; i += BATCH_SIZE) {
+    const batch = rows.slice(i, i + BATCH_SIZE);
+    const res = await fetch(
+      `${SUPABASE_URL}/rest/v1/edition_overlaps?on_conflict=edition_a_id,edition_b_id`,
+      {
+        method: 'POST',
+        headers: {
+          'Authorization': `Bearer ${SERVICE_ROLE_KEY}`,
+          'apikey': ANON_KEY,
+          'Content-Type': 'application/json',
+          'Prefer': 'return=minimal,resolution=merge-duplicates',
+        },
+        body: JSON.stringify(batch),
+      }
+    );
+    if (!res.ok) {
+      console.error(`Insert failed (batch ${Math.floor(i / BATCH_SIZE) + 1}): ${res.status}\n${await res.text()}`);
+      process.exit(1);
+    }
+    inserted += batch.length;
+    if ((i / BATCH_SIZE + 1) % 10 === 0) {
+      console.log(`  ... ${inserted}/${rows.length} inserted`);
+    }
+  }
+
+  const elapsed = ((Date.now() - startTime) / 1000).toFixed(1);
+  console.log(`\nDone! Inserted ${inserted} edition_overlaps in ${elapsed}s.`);
+}
+
+main().catch(err => {
+  console.error('Fatal error:', err);
+  process.exit(1);
+});
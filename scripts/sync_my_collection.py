@@ -9,6 +9,12 @@ import os
 import sys
 import urllib.request
 import urllib.parse
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "data"))
+
+from fuzzy_match import FuzzyIndex  # noqa: E402
 
 # ── Config ──────────────────────────────────────────────────────────
 SUPABASE_URL = os.environ["SUPABASE_URL"]
@@ -310,15 +316,22 @@ def normalize(text):
     )
 
 
-def score_match(edition_title, search_keywords):
-    """Score how well an edition title matches the search keywords."""
-    norm_title = normalize(edition_title)
-    score = 0
+def best_match(title_index, search_keywords):
+    """Return (edition position, score) of the best-scoring normalized title.
+
+    Each keyword contained in a title adds its length (longer keyword matches =
+    higher score). Ties go to the earliest title. Returns (None, 0) if nothing matches.
+    """
+    scores = defaultdict(int)
     for kw in search_keywords:
         kw_norm = normalize(kw)
-        if kw_norm in norm_title:
-            score += len(kw_norm)  # longer keyword matches = higher score
-    return score
+        for i in title_index.containing(kw_norm):
+            scores[i] += len(kw_norm)
+    best_pos, best_score = None, 0
+    for i in sorted(scores):
+        if scores[i] > best_score:
+            best_pos, best_score = i, scores[i]
+    return best_pos, best_score
 
 
 def main():
@@ -390,19 +403,13 @@ def main():
 
     matched = []
     unmatched = []
+    title_index = FuzzyIndex([normalize(ed["title"]) for ed in all_editions])
 
     for display_title, keywords in MY_COLLECTION:
-        best_score = 0
-        best_edition = None
-
-        for ed in all_editions:
-            s = score_match(ed["title"], keywords)
-            if s > best_score:
-                best_score = s
-                best_edition = ed
+        best_pos, best_score = best_match(title_index, keywords)
 
-        if best_edition and best_score > 0:
-            matched.append((display_title, best_edition, best_score))
+        if best_pos is not None:
+            matched.append((display_title, all_editions[best_pos], best_score))
         else:
             unmatched.append(display_title)
 
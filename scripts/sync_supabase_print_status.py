@@ -3,6 +3,9 @@
 import json, os, sys, urllib.request, urllib.error, time
 from collections import Counter
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data'))
+from isbn_index import IsbnIndex  # noqa: E402
+
 # Force unbuffered output
 sys.stdout.reconfigure(line_buffering=True)
 
@@ -28,6 +31,7 @@ json_path = os.path.join(os.path.dirname(__file__), '..', 'web', 'data', 'collec
 with open(json_path) as f:
     json_editions = json.load(f)
 json_slugs = {ed['slug'] for ed in json_editions}
+json_isbns = IsbnIndex.from_records(json_editions, 'isbn')
 print(f"JSON editions: {len(json_slugs)}")
 
 # Fetch ALL Supabase editions
@@ -48,8 +52,11 @@ while True:
         break
     offset += 1000
 
-# Filter to Supabase-only in_print
-supabase_only = [r for r in all_rows if r['slug'] not in json_slugs and r['print_status'] == 'in_print']
+# Filter to Supabase-only in_print (rows whose ISBN matches a JSON edition under another slug are not Supabase-only)
+supabase_only = [
+    r for r in all_rows
+    if r['slug'] not in json_slugs and r.get('isbn') not in json_isbns and r['print_status'] == 'in_print'
+]
 print(f"\nSupabase-only in_print editions: {len(supabase_only)}")
 
 CURRENT_YEAR = 2026
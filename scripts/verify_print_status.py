@@ -26,6 +26,10 @@ import urllib.parse
 from datetime import datetime, date
 from collections import defaultdict
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data"))
+
+from isbn_index import clean_isbn  # noqa: E402
+
 # ============================================================
 # Configuration
 # ============================================================
@@ -222,9 +226,7 @@ def check_open_library(isbn):
     Check Open Library for ISBN availability info.
     Returns: dict with availability signals or None on error.
     """
-    # Clean ISBN (remove hyphens)
-    clean_isbn = isbn.replace("-", "")
-    url = f"https://openlibrary.org/isbn/{clean_isbn}.json"
+    url = f"https://openlibrary.org/isbn/{clean_isbn(isbn)}.json"
 
     try:
         req = urllib.request.Request(url)
@@ -251,8 +253,7 @@ def check_google_books(isbn):
     Check Google Books API for ISBN info (free, no key required for basic queries).
     Returns: dict with availability signals or None on error.
     """
-    clean_isbn = isbn.replace("-", "")
-    url = f"https://www.googleapis.com/books/v1/volumes?q=isbn:{clean_isbn}"
+    url = f"https://www.googleapis.com/books/v1/volumes?q=isbn:{clean_isbn(isbn)}"
 
     try:
         req = urllib.request.Request(url)
@@ -0,0 +1,61 @@
+-- ============================================================
+-- 021: Precomputed edition overlaps for the Issue Overlap Detector
+-- ============================================================
+-- One row per pair of editions sharing at least one issue, computed offline
+-- from edition_issues.json by data/import/import_phase8b_overlaps.py and
+-- loaded by scripts/seed-edition-overlaps.mjs. Pairs are stored once, with
+-- edition_a_id < edition_b_id (same convention as find_edition_overlaps).
+-- shared_ranges lists the shared issues as runs:
+--   [{"series_name": "Avengers (1963)", "is_annual": false, "start": 1, "end": 12}, ...]
+
+CREATE TABLE IF NOT EXISTS edition_overlaps (
+    edition_a_id UUID NOT NULL REFERENCES collected_editions(id) ON DELETE CASCADE,
+    edition_b_id UUID NOT NULL REFERENCES collected_editions(id) ON DELETE CASCADE,
+    shared_count INTEGER NOT NULL CHECK (shared_count > 0),
+    shared_ranges JSONB NOT NULL DEFAULT '[]',
+    PRIMARY KEY (edition_a_id, edition_b_id),
+    CHECK (edition_a_id < edition_b_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_edition_overlaps_b ON edition_overlaps(edition_b_id);
+
+-- ============================================================
+-- FUNCTIONS: Find issue overlaps between editions (lookups, no self-join)
+-- ============================================================
+-- Same result as the 005 version: one row per shared issue, ordered by
+-- series and issue number. Each candidate pair is a primary-key lookup.
+CREATE OR REPLACE FUNCTION find_edition_overlaps(edition_ids UUID[])
+RETURNS TABLE (
+    edition_a_id UUID,
+    edition_b_id UUID,
+    series_name TEXT,
+    issue_number INTEGER,
+    is_annual BOOLEAN
+) AS $$
+SELECT
+    o.edition_a_id,
+    o.edition_b_id,
+    r.series_name,
+    n.issue_number,
+    r.is_annual
+FROM edition_overlaps o
+CROSS JOIN LATERAL jsonb_to_recordset(o.shared_ranges)
+    AS r(series_name TEXT, is_annual BOOLEAN, start INTEGER, "end" INTEGER)
+CROSS JOIN LATERAL generate_series(r.start, r."end") AS n(issue_number)
+WHERE o.edition_a_id = ANY(edition_ids)
+  AND o.edition_b_id = ANY(edition_ids)
+ORDER BY r.series_name, n.issue_number;
+$$ LANGUAGE sql STABLE;
+
+-- Pair counts only (Venn diagram sizes), without expanding the issue runs
+CREATE OR REPLACE FUNCTION find_edition_overlap_counts(edition_ids UUID[])
+RETURNS TABLE (
+    edition_a_id UUID,
+    edition_b_id UUID,
+    shared_count INTEGER
+) AS $$
+SELECT o.edition_a_id, o.edition_b_id, o.shared_count
+FROM edition_overlaps o
+WHERE o.edition_a_id = ANY(edition_ids)
+  AND o.edition_b_id = ANY(edition_ids);
+$$ LANGUAGE sql STABLE;